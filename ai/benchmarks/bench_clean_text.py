@@ -0,0 +1,84 @@
+"""
+Benchmark: resume text cleaning
+
+Compares the original multi-pass clean_text (four split/join passes and a
+backtracking LOCATION_PATTERN) with the single-pass line cleaner, on a
+normal resume scaled up and on adversarial long lines a hostile or broken
+upload can contain.
+
+Run from the ai/ directory:
+    python -m benchmarks.bench_clean_text
+"""
+
+import re
+import time
+from pathlib import Path
+
+from resume_parsing.cleaning.clean_text import clean_text
+from resume_parsing.extraction.extract import extract_text
+
+REPEATS = 3
+RESUME_PDF = Path(__file__).resolve().parents[1] / "tests" / "test_resume.pdf"
+
+LEGACY_BULLET = re.compile(r"[•▪◦‣–—*→]")
+LEGACY_DATE = re.compile(
+    r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)"
+    r"[a-z]*\.?\s+\d{4}\s*[-–]\s*(Present|\d{4})",
+    re.IGNORECASE
+)
+LEGACY_LOCATION = re.compile(r"([A-Za-z .&]+)([A-Z][a-z]+(?:\s[A-Z][a-z]+)*,\s[A-Z]{2})")
+
+
+def legacy_clean_text(raw_text: str) -> str:
+    """The pre-existing clean_text"""
+    fixed = []
+    for line in raw_text.split("\n"):
+        match = LEGACY_LOCATION.fullmatch(line.strip())
+        fixed.append(f"{match.group(1).strip()}, {match.group(2).strip()}" if match else line)
+    text = "\n".join(fixed)
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = "\n".join(line.rstrip() for line in text.split("\n"))
+    text = LEGACY_BULLET.sub("-", text)
+    fixed = []
+    for line in text.split("\n"):
+        match = LEGACY_DATE.search(line)
+        before = line[:match.start()].strip() if match else ""
+        after = line[match.start():].strip() if match else ""
+        fixed.extend([before, after] if before and after else [line])
+    text = "\n".join(fixed)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def best_of(fn, *args) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def cases():
+    resume = extract_text(RESUME_PDF)
+    yield "resume x1", resume
+    yield "resume x30", "\n\n".join([resume] * 30)
+    # Title-case words with no trailing ", ST": every capital is a place
+    # the old pattern restarted the city-word scan from
+    # (the old cost grows with the square of the line length)
+    for words in (1000, 2000, 4000):
+        yield f"{words} title words", " ".join(["Senior Software Engineer"] * (words // 3))
+    yield "one-line skills 32kB", ("Python Java Go Docker " * 1500)[:32000]
+
+
+def main():
+    print(f"{'input':>20} {'chars':>8} {'legacy (s)':>11} {'single (s)':>11} {'speedup':>8}")
+    for name, text in cases():
+        assert legacy_clean_text(text) == clean_text(text)
+        legacy = best_of(legacy_clean_text, text)
+        single = best_of(clean_text, text)
+        print(f"{name:>20} {len(text):>8} {legacy:>11.4f} {single:>11.4f} {legacy / single:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
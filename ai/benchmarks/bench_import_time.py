@@ -0,0 +1,92 @@
+"""
+Benchmark: import time of the API service
+
+Runs ``python -X importtime`` in a fresh interpreter and reports how long
+``import simple_api`` takes with the web framework (FastAPI/pydantic)
+already imported - the part this service controls - plus the heaviest
+modules it pulls in. The heavy backends that are now imported on first use
+are timed on their own, to show what a worker no longer pays at start-up.
+
+Run from the ai/ directory:
+    python -m benchmarks.bench_import_time
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPEATS = 5
+AI_DIR = Path(__file__).resolve().parents[1]
+
+# Imported before the measured module: not ours to optimize
+FRAMEWORK = "import fastapi, fastapi.responses, pydantic"
+
+# Imported on first use since the API stopped importing them eagerly
+DEFERRED = ["huggingface_hub.inference._client", "pypdf", "docx", "stt.streaming", "stt.worker_pool"]
+
+
+def import_times(module: str, preload: str = FRAMEWORK) -> Dict[str, Tuple[int, int]]:
+    """
+    ``-X importtime`` of one cold ``import module``
+
+    Returns:
+        {module name: (self us, cumulative us)} for everything imported
+        after ``preload``
+    """
+    env = dict(os.environ)
+    # Must import without credentials
+    env.pop("HUGGINGFACEHUB_API_TOKEN", None)
+    code = f"{preload}\nimport sys; sys.stderr.write('--measure--\\n')\nimport {module}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=AI_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    times = {}
+    measuring = False
+    for line in proc.stderr.splitlines():
+        if line == "--measure--":
+            measuring = True
+            continue
+        if not measuring or not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def best_import_ms(module: str, repeats: int = REPEATS) -> float:
+    """Fastest cumulative import time of ``module`` over ``repeats`` runs, in ms"""
+    return min(import_times(module)[module][1] for _ in range(repeats)) / 1000
+
+
+def loaded_modules(module: str, candidates: List[str]) -> List[str]:
+    """Which of ``candidates`` end up in sys.modules after ``import module``"""
+    times = import_times(module)
+    return [name for name in candidates if name in times]
+
+
+def main():
+    print(f"import simple_api (framework preloaded), best of {REPEATS}: "
+          f"{best_import_ms('simple_api'):7.1f} ms")
+
+    times = import_times("simple_api")
+    heaviest = sorted(times.items(), key=lambda item: -item[1][0])[:8]
+    print("\nHeaviest modules (self time):")
+    for name, (self_us, cumulative_us) in heaviest:
+        print(f"  {name:<45} {self_us / 1000:6.1f} ms  (cumulative {cumulative_us / 1000:6.1f} ms)")
+
+    print("\nDeferred to first use:")
+    for name in DEFERRED:
+        eager = name in times
+        ms = min(import_times(name)[name][1] for _ in range(REPEATS)) / 1000
+        print(f"  {name:<34} {ms:7.1f} ms  {'STILL IMPORTED EAGERLY' if eager else 'deferred'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: audio preprocessing for Whisper
+
+Compares the original WAV path (float64 mean downmix + FFT-based
+scipy.signal.resample) with stt.preprocess (float32 downmix + polyphase
+resample_poly with cached filters) on typical browser recordings.
+
+Run from the ai/ directory:
+    python -m benchmarks.bench_resample
+"""
+
+import time
+
+import numpy as np
+from scipy import signal
+
+from stt.preprocess import to_model_input
+
+DURATIONS = [30, 120, 300]  # seconds - short answer, typical answer, long answer
+SOURCE_RATES = [44100, 48000]
+REPEATS = 3
+
+
+def legacy_preprocess(audio_data: np.ndarray, sample_rate: int) -> np.ndarray:
+    """The pre-existing WhisperLocalSTT WAV path"""
+    if len(audio_data.shape) > 1:
+        audio_data = audio_data.mean(axis=1)
+    if audio_data.dtype == np.int16:
+        audio_data = audio_data.astype(np.float32) / 32768.0
+    elif audio_data.dtype == np.int32:
+        audio_data = audio_data.astype(np.float32) / 2147483648.0
+    if sample_rate != 16000:
+        num_samples = int(len(audio_data) * 16000 / sample_rate)
+        audio_data = signal.resample(audio_data, num_samples)
+    return audio_data
+
+
+def best_of(fn, *args) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'clip':>8} {'rate':>6} {'legacy (s)':>11} {'poly (s)':>9} {'speedup':>8}")
+
+    for rate in SOURCE_RATES:
+        for seconds in DURATIONS:
+            stereo = rng.integers(-8000, 8000, size=(rate * seconds, 2), dtype=np.int16)
+            # Odd length - real recordings are rarely FFT-friendly sizes
+            stereo = stereo[: len(stereo) - 1]
+
+            legacy = best_of(legacy_preprocess, stereo, rate)
+            poly = best_of(to_model_input, stereo, rate)
+            print(f"{seconds:>7}s {rate:>6} {legacy:>11.3f} {poly:>9.3f} {legacy / poly:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Benchmark: PyTorch Whisper vs. int8 faster-whisper on CPU
+
+Reports real-time factor (processing time / audio duration, lower is
+better) and word error rate against reference transcripts.
+
+Fixtures: real recordings give the meaningful numbers. Put audio files
+(wav, mp3, webm, ...) in a directory and pass it with ``--samples``
+(default ai/tests/samples/, not shipped: interview audio is personal
+data). A file ``<name>.txt`` next to ``<name>.<ext>`` holds its reference
+transcript; files without one are timed but not scored.
+
+Without any recordings the benchmark generates synthetic speech-like clips
+(voiced syllables with pitch movement and pauses, 10/30/90 s). They time
+the full pipeline at answer-like lengths but have no words, so there is
+no WER and the decoder emits few tokens - RTF is a lower bound there.
+
+Run from the ai/ directory:
+    python -m benchmarks.bench_stt [--samples DIR] [--model-size small] [--cpu-threads 8]
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+from stt.audio_io import SAMPLE_RATE, decode_audio
+from stt.stt_service import get_stt_service
+
+SAMPLES_DIR = Path(__file__).resolve().parents[1] / "tests" / "samples"
+AUDIO_EXTENSIONS = ['.mp3', '.wav', '.m4a', '.webm', '.mp4', '.flac', '.ogg']
+SYNTHETIC_DURATIONS = [10, 30, 90]  # seconds - short answer, one Whisper window, long answer
+
+
+def normalize_words(text: str):
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance divided by reference length"""
+    ref, hyp = normalize_words(reference), normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,                              # deletion
+                current[j - 1] + 1,                           # insertion
+                previous[j - 1] + (ref_word != hyp_word),     # substitution
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def synthetic_speech(seconds: float, seed: int = 0) -> np.ndarray:
+    """
+    Speech-like mono float32 16 kHz signal
+
+    ~4 syllables/s of harmonic "vowels" (100-220 Hz pitch with a gliding
+    contour and two formant-like peaks), grouped into words and phrases
+    separated by pauses, over a low noise floor.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    audio = (rng.standard_normal(total) * 0.003).astype(np.float32)
+
+    position = 0
+    while position < total:
+        # A word of 1-4 syllables, then a short gap (longer between phrases)
+        for _ in range(rng.integers(1, 5)):
+            length = int(rng.uniform(0.15, 0.3) * SAMPLE_RATE)
+            end = min(position + length, total)
+            n = end - position
+            if n <= 0:
+                break
+            t = np.arange(n) / SAMPLE_RATE
+            pitch = rng.uniform(100, 220) * (1 + 0.1 * np.sin(2 * np.pi * rng.uniform(1, 3) * t))
+            phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+            formants = rng.uniform([300, 900], [900, 2500])
+            voiced = sum(
+                np.sin(k * phase) / k * (1 + 2 * np.exp(-((k * pitch - formants[:, None]) / 150) ** 2).sum(axis=0))
+                for k in range(1, 16)
+            )
+            envelope = np.sin(np.pi * np.arange(n) / n) ** 2
+            audio[position:end] += (0.1 * voiced * envelope).astype(np.float32)
+            position = end
+        position += int(rng.choice([rng.uniform(0.05, 0.15), rng.uniform(0.4, 0.9)], p=[0.8, 0.2]) * SAMPLE_RATE)
+    return np.clip(audio, -1.0, 1.0)
+
+
+def synthetic_fixtures():
+    return [
+        {
+            "name": f"synthetic_{seconds}s",
+            "samples": synthetic_speech(seconds, seed=seconds),
+            "duration": float(seconds),
+            "reference": None,
+        }
+        for seconds in SYNTHETIC_DURATIONS
+    ]
+
+
+def load_fixtures(samples_dir: Path = SAMPLES_DIR):
+    fixtures = []
+    for path in sorted(samples_dir.glob("*")):
+        if path.suffix.lower() not in AUDIO_EXTENSIONS:
+            continue
+        samples = decode_audio(path.read_bytes())
+        reference = path.with_suffix(".txt")
+        fixtures.append({
+            "name": path.name,
+            "samples": samples,
+            "duration": len(samples) / SAMPLE_RATE,
+            "reference": reference.read_text().strip() if reference.exists() else None,
+        })
+    return fixtures
+
+
+def run(stt, fixtures):
+    stt.warm_up()
+    total_audio = total_time = 0.0
+    wers = []
+    for fixture in fixtures:
+        start = time.perf_counter()
+        result = stt.transcribe(fixture["samples"])
+        elapsed = time.perf_counter() - start
+
+        total_audio += fixture["duration"]
+        total_time += elapsed
+        wer = None
+        if fixture["reference"] is not None:
+            wer = word_error_rate(fixture["reference"], result["text"])
+            wers.append(wer)
+        wer_text = f"{wer:.3f}" if wer is not None else "  -  "
+        print(f"   {fixture['name']:<32} RTF {elapsed / fixture['duration']:.3f}  WER {wer_text}")
+
+    mean_wer = sum(wers) / len(wers) if wers else None
+    return total_time / total_audio, mean_wer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-size", default="small")
+    parser.add_argument("--cpu-threads", type=int, default=0)
+    parser.add_argument("--num-workers", type=int, default=1)
+    parser.add_argument("--samples", type=Path, default=SAMPLES_DIR,
+                        help="directory of recordings (+ optional .txt references)")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.samples)
+    if not fixtures:
+        print(f"No audio fixtures found in {args.samples} - using synthetic speech-like clips "
+              f"(timing only, no WER)")
+        fixtures = synthetic_fixtures()
+
+    backends = [
+        get_stt_service("whisper_local", model_size=args.model_size),
+        get_stt_service(
+            "faster_whisper",
+            model_size=args.model_size,
+            cpu_threads=args.cpu_threads,
+            num_workers=args.num_workers,
+        ),
+    ]
+
+    summary = []
+    for stt in backends:
+        print(f"\n{stt.get_provider_name()}")
+        rtf, wer = run(stt, fixtures)
+        summary.append((stt.get_provider_name(), rtf, wer))
+
+    print("\nSUMMARY")
+    for name, rtf, wer in summary:
+        wer_text = f"{wer:.3f}" if wer is not None else "n/a"
+        print(f"   {name:<36} RTF {rtf:.3f}  WER {wer_text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Caches for parsed resumes and answer evaluations
@@ -0,0 +1,109 @@
+"""
+In-memory cache for answer evaluations
+
+Evaluation runs at temperature 0.0, so the same question/answer pair in the
+same context scores the same way. Retries and duplicate submissions are served
+from here instead of calling the LLM again. Entries expire after ``ttl``
+seconds and the least recently used entry is dropped past ``max_entries``.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace so trivial edits hit the same key"""
+    return " ".join((text or "").lower().split())
+
+
+def make_evaluation_cache_key(
+    question: str,
+    answer: str,
+    state: str,
+    resume_context: str,
+    prompt_hash: str,
+) -> str:
+    parts = (
+        normalize_text(question),
+        normalize_text(answer),
+        (state or "").lower(),
+        resume_context,
+        prompt_hash,
+    )
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:
+    """Thread-safe TTL + LRU cache of evaluation dicts"""
+
+    def __init__(self, max_entries: int = 2048, ttl: float = 3600.0):
+        """
+        Args:
+            max_entries: Maximum number of cached evaluations
+            ttl: Seconds an entry stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def put(self, key: str, value: dict):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, dict(value))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_evaluation_cache = None
+
+
+def get_evaluation_cache() -> EvaluationCache:
+    """
+    Shared cache instance, configured with EVAL_CACHE_MAX_ENTRIES and
+    EVAL_CACHE_TTL_SECONDS
+    """
+    global _evaluation_cache
+    if _evaluation_cache is None:
+        _evaluation_cache = EvaluationCache(
+            max_entries=int(os.getenv("EVAL_CACHE_MAX_ENTRIES", "2048")),
+            ttl=float(os.getenv("EVAL_CACHE_TTL_SECONDS", "3600")),
+        )
+    return _evaluation_cache
@@ -0,0 +1,183 @@
+"""
+Speculative prefetch of the next interview question
+
+Once the candidate submits an answer, the next state is one of a few known
+transitions (see backend/engine/transition.js), decided by the evaluation
+that is still running. Questions for each of them are generated alongside
+that evaluation and kept per session; when the real request arrives the
+matching one is served at once and the rest dropped.
+
+A prefetched question is only served if it was generated from the same
+resume, job description and conversation, submitted answer included -
+follow-up and deep-dive questions are about that answer.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+# States the backend can move to from each state (time_up -> closing aside)
+NEXT_STATES = {
+    "introduction": ["resume-based"],
+    "resume-based": ["deep-dive", "follow-up"],
+    "follow-up": ["follow-up", "resume-based"],
+    "deep-dive": ["deep-dive", "resume-based"],
+}
+
+
+def make_prefetch_fingerprint(resume_data, job_description, conversation_history) -> str:
+    """
+    Hash of the question context, answers included
+
+    ``resume_data`` may also be the resume ID standing in for it.
+    """
+    history = [
+        {"question": qa.get("question"), "answer": qa.get("answer")}
+        for qa in (conversation_history or [])
+    ]
+    payload = json.dumps(
+        [resume_data, job_description or None, history],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class QuestionPrefetcher:
+    """Per-session background question generation (use from one event loop)"""
+
+    def __init__(self, max_sessions: int = 1000, ttl: float = 600.0):
+        """
+        Args:
+            max_sessions: Sessions with prefetched questions kept at once;
+                the least recently scheduled are dropped first
+            ttl: Seconds a prefetched question stays servable
+        """
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+
+        self._sessions = OrderedDict()
+
+    def schedule(
+        self,
+        session_id: str,
+        states: Iterable[str],
+        fingerprint: str,
+        generate: Callable[[str], Awaitable[Dict]],
+    ) -> List[str]:
+        """
+        Start generating a question for each state in the background
+
+        Replaces (and cancels) anything already prefetched for the session.
+
+        Args:
+            session_id: Interview session the questions belong to
+            states: Candidate next states
+            fingerprint: make_prefetch_fingerprint of the context used
+            generate: Coroutine function producing the question for a state
+
+        Returns:
+            The states scheduled
+        """
+        self.discard(session_id)
+        states = list(dict.fromkeys(states))
+        tasks = {state: asyncio.create_task(generate(state)) for state in states}
+        for task in tasks.values():
+            # Results are collected in take(); unconsumed failures are fine
+            task.add_done_callback(_consume_exception)
+
+        self._sessions[session_id] = {
+            "fingerprint": fingerprint,
+            "expires_at": time.monotonic() + self.ttl,
+            "tasks": tasks,
+        }
+        while len(self._sessions) > self.max_sessions:
+            oldest = next(iter(self._sessions))
+            self.discard(oldest)
+        return states
+
+    async def take(self, session_id: str, state: str, fingerprint: str) -> Optional[Dict]:
+        """
+        Prefetched question for ``state``, or None on a miss
+
+        Every prefetched question of the session is consumed: the one that
+        matches is returned (waiting for it if still generating), the
+        others are stale once the real state is known and are cancelled.
+        """
+        entry = self._sessions.pop(session_id, None)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        task = entry["tasks"].pop(state, None)
+        self._cancel(entry["tasks"].values())
+
+        usable = (
+            task is not None
+            and entry["fingerprint"] == fingerprint
+            and entry["expires_at"] >= time.monotonic()
+        )
+        if not usable:
+            if task is not None:
+                self._cancel([task])
+            self.misses += 1
+            return None
+
+        try:
+            result = await task
+        except Exception:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def discard(self, session_id: str):
+        """Drop (and cancel) whatever is prefetched for the session"""
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            self._cancel(entry["tasks"].values())
+
+    def _cancel(self, tasks):
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            self.discarded += 1
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "discarded": self.discarded,
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "ttl": self.ttl,
+        }
+
+
+def _consume_exception(task: asyncio.Task):
+    if not task.cancelled():
+        task.exception()
+
+
+_question_prefetcher = None
+
+
+def get_question_prefetcher() -> QuestionPrefetcher:
+    """
+    Shared prefetcher, configured with PREFETCH_MAX_SESSIONS and
+    PREFETCH_TTL_SECONDS
+    """
+    global _question_prefetcher
+    if _question_prefetcher is None:
+        _question_prefetcher = QuestionPrefetcher(
+            max_sessions=int(os.getenv("PREFETCH_MAX_SESSIONS", "1000")),
+            ttl=float(os.getenv("PREFETCH_TTL_SECONDS", "600")),
+        )
+    return _question_prefetcher
@@ -0,0 +1,167 @@
+"""
+Content-addressed cache for parsed resumes
+
+Parsing a resume costs a PDF load plus up to three LLM calls. The result only
+depends on the uploaded bytes, the extraction prompt and schema, how much
+of the text is read and the model, so it is cached in a local SQLite file
+keyed by a SHA-256 of those inputs.
+Entries are evicted least-recently-used once the cache exceeds ``max_bytes``.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / ".cache" / "resume_cache.sqlite3"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def make_resume_cache_key(
+    file_bytes: bytes,
+    prompt_template: str,
+    model: str,
+    schema: str = "",
+    text_budget: Optional[int] = None,
+    token_budget: Optional[int] = None,
+) -> str:
+    """
+    SHA-256 over the file contents, prompt template (or its hash), model id,
+    the schema text embedded in the prompt and the text budgets (cleaned
+    characters extracted, resume tokens sent)
+    """
+    budgets = f"{text_budget}:{token_budget}"
+    h = hashlib.sha256()
+    for part in (file_bytes, prompt_template.encode("utf-8"), model.encode("utf-8"),
+                 schema.encode("utf-8"), budgets.encode("utf-8")):
+        # Length-prefix each part so concatenations cannot collide
+        h.update(len(part).to_bytes(8, "big"))
+        h.update(part)
+    return h.hexdigest()
+
+
+class ResumeParseCache:
+    """SQLite-backed LRU cache of ResumeSchema JSON"""
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            db_path: SQLite file location (':memory:' for a throwaway cache)
+            max_bytes: Total payload size before LRU eviction kicks in
+        """
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.db_path = str(db_path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        if self.db_path != ":memory:":
+            # Prefork workers share the file; WAL lets readers run alongside a writer
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS resume_cache ("
+            " key TEXT PRIMARY KEY,"
+            " payload TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_resume_cache_access ON resume_cache(last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached resume dict, or None on a miss"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM resume_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE resume_cache SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, data: dict):
+        """Store a resume dict and evict old entries if over budget"""
+        payload = json.dumps(data, separators=(",", ":"))
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO resume_cache (key, payload, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, payload, size, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM resume_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM resume_cache ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM resume_cache WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM resume_cache"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM resume_cache")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_resume_cache = None
+
+
+def get_resume_cache() -> ResumeParseCache:
+    """
+    Shared cache instance, configured with RESUME_CACHE_PATH and
+    RESUME_CACHE_MAX_MB
+    """
+    global _resume_cache
+    if _resume_cache is None:
+        _resume_cache = ResumeParseCache(
+            db_path=os.getenv("RESUME_CACHE_PATH", str(DEFAULT_CACHE_PATH)),
+            max_bytes=int(os.getenv("RESUME_CACHE_MAX_MB", "64")) * 1024 * 1024,
+        )
+    return _resume_cache
@@ -0,0 +1,142 @@
+"""
+In-memory store of precomputed resume contexts, keyed by resume ID
+
+A ResumeContext is built when the resume is parsed and then looked up on
+every question and evaluation of the interview. The resume ID is the
+content hash of the parsed data (make_resume_id), so a request that only
+carries ``resume_data`` finds the same entry as one that carries the ID.
+Entries expire after ``ttl`` seconds and the least recently used entry is
+dropped past ``max_entries``; a miss just rebuilds from the data.
+
+Prefork workers each have their own store, so the parsed data behind an
+ID is also written to the shared SQLite resume cache (``backing``). A
+worker that did not parse the resume rebuilds the context from there
+instead of answering without it.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from resume_parsing.cache.resume_cache import ResumeParseCache, get_resume_cache
+from resume_parsing.llm.resume_context import ResumeContext, make_resume_id
+
+
+class ResumeContextStore:
+    """Thread-safe TTL + LRU map of resume ID -> ResumeContext"""
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl: float = 4 * 3600.0,
+        backing: Optional[ResumeParseCache] = None,
+    ):
+        """
+        Args:
+            max_entries: Maximum number of resumes kept
+            ttl: Seconds an entry stays valid after it was last used
+            backing: Cache shared between processes that keeps the resume
+                data per ID (None = this process only)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backing = backing
+        self.hits = 0
+        self.misses = 0
+
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._empty = None
+
+    def get(self, resume_id: str) -> Optional[ResumeContext]:
+        with self._lock:
+            entry = self._data.get(resume_id)
+            if entry is not None:
+                expires_at, context = entry
+                if expires_at >= time.monotonic():
+                    self._data[resume_id] = (time.monotonic() + self.ttl, context)
+                    self._data.move_to_end(resume_id)
+                    self.hits += 1
+                    return context
+                del self._data[resume_id]
+            self.misses += 1
+
+        # Parsed by another worker (or evicted here): rebuild from shared data
+        resume_data = self.backing.get(_backing_key(resume_id)) if self.backing else None
+        if resume_data is None:
+            return None
+        return self.put(ResumeContext(resume_data, resume_id), share=False)
+
+    def put(self, context: ResumeContext, share: bool = True) -> ResumeContext:
+        if share and self.backing is not None and context.resume_data:
+            self.backing.put(_backing_key(context.resume_id), context.resume_data)
+        with self._lock:
+            self._data[context.resume_id] = (time.monotonic() + self.ttl, context)
+            self._data.move_to_end(context.resume_id)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+        return context
+
+    def resolve(self, resume_data: Optional[Dict] = None, resume_id: Optional[str] = None) -> ResumeContext:
+        """
+        Context for a request, building (and storing) it on a miss
+
+        Args:
+            resume_data: Parsed resume sent with the request, if any
+            resume_id: ID returned by /api/parse-resume, if any
+
+        Returns:
+            The stored context; a shared "resume not provided" context when
+            there is neither data nor a known ID
+        """
+        if resume_id:
+            context = self.get(resume_id)
+            if context is not None:
+                return context
+        if resume_data:
+            resume_id = resume_id or make_resume_id(resume_data)
+            return self.get(resume_id) or self.put(ResumeContext(resume_data, resume_id))
+        if resume_id:
+            print(f"⚠️ Unknown resume_id {resume_id} (expired or evicted) and no resume_data, "
+                  "continuing without resume")
+        if self._empty is None:
+            self._empty = ResumeContext(None)
+        return self._empty
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def _backing_key(resume_id: str) -> str:
+    # Namespaced so IDs never collide with parse cache keys
+    return f"resume-context:{resume_id}"
+
+
+_resume_context_store = None
+
+
+def get_resume_context_store() -> ResumeContextStore:
+    """
+    Shared store, configured with RESUME_CONTEXT_MAX_ENTRIES and
+    RESUME_CONTEXT_TTL_SECONDS, backed by the resume cache
+    """
+    global _resume_context_store
+    if _resume_context_store is None:
+        _resume_context_store = ResumeContextStore(
+            max_entries=int(os.getenv("RESUME_CONTEXT_MAX_ENTRIES", "512")),
+            ttl=float(os.getenv("RESUME_CONTEXT_TTL_SECONDS", str(4 * 3600))),
+            backing=get_resume_cache(),
+        )
+    return _resume_context_store
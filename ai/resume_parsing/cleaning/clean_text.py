@@ -1,4 +1,5 @@
 import re
+from typing import Iterable, Iterator, Optional, Tuple
 
 BULLET_PATTERN = re.compile(r"[•▪◦‣–—*→]")
 
@@ -7,10 +8,18 @@ DATE_PATTERN = re.compile(
     r"[a-z]*\.?\s+\d{4}\s*[-–]\s*(Present|\d{4})",
     re.IGNORECASE
 )
-LOCATION_PATTERN = re.compile(
-    r"([A-Za-z .&]+)([A-Z][a-z]+(?:\s[A-Z][a-z]+)*,\s[A-Z]{2})"
-)
+# Every DATE_PATTERN match contains a year
+_YEAR = re.compile(r"\d{4}")
 
+# "<organisation><City Words>, <ST>" lines, e.g. "Acme Corp Austin, TX".
+# The old single regex ([A-Za-z .&]+)([A-Z][a-z]+(?:\s[A-Z][a-z]+)*,\s[A-Z]{2})
+# let the organisation run and the city words compete for the same
+# characters, which backtracks quadratically on long lines. The match is
+# now done in anchored pieces, each linear in the line length.
+LOCATION_PATTERN = re.compile(r"[A-Z][a-z]+(?:\s[A-Z][a-z]+)*,\s[A-Z]{2}")
+_ORG_CHARS = re.compile(r"[A-Za-z .&]*")
+_STATE_SUFFIX = re.compile(r",\s[A-Z]{2}")
+_LAST_WORD = re.compile(r"[A-Z][a-z]+$")
 
 
 def clean_text(raw_text: str) -> str:
@@ -18,48 +27,89 @@ def clean_text(raw_text: str) -> str:
     Light-touch resume text cleaning.
     SAFE version: no deletions, no inference.
     """
+    return "\n".join(iter_clean_lines(raw_text.split("\n")))
+
 
-    text = raw_text
-    text = _separate_org_and_location(text)
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
-    text = "\n".join(line.rstrip() for line in text.split("\n"))
-    text = BULLET_PATTERN.sub("-", text)
-    text = _split_role_and_date(text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    return text.strip()
+def iter_clean_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Streaming clean_text: consumes raw lines and yields cleaned ones.
 
-def _separate_org_and_location(text: str) -> str:
-    lines = text.split("\n")
-    fixed = []
+    All transforms are applied to one line at a time in a single pass, so
+    only as many input lines are read as the caller pulls output lines and
+    a consumer with a budget can stop early.
+    """
+    started = False
+    blank_run = False
 
     for line in lines:
-        match = LOCATION_PATTERN.fullmatch(line.strip())
-        if match:
-            org, location = match.groups()
-            fixed.append(f"{org.strip()}, {location.strip()}")
+        # Cheap pre-checks keep the regexes off lines they can't match
+        if line.rstrip()[-4:-3] == ",":
+            line = _separate_org_and_location_line(line)
+        if "\r" in line:
+            if line.endswith("\r"):
+                # The "\n" half of a CRLF was consumed by the line split
+                line = line[:-1]
+            parts = line.replace("\r", "\n").split("\n")
         else:
-            fixed.append(line)
+            parts = (line,)
 
-    return "\n".join(fixed)
+        for part in parts:
+            part = BULLET_PATTERN.sub("-", part.rstrip())
+            if not part:
+                # Runs of blank lines collapse to one; leading and
+                # trailing blanks are dropped
+                blank_run = started
+                continue
+            split = _split_role_and_date_line(part) if _YEAR.search(part) else None
+            if not started:
+                started = True
+                part = part.lstrip()
+            elif blank_run:
+                yield ""
+            blank_run = False
+            if split:
+                yield from split
+            else:
+                yield part
 
 
-def _split_role_and_date(text: str) -> str:
-    lines = text.split("\n")
-    fixed = []
+def _match_location(line: str) -> Optional[Tuple[str, str]]:
+    """
+    Split "<org><location>" where location is "City Words, ST"
 
-    for line in lines:
-        match = DATE_PATTERN.search(line)
-        if match:
-            idx = match.start()
-            before = line[:idx].strip()
-            after = line[idx:].strip()
-
-            if before and after:
-                fixed.append(before)
-                fixed.append(after)
-            else:
-                fixed.append(line)
-        else:
-            fixed.append(line)
+    Same result as LOCATION_PATTERN's predecessor: the organisation is the
+    longest prefix of [A-Za-z .&] characters that leaves a valid location.
+    """
+    head_end = len(line) - 4
+    if head_end < 2 or not _STATE_SUFFIX.fullmatch(line, head_end):
+        return None
+    # The organisation can't extend past the first non-[A-Za-z .&] char,
+    # and the location starts with the city word ending there
+    org_end = _ORG_CHARS.match(line, 0, head_end).end()
+    word = _LAST_WORD.search(line, 0, org_end)
+    if not word or word.start() == 0:
+        return None
+    if org_end < head_end and not LOCATION_PATTERN.fullmatch(line, word.start()):
+        return None
+    return line[:word.start()], line[word.start():]
+
+
+def _separate_org_and_location_line(line: str) -> str:
+    match = _match_location(line.strip())
+    if match:
+        org, location = match
+        return f"{org.strip()}, {location.strip()}"
+    return line
+
+
+def _split_role_and_date_line(line: str) -> Optional[Tuple[str, str]]:
+    """Split "Role Jan 2020 - 2022" into role and dates, None if no split"""
+    match = DATE_PATTERN.search(line)
+    if match:
+        idx = match.start()
+        before = line[:idx].strip()
+        after = line[idx:].strip()
 
-    return "\n".join(fixed)
+        if before and after:
+            return before, after
+    return None
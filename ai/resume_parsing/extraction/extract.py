@@ -1,30 +1,55 @@
+import io
 from pathlib import Path
-from typing import Union
-from langchain_community.document_loaders import PyPDFLoader
-from docx import Document
-def extract_text(file_path: Union[str, Path]) -> str:
+from typing import Iterator, Optional, Union
+from resume_parsing.extraction.pdf_engine import extract_pdf_text, iter_pdf_pages
+def extract_text(file_path: Union[str, Path], max_chars: Optional[int] = None) -> str:
     file_path = Path(file_path)
     if not file_path.exists():
         raise FileNotFoundError(f"The file {file_path} does not exist.")
-    suffix = file_path.suffix.lower()
+    return extract_text_from_bytes(file_path.read_bytes(), file_path.suffix, max_chars)
+def extract_text_from_bytes(data: bytes, suffix: str, max_chars: Optional[int] = None) -> str:
+    """Extract text from in-memory PDF/DOCX contents (``suffix`` like '.pdf')"""
+    suffix = suffix.lower()
     if suffix == ".pdf":
-        return _extract_from_pdf(file_path)
+        return _extract_from_pdf(data, max_chars)
     if suffix == ".docx":
-        return _extract_from_docx(file_path)
+        return _extract_from_docx(data)
     raise ValueError(f"Unsupported file type: {suffix}")
-def _extract_from_pdf(file_path: Path) -> str:
-    loader = PyPDFLoader(str(file_path))
-    pages = loader.load()
-    
-    chunks = []
-    for page in pages:
-        if page.page_content:
-            chunks.append(page.page_content.strip())
-    print("PDF pages loaded:", len(pages))
-    print("Extracted text length:", len("\n\n".join(chunks)))
-    return "\n\n".join(chunks)
-def _extract_from_docx(file_path: Path) -> str:
-    doc = Document(file_path)
+def iter_text_lines(data: bytes, suffix: str) -> Iterator[str]:
+    """
+    Lazily yield the lines of ``extract_text_from_bytes(data, suffix)``
+
+    PDF pages are only extracted as the consumer reaches them.
+    """
+    suffix = suffix.lower()
+    if suffix == ".pdf":
+        pages = iter_pdf_pages(data)
+        try:
+            first = True
+            for text in pages:
+                if not text:
+                    continue
+                if not first:
+                    yield ""
+                first = False
+                yield from text.split("\n")
+        finally:
+            pages.close()
+    elif suffix == ".docx":
+        from docx import Document
+        for para in Document(io.BytesIO(data)).paragraphs:
+            text = para.text.strip()
+            if text:
+                yield from text.split("\n")
+    else:
+        raise ValueError(f"Unsupported file type: {suffix}")
+def _extract_from_pdf(data: bytes, max_chars: Optional[int] = None) -> str:
+    text = extract_pdf_text(data, max_chars=max_chars)
+    print("Extracted text length:", len(text))
+    return text
+def _extract_from_docx(data: bytes) -> str:
+    from docx import Document
+    doc = Document(io.BytesIO(data))
     paragraphs = []
     for para in doc.paragraphs:
         text = para.text.strip()
@@ -0,0 +1,162 @@
+"""
+Direct PDF text extraction with pypdf
+
+Works on in-memory bytes, extracts the pages of long documents in parallel
+worker processes (pypdf is pure Python, so threads would just contend for
+the GIL) and stops as soon as a character budget is met - the LLM only ever
+reads the start of a resume.
+
+The worker processes belong to one long-lived pool per process, started by
+a fork server rather than forked from the (threaded) caller, and the first
+pages are always read inline: a typical budget is met by then and the pool
+is never touched.
+"""
+
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
+
+
+# Documents with fewer pages are extracted inline; handing pages to other
+# processes costs more than extracting a handful of them
+PARALLEL_MIN_PAGES = 8
+PAGES_PER_TASK = 4
+# Pages read inline before the rest go to the pool (when a budget may stop
+# extraction early)
+INLINE_PAGES = 2
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pool_size() -> int:
+    return min(4, os.cpu_count() or 1)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Forking a multi-threaded server can copy locks held by other
+            # threads into the child; the fork server is single-threaded
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _executor = ProcessPoolExecutor(max_workers=_pool_size(), mp_context=context)
+        return _executor
+
+
+def shutdown_executor(wait: bool = True):
+    """Stop the extraction processes (called on application shutdown)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+def _forget_executor_after_fork():
+    # A prefork worker must not reuse the master's pool (its processes and
+    # queues belong to the parent): start its own on first use
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_executor_after_fork)
+
+
+def _open_pdf(data: bytes):
+    # pypdf is imported on first use, not with the API
+    from pypdf import PdfReader
+    return PdfReader(io.BytesIO(data))
+
+
+def _extract_page_range(data: bytes, start: int, end: int) -> List[str]:
+    reader = _open_pdf(data)
+    return [(reader.pages[i].extract_text() or "").strip() for i in range(start, end)]
+
+
+def iter_pdf_pages(
+    data: bytes,
+    parallel_min_pages: int = PARALLEL_MIN_PAGES,
+    max_workers: Optional[int] = None,
+    inline_pages: int = INLINE_PAGES,
+) -> Iterator[str]:
+    """
+    Yield the stripped text of each page, in order
+
+    Pages are only extracted as the caller consumes them (a wave of
+    ``max_workers`` tasks ahead in parallel mode), so stopping early skips
+    the rest of the document. The first ``inline_pages`` pages are
+    extracted here; the parallel wave starts only if the caller reads on.
+    """
+    reader = _open_pdf(data)
+    page_count = len(reader.pages)
+
+    if page_count < parallel_min_pages:
+        inline_pages = page_count
+    for page in reader.pages[:inline_pages]:
+        yield (page.extract_text() or "").strip()
+    if inline_pages >= page_count:
+        return
+
+    max_workers = max_workers or _pool_size()
+    executor = _get_executor()
+    ranges = [
+        (s, min(s + PAGES_PER_TASK, page_count))
+        for s in range(inline_pages, page_count, PAGES_PER_TASK)
+    ]
+
+    futures = []
+    try:
+        next_range = 0
+        while next_range < len(ranges) or futures:
+            # Keep one wave of tasks in flight ahead of the consumer
+            while next_range < len(ranges) and len(futures) < max_workers:
+                start, end = ranges[next_range]
+                futures.append(executor.submit(_extract_page_range, data, start, end))
+                next_range += 1
+            for text in futures.pop(0).result():
+                yield text
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def extract_pdf_text(
+    data: bytes,
+    max_chars: Optional[int] = None,
+    parallel_min_pages: int = PARALLEL_MIN_PAGES,
+    max_workers: Optional[int] = None,
+) -> str:
+    """
+    Extract text from PDF bytes, pages joined by blank lines
+
+    Args:
+        data: PDF file contents
+        max_chars: Stop extracting once this many characters are collected
+            (None = whole document)
+        parallel_min_pages: Page count from which pages are extracted in
+            worker processes
+        max_workers: Page tasks in flight at once for parallel extraction
+            (the shared pool has up to 4 processes)
+    """
+    chunks = []
+    total = 0
+    # Without a budget every page is read: no point holding the pool back
+    inline_pages = INLINE_PAGES if max_chars is not None else 0
+    pages = iter_pdf_pages(data, parallel_min_pages, max_workers, inline_pages)
+    try:
+        for text in pages:
+            if text:
+                chunks.append(text)
+                total += len(text) + 2
+            if max_chars is not None and total >= max_chars:
+                break
+    finally:
+        pages.close()
+    return "\n\n".join(chunks)
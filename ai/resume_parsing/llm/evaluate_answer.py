@@ -1,27 +1,180 @@
 """
 Answer evaluation using LLM with rubric-based scoring
 """
-from pathlib import Path
 import json
+import asyncio
 import re
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 import os
-from urllib import response
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+from resume_parsing.llm.hf_llm import ainvoke_llm, invoke_llm
+from resume_parsing.schema.interview_schema import AnswerEvaluation
+from resume_parsing.cache.evaluation_cache import make_evaluation_cache_key
+from resume_parsing.llm.token_budget import PromptSection, counter_for, pack_sections, prompt_budget
+from resume_parsing.llm.prompt_registry import get_prompt_registry
+from resume_parsing.cache.resume_context_store import get_resume_context_store
+from runtime.executor import PoolSaturated
 
-token = os.getenv("HUGGINGFACEHUB_API_TOKEN")
-if not token:
-    raise RuntimeError("HUGGINGFACEHUB_API_TOKEN not set")
+# Longest answer (in tokens) sent for evaluation; the model's prompt budget
+# may cut it further
+ANSWER_MAX_TOKENS = int(os.getenv("EVAL_ANSWER_MAX_TOKENS", "3000"))
 
-def load_evaluation_prompt() -> str:
-    """Load the answer evaluation prompt template"""
-    prompt_path = Path(__file__).parent / "prompts" / "answer_evaluation.txt"
-    with open(prompt_path, 'r') as f:
-        return f.read()
+get_prompt_registry().require("answer_evaluation", ("question", "answer", "state", "resume_context"))
+get_prompt_registry().require("answer_evaluation_batch", ("count", "resume_context", "items"))
+
+
+def load_evaluation_prompt():
+    """Answer evaluation prompt template (compiled, kept in memory)"""
+    return get_prompt_registry().get("answer_evaluation")
+
+
+def _resume_context(resume_data=None, context=None) -> str:
+    """Evaluation summary of the resume, from the precomputed ResumeContext"""
+    if context is None:
+        context = get_resume_context_store().resolve(resume_data)
+    return context.evaluation_context
+
+
+def build_evaluation_prompt(
+    question: str,
+    answer: str,
+    state: str = "unknown",
+    resume_data: Optional[Dict] = None,
+    llm=None,
+    context=None
+) -> str:
+    """Build the rubric evaluation prompt for one question/answer pair"""
+    return _format_evaluation_prompt(
+        load_evaluation_prompt(), question, answer, state,
+        _resume_context(resume_data, context), llm
+    )
+
+
+def _format_evaluation_prompt(template, question, answer, state, resume_context, llm=None) -> str:
+    """
+    Fill the evaluation template within ``llm``'s prompt budget
+
+    The question is kept whole first, then as much of the answer as fits
+    (from the start), then the resume context.
+    """
+    counter = counter_for(llm)
+    fields = {"question": "", "answer": "", "state": state, "resume_context": ""}
+    budget = prompt_budget(llm) - counter.count(template.format(**fields))
+    fields.update(pack_sections(
+        [
+            PromptSection("question", question, priority=0),
+            PromptSection("answer", answer, priority=1, max_tokens=ANSWER_MAX_TOKENS),
+            PromptSection("resume_context", resume_context, priority=2),
+        ],
+        budget,
+        counter,
+    ))
+    return template.format(**fields)
+
+
+def _evaluation_cache_key(question, answer, state, resume_context, prompt_template) -> str:
+    return make_evaluation_cache_key(
+        question, answer, state, resume_context, prompt_template.hash
+    )
+
+
+def _parse_evaluation(response_obj) -> Dict:
+    """Parse rubric scores from the LLM response (raises on bad output)"""
+    # Schema-constrained responses arrive already validated
+    parsed = getattr(response_obj, "parsed", None)
+    if isinstance(parsed, AnswerEvaluation):
+        return _score_result(parsed.model_dump())
+
+    # Extract content from response object
+    content = getattr(response_obj, "content", None)
+    if not content or not content.strip():
+        raise ValueError("LLM returned empty response")
+
+    response = content.strip()
+
+    # Parse JSON response
+    # Parse JSON response safely
+    try:
+        result = json.loads(response)
+    except json.JSONDecodeError:
+        json_match = re.search(r'\{.*\}', response, re.DOTALL)
+        if json_match:
+            result = json.loads(json_match.group())
+        else:
+            raise ValueError("No valid JSON found in LLM response")
+
+    return _score_result(result)
+
+
+def _score_result(result: Dict) -> Dict:
+    """Clamp rubric scores and compute the weighted final score"""
+    # Extract rubric scores
+    technical = int(result.get("technical_accuracy", 5))
+    depth = int(result.get("depth", 5))
+    clarity = int(result.get("clarity", 5))
+    relevance = int(result.get("relevance", 5))
+
+    # Clamp values 1–10
+    technical = max(1, min(10, technical))
+    depth = max(1, min(10, depth))
+    clarity = max(1, min(10, clarity))
+    relevance = max(1, min(10, relevance))
+
+    # Calculate weighted final score
+    final_score = round(
+        (technical * 0.40) +
+        (depth * 0.25) +
+        (clarity * 0.20) +
+        (relevance * 0.15),
+        2
+    )
+
+    signal = result.get("signal", "").upper()
+    if signal not in ["GOOD", "AVERAGE", "BAD"]:
+        if final_score >= 7:
+            signal = "GOOD"
+        elif final_score >= 4:
+            signal = "AVERAGE"
+        else:
+            signal = "BAD"
+
+    feedback = result.get("feedback", "Answer evaluated.")
+
+    return {
+        "technical_accuracy": technical,
+        "depth": depth,
+        "clarity": clarity,
+        "relevance": relevance,
+        "final_score": final_score,
+        "signal": signal,
+        "feedback": feedback
+    }
+
+
+def parse_evaluation_response(response_obj) -> Dict:
+    """
+    Turn the raw LLM response into rubric scores
+
+    Falls back to neutral scores if the response cannot be parsed.
+    """
+    try:
+        return _parse_evaluation(response_obj)
+    except Exception:
+        return fallback_evaluation()
+
+
+def fallback_evaluation() -> Dict:
+    """Neutral scores used when the LLM is unavailable or unparseable"""
+    return {
+        "technical_accuracy": 5,
+        "depth": 5,
+        "clarity": 5,
+        "relevance": 5,
+        "final_score": 5.0,
+        "signal": "AVERAGE",
+        "feedback": "Automated evaluation temporarily unavailable."
+    }
 
 
 def evaluate_answer(
@@ -29,7 +182,9 @@ def evaluate_answer(
     question: str,
     answer: str,
     state: str = "unknown",
-    resume_data: Optional[Dict] = None
+    resume_data: Optional[Dict] = None,
+    cache=None,
+    context=None
 ) -> Dict:
     """
     Evaluate an interview answer using LLM with rubric-based scoring
@@ -40,6 +195,9 @@ def evaluate_answer(
         answer: The candidate's answer
         state: Current interview state (for context)
         resume_data: Optional resume data for context
+        cache: Optional EvaluationCache; when given, the result also
+            carries a ``cached`` flag
+        context: Precomputed ResumeContext for resume_data (optional)
 
     Returns:
         Dict with keys:
@@ -51,100 +209,244 @@ def evaluate_answer(
         - signal (GOOD/AVERAGE/BAD)
         - feedback (str)
     """
+    prompt_template = load_evaluation_prompt()
+    resume_context = _resume_context(resume_data, context)
+    cache_key = None
+    if cache is not None:
+        cache_key = _evaluation_cache_key(question, answer, state, resume_context, prompt_template)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    prompt = _format_evaluation_prompt(
+        prompt_template, question, answer, state, resume_context, llm
+    )
 
-    # Prepare resume context
-    resume_context = "Not available"
-    if resume_data:
-        name = resume_data.get('name', 'Unknown')
-        skills = resume_data.get('skills', [])
-        experience = resume_data.get('experience', [])
+    # Call LLM
+    try:
+        result = _parse_evaluation(invoke_llm(llm, prompt, AnswerEvaluation))
+    except Exception:
+        # Fallback to basic scoring if LLM fails (never cached)
+        return _finish(fallback_evaluation(), cache)
 
-        skills_str = ', '.join(skills[:5]) if skills else 'Not listed'
-        exp_count = len(experience) if experience else 0
+    if cache is not None:
+        cache.put(cache_key, result)
+    return _finish(result, cache)
 
-        resume_context = f"Candidate: {name}, Skills: {skills_str}, Experience: {exp_count} positions"
 
-    # Load and format prompt
+async def aevaluate_answer(
+    llm,
+    question: str,
+    answer: str,
+    state: str = "unknown",
+    resume_data: Optional[Dict] = None,
+    cache=None,
+    context=None
+) -> Dict:
+    """Async version of evaluate_answer (awaits llm.ainvoke)"""
     prompt_template = load_evaluation_prompt()
-    prompt = prompt_template.format(
-        question=question,
-        answer=answer,
-        state=state,
-        resume_context=resume_context
+    resume_context = _resume_context(resume_data, context)
+    cache_key = None
+    if cache is not None:
+        cache_key = _evaluation_cache_key(question, answer, state, resume_context, prompt_template)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    prompt = _format_evaluation_prompt(
+        prompt_template, question, answer, state, resume_context, llm
     )
 
-    # Call LLM
     try:
-        response_obj = llm.invoke(prompt)
+        result = _parse_evaluation(await ainvoke_llm(llm, prompt, AnswerEvaluation))
+    except PoolSaturated:
+        # Overload is the client's to retry (503), not a score
+        raise
+    except Exception:
+        return _finish(fallback_evaluation(), cache)
 
-        # Extract content from response object
-        content = getattr(response_obj, "content", None)
-        if not content or not content.strip():
-            raise ValueError("LLM returned empty response")
+    if cache is not None:
+        cache.put(cache_key, result)
+    return _finish(result, cache)
 
-        response = content.strip()
 
-        # Parse JSON response
-        # Parse JSON response safely
-        try:
-            result = json.loads(response)
-        except json.JSONDecodeError:
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                result = json.loads(json_match.group())
-            else:
-                raise ValueError("No valid JSON found in LLM response")
-
-        # Extract rubric scores
-        technical = int(result.get("technical_accuracy", 5))
-        depth = int(result.get("depth", 5))
-        clarity = int(result.get("clarity", 5))
-        relevance = int(result.get("relevance", 5))
-
-        # Clamp values 1–10
-        technical = max(1, min(10, technical))
-        depth = max(1, min(10, depth))
-        clarity = max(1, min(10, clarity))
-        relevance = max(1, min(10, relevance))
-
-        # Calculate weighted final score
-        final_score = round(
-            (technical * 0.40) +
-            (depth * 0.25) +
-            (clarity * 0.20) +
-            (relevance * 0.15),
-            2
+def _finish(result: Dict, cache) -> Dict:
+    if cache is not None:
+        return {**result, "cached": False}
+    return result
+
+
+def load_batch_evaluation_prompt():
+    """Multi-answer evaluation prompt template (compiled, kept in memory)"""
+    return get_prompt_registry().get("answer_evaluation_batch")
+
+
+def _item_resume_context(item: Dict) -> str:
+    context = get_resume_context_store().resolve(item.get("resume_data"), item.get("resume_id"))
+    return context.evaluation_context
+
+
+def _item_cache_key(item: Dict, prompt_template) -> str:
+    return _evaluation_cache_key(
+        item["question"], item["answer"], item.get("state") or "unknown",
+        _item_resume_context(item), prompt_template
+    )
+
+
+def _parse_packed_evaluation(response_obj, count: int) -> List[Dict]:
+    """Parse a JSON array of ``count`` evaluations (raises on bad output)"""
+    content = getattr(response_obj, "content", None)
+    if not content or not content.strip():
+        raise ValueError("LLM returned empty response")
+
+    response = content.strip()
+    start = response.find("[")
+    end = response.rfind("]")
+    if start == -1 or end < start:
+        raise ValueError("No JSON array found in LLM response")
+
+    results = json.loads(response[start:end + 1])
+    if not isinstance(results, list) or len(results) != count:
+        raise ValueError(f"Expected {count} evaluations in LLM response")
+    return [_score_result(r) for r in results]
+
+
+async def _aevaluate_single(llm, item: Dict, prompt_template) -> Dict:
+    """One LLM call for one item (raises on LLM or parse failure)"""
+    prompt = _format_evaluation_prompt(
+        prompt_template, item["question"], item["answer"],
+        item.get("state") or "unknown", _item_resume_context(item), llm
+    )
+    return _parse_evaluation(await ainvoke_llm(llm, prompt, AnswerEvaluation))
+
+
+async def _aevaluate_packed(llm, items: List[Dict]) -> List[Dict]:
+    """
+    One LLM call scoring several items (raises on LLM or parse failure)
+
+    The prompt carries one resume context: callers only pack items that
+    share it (see aevaluate_answers_batch).
+    """
+    resume_context = _item_resume_context(items[0])
+    template = load_batch_evaluation_prompt()
+
+    def item_text(i, item, answer):
+        return (
+            f"[{i}] State: {item.get('state') or 'unknown'}\n"
+            f"Question:\n{item['question']}\n"
+            f"Candidate Answer:\n{answer}"
         )
 
-        signal = result.get("signal", "").upper()
-        if signal not in ["GOOD", "AVERAGE", "BAD"]:
-            if final_score >= 7:
-                signal = "GOOD"
-            elif final_score >= 4:
-                signal = "AVERAGE"
-            else:
-                signal = "BAD"
-
-        feedback = result.get("feedback", "Answer evaluated.")
-
-        return {
-            "technical_accuracy": technical,
-            "depth": depth,
-            "clarity": clarity,
-            "relevance": relevance,
-            "final_score": final_score,
-            "signal": signal,
-            "feedback": feedback
-        }
+    # The answers split what the prompt budget leaves evenly
+    counter = counter_for(llm)
+    overhead = counter.count(template.format(
+        count=len(items),
+        resume_context=resume_context,
+        items="\n\n".join(item_text(i, item, "") for i, item in enumerate(items, 1))
+    ))
+    answer_share = min(ANSWER_MAX_TOKENS, max(1, (prompt_budget(llm) - overhead) // len(items)))
+    items_text = "\n\n".join(
+        item_text(i, item, counter.truncate(item["answer"], answer_share))
+        for i, item in enumerate(items, 1)
+    )
+    prompt = template.format(
+        count=len(items),
+        resume_context=resume_context,
+        items=items_text
+    )
+    return _parse_packed_evaluation(await ainvoke_llm(llm, prompt), len(items))
 
-    except Exception:
-        # Fallback to basic scoring if LLM fails
-        return {
-            "technical_accuracy": 5,
-            "depth": 5,
-            "clarity": 5,
-            "relevance": 5,
-            "final_score": 5.0,
-            "signal": "AVERAGE",
-            "feedback": "Automated evaluation temporarily unavailable."
-        }
\ No newline at end of file
+
+async def aevaluate_answers_batch(
+    llm,
+    items: List[Dict],
+    cache=None,
+    max_concurrency: int = 4,
+    pack_size: int = 1
+) -> Dict:
+    """
+    Evaluate a whole interview's answers concurrently
+
+    Args:
+        llm: LLM instance (HuggingFaceLLM)
+        items: Dicts with question, answer, state and resume_data
+            (or the resume_id of a stored ResumeContext)
+        cache: Optional EvaluationCache shared with single evaluations
+        max_concurrency: Maximum LLM calls in flight at once
+        pack_size: Q/A pairs scored per LLM call (1 = one call per answer).
+            Only answers against the same resume are packed together; a
+            pack whose output can't be parsed is re-scored item by item.
+
+    Returns:
+        Dict with keys:
+        - results (list of evaluation dicts, in input order)
+        - overall_score (float, average of final scores)
+    """
+    prompt_template = load_evaluation_prompt()
+    # Packed scores come from a different prompt and are cached under its hash
+    pack_size = max(1, pack_size)
+    batch_template = load_batch_evaluation_prompt() if pack_size > 1 else None
+    results: List[Optional[Dict]] = [None] * len(items)
+
+    # Serve cache hits first so they never take a concurrency slot
+    pending = []
+    for index, item in enumerate(items):
+        if cache is not None:
+            cached = cache.get(_item_cache_key(item, prompt_template))
+            if cached is None and batch_template is not None:
+                cached = cache.get(_item_cache_key(item, batch_template))
+            if cached is not None:
+                results[index] = {**cached, "cached": True}
+                continue
+        pending.append(index)
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def score_single(index):
+        try:
+            async with semaphore:
+                result = await _aevaluate_single(llm, items[index], prompt_template)
+        except PoolSaturated:
+            raise
+        except Exception:
+            results[index] = _finish(fallback_evaluation(), cache)
+            return
+        if cache is not None:
+            cache.put(_item_cache_key(items[index], prompt_template), result)
+        results[index] = _finish(result, cache)
+
+    async def score_pack(group):
+        if len(group) == 1:
+            await score_single(group[0])
+            return
+        try:
+            async with semaphore:
+                packed = await _aevaluate_packed(llm, [items[i] for i in group])
+        except PoolSaturated:
+            raise
+        except Exception:
+            await asyncio.gather(*(score_single(index) for index in group))
+            return
+        for index, result in zip(group, packed):
+            if cache is not None:
+                cache.put(_item_cache_key(items[index], batch_template), result)
+            results[index] = _finish(result, cache)
+
+    # A pack prompt holds one resume context: pack per candidate resume
+    by_context: Dict[str, List[int]] = {}
+    for index in pending:
+        by_context.setdefault(_item_resume_context(items[index]), []).append(index)
+    groups = [
+        indices[i:i + pack_size]
+        for indices in by_context.values()
+        for i in range(0, len(indices), pack_size)
+    ]
+    await asyncio.gather(*(score_pack(group) for group in groups))
+
+    scores = [r["final_score"] for r in results]
+    overall_score = round(sum(scores) / len(scores), 2) if scores else 0.0
+
+    return {
+        "results": results,
+        "overall_score": overall_score
+    }
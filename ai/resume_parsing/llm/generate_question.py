@@ -1,86 +1,110 @@
 """
 Question generation using LLM
 """
-from pathlib import Path
 import json
+import os
 import re
 
+from resume_parsing.llm.hf_llm import ainvoke_llm, astream_llm, invoke_llm
+from resume_parsing.llm.stream_json import StreamingJSONObject
+from resume_parsing.schema.interview_schema import GeneratedQuestion
+from resume_parsing.llm.token_budget import PromptSection, counter_for, pack_sections, prompt_budget
+from resume_parsing.llm.prompt_registry import get_prompt_registry
+from resume_parsing.cache.resume_context_store import get_resume_context_store
+
+# Token caps for the conversation history in the question prompt: most
+# recent turns are kept first, each answer clipped to its own cap
+HISTORY_MAX_TOKENS = int(os.getenv("QUESTION_HISTORY_MAX_TOKENS", "800"))
+HISTORY_ANSWER_MAX_TOKENS = int(os.getenv("QUESTION_HISTORY_ANSWER_MAX_TOKENS", "150"))
+
+
+# Uncovered resume topics suggested to resume-based questions
+TOPIC_HINT_LIMIT = int(os.getenv("QUESTION_TOPIC_HINTS", "5"))
+
+
+get_prompt_registry().require(
+    "question_generation", ("state", "job_description", "resume_context", "conversation_history")
+)
+
 
 def load_prompt_template():
-    """Load question generation prompt template"""
-    prompt_path = Path(__file__).parent / "prompts" / "question_generation.txt"
-    return prompt_path.read_text()
+    """Question generation prompt template (compiled, kept in memory)"""
+    return get_prompt_registry().get("question_generation")
 
 
-def generate_question(llm, state, resume_data=None, job_description=None, conversation_history=None):
+def build_history_text(conversation_history, budget, counter):
     """
-    Generate interview question using LLM
-    
-    Args:
-        llm: HuggingFaceLLM instance
-        state: Current interview state (introduction, resume-based, follow-up, deep-dive, closing)
-        resume_data: Parsed resume data (optional)
-        job_description: Job description text (optional)
-        conversation_history: List of previous Q&A pairs (optional)
-    
-    Returns:
-        dict: Generated question with difficulty and category
+    Previous Q&A turns that fit in ``budget`` tokens, newest first
+
+    Answers are clipped to HISTORY_ANSWER_MAX_TOKENS; whole turns are
+    dropped (oldest first) once the budget runs out.
     """
-    # Load template
-    template = load_prompt_template()
-    
-    # Build resume context
-    resume_context = ""
-    if resume_data:
-        # Extract key info from resume
-        skills = resume_data.get('skills', [])
-        experiences = resume_data.get('experiences', [])
-        projects = resume_data.get('projects', [])
-        
-        if skills:
-            resume_context += f"\nCANDIDATE SKILLS: {', '.join(skills[:10])}"
-        
-        if experiences:
-            exp_summary = []
-            for exp in experiences[:3]:  # Top 3 experiences
-                role = exp.get('role', 'N/A')
-                org = exp.get('organization', 'N/A')
-                exp_summary.append(f"{role} at {org}")
-            resume_context += f"\nWORK EXPERIENCE: {'; '.join(exp_summary)}"
-        
-        if projects:
-            proj_summary = []
-            for proj in projects[:3]:  # Top 3 projects
-                name = proj.get('name', 'N/A')
-                techs = proj.get('technologies', [])
-                proj_summary.append(f"{name} ({', '.join(techs[:3])})")
-            resume_context += f"\nPROJECTS: {'; '.join(proj_summary)}"
-    
-    if not resume_context:
-        resume_context = "\nCANDIDATE RESUME: Not provided"
-    
+    turns = []
+    for qa in conversation_history:
+        answer = qa.get('answer', 'N/A') or ''
+        clipped = counter.truncate(answer, HISTORY_ANSWER_MAX_TOKENS)
+        if clipped != answer:
+            clipped += "..."  # Truncate long answers
+        turns.append((qa.get('question', 'N/A'), clipped))
+
+    sections = []
+    for index, (question, answer) in enumerate(turns):
+        text = f"\nQ: {question}\nA: {answer}"
+        tokens = counter.count(text)
+        sections.append(PromptSection(
+            str(index), text, priority=len(turns) - index, min_tokens=tokens
+        ))
+    packed = pack_sections(sections, budget, counter)
+
+    kept = [turns[i] for i in range(len(turns)) if packed[str(i)]]
+    history_text = "\nPREVIOUS CONVERSATION:"
+    for i, (question, answer) in enumerate(kept, 1):
+        history_text += f"\nQ{i}: {question}"
+        history_text += f"\nA{i}: {answer}"
+    return history_text
+
+
+def build_question_prompt(state, resume_data=None, job_description=None, conversation_history=None, llm=None, context=None):
+    """
+    Build the question generation prompt from interview context
+
+    The conversation history gets whatever ``llm``'s prompt budget leaves
+    after the rest of the prompt, up to HISTORY_MAX_TOKENS. ``context`` is
+    the precomputed ResumeContext; without one it is looked up (or built)
+    from ``resume_data``.
+    """
+    if context is None:
+        context = get_resume_context_store().resolve(resume_data)
+
+    # Steer resume questions towards what hasn't been asked about yet
+    topic_hint = ""
+    if state == "resume-based":
+        topics = context.uncovered_topics(conversation_history, TOPIC_HINT_LIMIT)
+        if topics:
+            topic_hint = f"\nRESUME TOPICS NOT YET COVERED: {', '.join(topics)}"
+
+    # Resume block is already bound into the context's template
+    def fill(history_text):
+        return context.question_template.format(
+            state=state,
+            job_description=job_description or "General technical interview",
+            conversation_history=history_text + topic_hint
+        )
+
     # Build conversation history
-    history_text = ""
     if conversation_history and len(conversation_history) > 0:
-        history_text = "\nPREVIOUS CONVERSATION:"
-        for i, qa in enumerate(conversation_history[-3:], 1):  # Last 3 Q&A pairs
-            history_text += f"\nQ{i}: {qa.get('question', 'N/A')}"
-            history_text += f"\nA{i}: {qa.get('answer', 'N/A')[:200]}..."  # Truncate long answers
+        counter = counter_for(llm)
+        budget = min(HISTORY_MAX_TOKENS, prompt_budget(llm) - counter.count(fill("")))
+        history_text = build_history_text(conversation_history, budget, counter)
     else:
         history_text = "\nPREVIOUS CONVERSATION: None (this is the first question)"
     
     # Fill template
-    prompt = template.format(
-        state=state,
-        job_description=job_description or "General technical interview",
-        resume_context=resume_context,
-        conversation_history=history_text
-    )
-    
-    # Call LLM
-    response = llm.invoke(prompt)
-    response_text = response.content
-    
+    return fill(history_text)
+
+
+def parse_question_response(response_text):
+    """Parse the LLM output into a question dict"""
     # Parse JSON from response
     try:
         # Try to extract JSON from response
@@ -104,3 +128,69 @@ def generate_question(llm, state, resume_data=None, job_description=None, conver
         'difficulty': 'medium',
         'category': 'general'
     }
+
+
+def _question_from_response(response):
+    """Use the schema-validated question when there is one, else parse the text"""
+    parsed = getattr(response, "parsed", None)
+    if isinstance(parsed, GeneratedQuestion):
+        return parsed.model_dump()
+    return parse_question_response(response.content)
+
+
+def generate_question(llm, state, resume_data=None, job_description=None, conversation_history=None, context=None):
+    """
+    Generate interview question using LLM
+    
+    Args:
+        llm: HuggingFaceLLM instance
+        state: Current interview state (introduction, resume-based, follow-up, deep-dive, closing)
+        resume_data: Parsed resume data (optional)
+        job_description: Job description text (optional)
+        conversation_history: List of previous Q&A pairs (optional)
+        context: Precomputed ResumeContext for resume_data (optional)
+    
+    Returns:
+        dict: Generated question with difficulty and category
+    """
+    prompt = build_question_prompt(state, resume_data, job_description, conversation_history, llm, context)
+    response = invoke_llm(llm, prompt, GeneratedQuestion)
+    return _question_from_response(response)
+
+
+async def agenerate_question(llm, state, resume_data=None, job_description=None, conversation_history=None, context=None):
+    """Async version of generate_question (awaits llm.ainvoke)"""
+    prompt = build_question_prompt(state, resume_data, job_description, conversation_history, llm, context)
+    response = await ainvoke_llm(llm, prompt, GeneratedQuestion)
+    return _question_from_response(response)
+
+
+async def astream_question(llm, state, resume_data=None, job_description=None, conversation_history=None, context=None):
+    """
+    Generate a question, streaming it as it is produced (async generator)
+
+    Yields:
+        ("question", {"question": str}) as soon as the question string is
+            complete - before difficulty and category are generated
+        ("done", dict) with the same fields generate_question returns
+    """
+    prompt = build_question_prompt(state, resume_data, job_description, conversation_history, llm, context)
+    parser = StreamingJSONObject()
+    chunks = []
+    question_sent = False
+
+    async for delta in astream_llm(llm, prompt, GeneratedQuestion):
+        chunks.append(delta)
+        for key, value in parser.feed(delta):
+            if key == "question" and isinstance(value, str) and not question_sent:
+                question_sent = True
+                yield "question", {"question": value}
+
+    text = "".join(chunks)
+    try:
+        result = GeneratedQuestion.model_validate_json(text).model_dump()
+    except ValueError:
+        result = parse_question_response(text)
+    if not question_sent:
+        yield "question", {"question": result["question"]}
+    yield "done", result
@@ -1,36 +1,244 @@
+import asyncio
 import os
-from huggingface_hub import InferenceClient
+
+from runtime.executor import AsyncLimiter, get_limiter
+
+
+class LLMResponse:
+    """
+    Minimal response object exposing ``.content`` like LangChain messages
+
+    ``parsed`` holds the validated Pydantic object when the call asked for
+    a schema and the content matched it, otherwise None.
+    """
+
+    __slots__ = ("content", "parsed")
+
+    def __init__(self, content: str, parsed=None):
+        self.content = content
+        self.parsed = parsed
+
+
+def _schema_name_and_json(schema):
+    if isinstance(schema, dict):
+        return schema.get("title", "response"), schema
+    return schema.__name__, schema.model_json_schema()
+
+
+def _validate(schema, content: str):
+    """Parse ``content`` into ``schema`` (a Pydantic model), None if it doesn't fit"""
+    if schema is None or isinstance(schema, dict):
+        return None
+    try:
+        return schema.model_validate_json(content)
+    except ValueError:
+        return None
+
+
+# Words a backend's rejection mentions when it is about constrained decoding
+_FORMAT_ERROR_MARKERS = ("response_format", "json_schema", "grammar", "guided")
+
+
+def _is_unsupported_format_error(exc: Exception) -> bool:
+    """
+    Whether the backend rejected ``response_format`` itself
+
+    Only a 4xx whose body names the feature counts: a context-length 400,
+    bad-token 401/403, unknown model 404 or 429 fails the same way
+    without the schema.
+    """
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is None or not 400 <= status < 500 or status == 429:
+        return False
+    body = f"{getattr(response, 'text', '') or ''} {exc}".lower()
+    return any(marker in body for marker in _FORMAT_ERROR_MARKERS)
 
 
 class HuggingFaceLLM:
+    # invoke/ainvoke accept ``schema=`` (see invoke_llm)
+    supports_schema = True
+
     def __init__(
         self,
         model: str = "meta-llama/Meta-Llama-3-8B-Instruct",
         max_tokens: int = 1500,
+        max_concurrency: int = None,
+        max_queue: int = 32,
     ):
         token = os.getenv("HUGGINGFACEHUB_API_TOKEN")
         if not token:
             raise RuntimeError("HUGGINGFACEHUB_API_TOKEN not set")
 
+        # Imported here: huggingface_hub is a slow import nothing else needs
+        from huggingface_hub import InferenceClient
+
+        self.model = model
+        self.token = token
         self.client = InferenceClient(
             model=model,
             token=token,
         )
         self.max_tokens = max_tokens
+        # In-flight async requests: the process-wide "llm" limiter
+        # (LLM_MAX_CONCURRENCY / LLM_MAX_QUEUE) unless capped per instance.
+        # Callers past the queue get PoolSaturated (503 in the API).
+        if max_concurrency:
+            self._limiter = AsyncLimiter("llm", max_concurrency, max_queue)
+        else:
+            self._limiter = get_limiter("llm")
+        self.max_concurrency = self._limiter.max_concurrency
+
+        # Created lazily so it binds to the running event loop
+        self._async_client = None
+
+        # JSON-schema constrained decoding; switched off for this model once
+        # the backend has rejected the response_format itself
+        self.structured_output = os.getenv("LLM_STRUCTURED_OUTPUT", "1").lower() not in ("0", "false", "no")
 
-    def invoke(self, prompt: str):
-        response = self.client.chat_completion(
-            messages=[
+    def _chat_kwargs(self, prompt: str, schema=None) -> dict:
+        kwargs = {
+            "messages": [
                 {"role": "user", "content": prompt}
             ],
-            max_tokens=self.max_tokens,
-            temperature=0.0,
-            top_p=1.0,
-        )
+            "max_tokens": self.max_tokens,
+            "temperature": 0.0,
+            "top_p": 1.0,
+        }
+        if schema is not None and self.structured_output:
+            name, json_schema = _schema_name_and_json(schema)
+            kwargs["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": name, "schema": json_schema, "strict": True},
+            }
+        return kwargs
 
-        return type(
-            "LLMResponse",
-            (),
-            {"content": response.choices[0].message["content"]}
-        )
-  
+    def _disable_structured_output(self, exc: Exception):
+        print(f"⚠️ Backend rejected response_format ({exc}) - falling back to prompt-only JSON")
+        self.structured_output = False
+
+    def invoke(self, prompt: str, schema=None):
+        """
+        Run one chat completion
+
+        Args:
+            prompt: User message
+            schema: Optional Pydantic model (or JSON schema dict) the reply
+                must follow; generation is constrained to it where the
+                backend supports ``response_format`` and the reply is
+                validated into ``LLMResponse.parsed``
+        """
+        kwargs = self._chat_kwargs(prompt, schema)
+        try:
+            response = self.client.chat_completion(**kwargs)
+        except Exception as e:
+            if "response_format" not in kwargs or not _is_unsupported_format_error(e):
+                raise
+            self._disable_structured_output(e)
+            response = self.client.chat_completion(**self._chat_kwargs(prompt))
+        content = response.choices[0].message["content"]
+        return LLMResponse(content, _validate(schema, content))
+
+    def _get_async_client(self):
+        # One client per process keeps the HTTP connection pool (and TLS
+        # sessions) alive between requests
+        if self._async_client is None:
+            from huggingface_hub import AsyncInferenceClient
+            self._async_client = AsyncInferenceClient(
+                model=self.model,
+                token=self.token,
+            )
+        return self._async_client
+
+    async def ainvoke(self, prompt: str, schema=None):
+        """Async version of invoke"""
+        client = self._get_async_client()
+        kwargs = self._chat_kwargs(prompt, schema)
+        async with self._limiter:
+            try:
+                response = await client.chat_completion(**kwargs)
+            except Exception as e:
+                if "response_format" not in kwargs or not _is_unsupported_format_error(e):
+                    raise
+                self._disable_structured_output(e)
+                response = await client.chat_completion(**self._chat_kwargs(prompt))
+        content = response.choices[0].message["content"]
+        return LLMResponse(content, _validate(schema, content))
+
+    async def astream(self, prompt: str, schema=None):
+        """
+        Stream the completion as text deltas (async generator)
+
+        Holds a concurrency slot until the stream ends. ``schema``
+        constrains generation like in invoke, but the deltas are not
+        validated - the caller parses the assembled text.
+        """
+        client = self._get_async_client()
+        kwargs = self._chat_kwargs(prompt, schema)
+        async with self._limiter:
+            try:
+                stream = await client.chat_completion(**kwargs, stream=True)
+            except Exception as e:
+                if "response_format" not in kwargs or not _is_unsupported_format_error(e):
+                    raise
+                self._disable_structured_output(e)
+                stream = await client.chat_completion(**self._chat_kwargs(prompt), stream=True)
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
+    async def aclose(self):
+        """Close the pooled async client (call on application shutdown)"""
+        if self._async_client is not None:
+            close = getattr(self._async_client, "close", None)
+            if close is not None:
+                await close()
+            self._async_client = None
+
+
+def invoke_llm(llm, prompt: str, schema=None):
+    """
+    Call any LLM object, asking for ``schema`` only if it understands one
+    (``supports_schema``)
+
+    Other LLM objects just get the prompt; callers fall back to parsing
+    ``.content`` when the response has no ``parsed`` value.
+    """
+    if schema is not None and getattr(llm, "supports_schema", False):
+        return llm.invoke(prompt, schema=schema)
+    return llm.invoke(prompt)
+
+
+async def ainvoke_llm(llm, prompt: str, schema=None):
+    """
+    Await an LLM call on any LLM object
+
+    Uses the native ``ainvoke`` when available, otherwise runs the blocking
+    ``invoke`` in a worker thread so the event loop stays free.
+    """
+    if schema is not None and getattr(llm, "supports_schema", False):
+        return await llm.ainvoke(prompt, schema=schema)
+    if hasattr(llm, "ainvoke"):
+        return await llm.ainvoke(prompt)
+    return await asyncio.to_thread(llm.invoke, prompt)
+
+
+async def astream_llm(llm, prompt: str, schema=None):
+    """
+    Stream text deltas from any LLM object
+
+    LLM objects without ``astream`` yield their whole reply as one delta.
+    """
+    if hasattr(llm, "astream"):
+        if schema is not None and getattr(llm, "supports_schema", False):
+            stream = llm.astream(prompt, schema=schema)
+        else:
+            stream = llm.astream(prompt)
+        async for delta in stream:
+            yield delta
+        return
+    response = await ainvoke_llm(llm, prompt, schema)
+    yield response.content
@@ -1,20 +1,40 @@
 import json
-from pathlib import Path
+import os
 from pydantic import ValidationError
+from resume_parsing.schema import resume_schema
 from resume_parsing.schema.resume_schema import ResumeSchema
+from resume_parsing.llm.hf_llm import ainvoke_llm, invoke_llm
+from resume_parsing.llm.token_budget import PromptSection, counter_for, pack_sections, prompt_budget
+from resume_parsing.llm.prompt_registry import get_prompt_registry
 
-def load_prompt() -> str:
-    prompt_path = Path(__file__).resolve().parents[0] / "prompts" / "resume_extraction.txt"
-    return prompt_path.read_text()
+# Tokens of resume text put into the extraction prompt (further limited by
+# what the model's context leaves after the template and schema)
+RESUME_MAX_TOKENS = int(os.getenv("RESUME_MAX_TOKENS", "1500"))
 
-def build_prompt(resume_text: str, schema_json: str) -> str:
+# Upper bound of cleaned characters RESUME_MAX_TOKENS can cover - text past
+# this is never needed, so extraction stops there
+RESUME_CHAR_LIMIT = RESUME_MAX_TOKENS * 6
+
+get_prompt_registry().require("resume_extraction", ("resume_text", "schema"))
+
+def load_prompt():
+    """Resume extraction prompt template (compiled, kept in memory)"""
+    return get_prompt_registry().get("resume_extraction")
+
+def build_prompt(resume_text: str, schema_text: str = None) -> str:
+    """Extraction prompt; ``schema_text`` defaults to RESUME_SCHEMA_COMPACT"""
     template = load_prompt()
     return template.format(
         resume_text = resume_text,
-        schema = schema_json
+        schema = schema_text or resume_schema.RESUME_SCHEMA_COMPACT
     )
 
 def _parse_and_validate_response(resp) -> ResumeSchema:
+    # Schema-constrained responses arrive already validated
+    parsed = getattr(resp, "parsed", None)
+    if isinstance(parsed, ResumeSchema):
+        return parsed
+
     content = getattr(resp, "content", None)
     if not content or not content.strip():
         raise ValueError("LLM returned empty response")
@@ -51,7 +71,18 @@ def looks_like_resume(text: str) -> bool:
     t = text.lower()
     return any(k in t for k in keywords)
 
-def extract_structured_resume(llm, cleaned_text: str) -> ResumeSchema:
+def fit_resume_text(cleaned_text: str, llm=None) -> str:
+    """Cut the resume to the tokens left in ``llm``'s prompt budget"""
+    counter = counter_for(llm)
+    overhead = counter.count(build_prompt(""))
+    packed = pack_sections(
+        [PromptSection("resume", cleaned_text, max_tokens=RESUME_MAX_TOKENS)],
+        prompt_budget(llm) - overhead,
+        counter,
+    )
+    return packed["resume"]
+
+def _prepare_extraction(cleaned_text: str, llm=None):
     if not looks_like_resume(cleaned_text):
         raise ValueError(
             "Input document does not appear to be a resume. "
@@ -59,32 +90,60 @@ def extract_structured_resume(llm, cleaned_text: str) -> ResumeSchema:
         )
     # if not looks_like_resume(cleaned_text):
     #     print("⚠ Resume keywords not detected — continuing anyway.")
-    cleaned_text = cleaned_text[:2000]
-    schema_json = ResumeSchema.model_json_schema()
-    prompt = build_prompt(cleaned_text, json.dumps(schema_json, indent=2))
+    return build_prompt(fit_resume_text(cleaned_text, llm))
 
-    response = llm.invoke(prompt)
+def _build_repair_prompt(malformed: str) -> str:
+    return (
+        "You MUST output a single valid JSON object.\n"
+        "Do NOT include markdown, comments, or explanations.\n"
+        "Do NOT include ``` fences.\n"
+        "If a value is unknown, use null.\n\n"
+        "Malformed response:\n"
+        f"{malformed}\n\n"
+        "Schema:\n"
+        f"{resume_schema.RESUME_SCHEMA_COMPACT}"
+    )
+
+def extract_structured_resume(llm, cleaned_text: str) -> ResumeSchema:
+    prompt = _prepare_extraction(cleaned_text, llm)
+
+    response = invoke_llm(llm, prompt, ResumeSchema)
     try:
         return _parse_and_validate_response(response)
     except ValueError as first_err:
 
-        retry = llm.invoke(prompt)
+        retry = invoke_llm(llm, prompt, ResumeSchema)
         try:
             return _parse_and_validate_response(retry)
         except ValueError as second_err:
 
-            repair_prompt = (
-                "You MUST output a single valid JSON object.\n"
-                "Do NOT include markdown, comments, or explanations.\n"
-                "Do NOT include ``` fences.\n"
-                "If a value is unknown, use null.\n\n"
-                "Malformed response:\n"
-                f"{response.content}\n\n"
-                "Schema:\n"
-                f"{json.dumps(schema_json, indent=2)}"
-            )
-
-            repair_response = llm.invoke(repair_prompt)
+            repair_prompt = _build_repair_prompt(response.content)
+
+            repair_response = invoke_llm(llm, repair_prompt, ResumeSchema)
+            try:
+                return _parse_and_validate_response(repair_response)
+            except ValueError as repair_err:
+                raise RuntimeError(
+                    "LLM failed after extraction, retry, and repair attempts"
+                ) from repair_err
+
+async def aextract_structured_resume(llm, cleaned_text: str) -> ResumeSchema:
+    """Async version of extract_structured_resume (awaits llm.ainvoke)"""
+    prompt = _prepare_extraction(cleaned_text, llm)
+
+    response = await ainvoke_llm(llm, prompt, ResumeSchema)
+    try:
+        return _parse_and_validate_response(response)
+    except ValueError:
+
+        retry = await ainvoke_llm(llm, prompt, ResumeSchema)
+        try:
+            return _parse_and_validate_response(retry)
+        except ValueError:
+
+            repair_prompt = _build_repair_prompt(response.content)
+
+            repair_response = await ainvoke_llm(llm, repair_prompt, ResumeSchema)
             try:
                 return _parse_and_validate_response(repair_response)
             except ValueError as repair_err:
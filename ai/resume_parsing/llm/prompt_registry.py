@@ -0,0 +1,211 @@
+"""
+Process-wide registry of the prompt templates in prompts/
+
+Every template is read once, when the registry is first used (at import of
+the modules that format prompts), and compiled from its
+``string.Formatter`` parse tree into literal chunks and field slots, so
+filling it is a list copy and a join - no disk I/O, no re-parsing.
+
+Callers declare the fields they pass with ``require()``; a template that
+uses any other placeholder is rejected, at startup or when an edited file
+is picked up. The directory is re-checked (file mtimes) at most every
+``reload_interval`` seconds, so prompt edits apply without a restart. Each
+template carries a content hash for cache keys and metrics.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from string import Formatter
+from typing import Dict, Iterable, List, Optional
+
+PROMPTS_DIR = Path(__file__).parent / "prompts"
+
+_CONVERSIONS = {"r": repr, "s": str, "a": ascii}
+
+
+def _escape(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+class PromptTemplate:
+    """One compiled prompt template (immutable)"""
+
+    def __init__(self, name: str, text: str, source_hash: Optional[str] = None):
+        """
+        Args:
+            name: Template name (file name without .txt)
+            text: Template text in str.format syntax
+            source_hash: Hash of the file a bound template came from
+                (default: this text's own hash)
+        """
+        self.name = name
+        self.text = text
+        self.hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self.source_hash = source_hash or self.hash
+
+        # Literal chunks with a None slot per field; fields name the slots
+        self._chunks: List[Optional[str]] = []
+        self._slots = []
+        for literal, field, spec, conversion in Formatter().parse(text):
+            if literal:
+                self._chunks.append(literal)
+            if field is None:
+                continue
+            if not field.isidentifier():
+                raise ValueError(f"Prompt '{name}': unsupported placeholder {{{field}}}")
+            self._slots.append((len(self._chunks), field, spec, conversion))
+            self._chunks.append(None)
+        self.fields = frozenset(field for _, field, _, _ in self._slots)
+
+    def format(self, **values) -> str:
+        """Fill every placeholder (same result as ``text.format(**values)``)"""
+        chunks = self._chunks.copy()
+        for index, field, spec, conversion in self._slots:
+            value = values[field]
+            if conversion:
+                value = _CONVERSIONS[conversion](value)
+            chunks[index] = format(value, spec) if spec else str(value)
+        return "".join(chunks)
+
+    def bind(self, **values) -> "PromptTemplate":
+        """
+        Template with some fields filled in and the rest left open
+
+        ``t.bind(a=x).format(b=y) == t.format(a=x, b=y)``
+        """
+        parts = []
+        slots = {index: (field, spec, conversion) for index, field, spec, conversion in self._slots}
+        for index, chunk in enumerate(self._chunks):
+            if chunk is not None:
+                parts.append(_escape(chunk))
+                continue
+            field, spec, conversion = slots[index]
+            if field in values:
+                value = values[field]
+                if conversion:
+                    value = _CONVERSIONS[conversion](value)
+                parts.append(_escape(format(value, spec) if spec else str(value)))
+            else:
+                parts.append(
+                    "{" + field
+                    + (f"!{conversion}" if conversion else "")
+                    + (f":{spec}" if spec else "")
+                    + "}"
+                )
+        return PromptTemplate(self.name, "".join(parts), source_hash=self.source_hash)
+
+
+class PromptRegistry:
+    """Compiled templates of one directory, reloaded when the files change"""
+
+    def __init__(self, directory=PROMPTS_DIR, reload_interval: float = 2.0):
+        """
+        Args:
+            directory: Folder of ``<name>.txt`` templates
+            reload_interval: Seconds between mtime checks (0 = never reload)
+        """
+        self.directory = Path(directory)
+        self.reload_interval = reload_interval
+        self.reloads = 0
+        self.rejected = 0
+
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._stamps: Dict[str, tuple] = {}
+        self._required: Dict[str, frozenset] = {}
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self._scan(initial=True)
+
+    def require(self, name: str, fields: Iterable[str]):
+        """
+        Declare the fields a caller fills ``name`` with
+
+        Raises:
+            KeyError: No such template
+            ValueError: The template uses a placeholder outside ``fields``
+        """
+        fields = frozenset(fields)
+        template = self._templates.get(name)
+        if template is None:
+            raise KeyError(f"Prompt template '{name}' not found in {self.directory}")
+        _check_fields(template, fields)
+        self._required[name] = fields
+
+    def get(self, name: str) -> PromptTemplate:
+        """Current compiled template (picks up file edits every reload_interval)"""
+        if self.reload_interval > 0 and time.monotonic() >= self._next_check:
+            self._scan()
+        return self._templates[name]
+
+    def hashes(self) -> Dict[str, str]:
+        return {name: template.hash for name, template in self._templates.items()}
+
+    def _scan(self, initial: bool = False):
+        with self._lock:
+            if not initial and time.monotonic() < self._next_check:
+                return
+            self._next_check = time.monotonic() + self.reload_interval
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(".txt") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                name = entry.name[:-len(".txt")]
+                if self._stamps.get(name) == stamp:
+                    continue
+                self._stamps[name] = stamp
+                self._load(name, Path(entry.path), initial)
+
+    def _load(self, name: str, path: Path, initial: bool):
+        try:
+            template = PromptTemplate(name, path.read_text())
+            if name in self._required:
+                _check_fields(template, self._required[name])
+        except (OSError, ValueError) as e:
+            if initial:
+                raise
+            # Keep serving the last good version
+            self.rejected += 1
+            print(f"⚠️ Prompt '{name}' not reloaded: {e}")
+            return
+
+        previous = self._templates.get(name)
+        if previous is not None and previous.hash == template.hash:
+            return
+        self._templates[name] = template
+        if not initial:
+            self.reloads += 1
+            print(f"🔄 Prompt '{name}' reloaded ({template.hash[:12]})")
+
+    def stats(self) -> dict:
+        return {
+            "templates": {name: h[:12] for name, h in self.hashes().items()},
+            "reloads": self.reloads,
+            "rejected": self.rejected,
+            "reload_interval": self.reload_interval,
+        }
+
+
+def _check_fields(template: PromptTemplate, fields: frozenset):
+    unknown = template.fields - fields
+    if unknown:
+        raise ValueError(
+            f"Prompt '{template.name}' uses placeholders its caller doesn't fill: "
+            + ", ".join(sorted(unknown))
+        )
+
+
+_prompt_registry = None
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """Shared registry of prompts/, reload interval from PROMPT_RELOAD_SECONDS"""
+    global _prompt_registry
+    if _prompt_registry is None:
+        _prompt_registry = PromptRegistry(
+            reload_interval=float(os.getenv("PROMPT_RELOAD_SECONDS", "2")),
+        )
+    return _prompt_registry
@@ -0,0 +1,168 @@
+"""
+Per-resume prompt context, built once and reused for every turn
+
+A resume doesn't change during an interview, yet each question and each
+evaluation used to re-read its prompt template from disk and re-join the
+same skills, experiences and projects. ``ResumeContext`` does that work
+once (at parse time, see simple_api) and keeps:
+
+- the resume blocks of the question and evaluation prompts
+- the question template with the resume block already filled in
+- a topic index (skill/technology -> where the resume mentions it) the
+  question generator uses to steer towards topics not yet asked about
+"""
+
+import hashlib
+import json
+import re
+from typing import Dict, List, Optional
+
+from resume_parsing.llm.prompt_registry import PromptTemplate, get_prompt_registry
+
+
+def make_resume_id(resume_data: Optional[Dict]) -> str:
+    """Content hash of parsed resume data (same data, same ID)"""
+    payload = json.dumps(resume_data or {}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def format_question_context(resume_data: Optional[Dict] = None) -> str:
+    """Resume block of the question generation prompt"""
+    resume_context = ""
+    if resume_data:
+        # Extract key info from resume
+        skills = resume_data.get('skills', [])
+        experiences = resume_data.get('experiences', [])
+        projects = resume_data.get('projects', [])
+
+        if skills:
+            resume_context += f"\nCANDIDATE SKILLS: {', '.join(skills[:10])}"
+
+        if experiences:
+            exp_summary = []
+            for exp in experiences[:3]:  # Top 3 experiences
+                role = exp.get('role', 'N/A')
+                org = exp.get('organization', 'N/A')
+                exp_summary.append(f"{role} at {org}")
+            resume_context += f"\nWORK EXPERIENCE: {'; '.join(exp_summary)}"
+
+        if projects:
+            proj_summary = []
+            for proj in projects[:3]:  # Top 3 projects
+                name = proj.get('name', 'N/A')
+                techs = proj.get('technologies', [])
+                proj_summary.append(f"{name} ({', '.join(techs[:3])})")
+            resume_context += f"\nPROJECTS: {'; '.join(proj_summary)}"
+
+    if not resume_context:
+        resume_context = "\nCANDIDATE RESUME: Not provided"
+    return resume_context
+
+
+def format_evaluation_context(resume_data: Optional[Dict] = None) -> str:
+    """Condensed one-line candidate summary used in the evaluation prompt"""
+    resume_context = "Not available"
+    if resume_data:
+        name = resume_data.get('name', 'Unknown')
+        skills = resume_data.get('skills', [])
+        experience = resume_data.get('experience', [])
+
+        skills_str = ', '.join(skills[:5]) if skills else 'Not listed'
+        exp_count = len(experience) if experience else 0
+
+        resume_context = f"Candidate: {name}, Skills: {skills_str}, Experience: {exp_count} positions"
+    return resume_context
+
+
+def _mention_pattern(topic: str):
+    # Word-ish boundaries that still work for names like "C++" or ".NET"
+    return re.compile(rf"(?<![\w+#.]){re.escape(topic.lower())}(?![\w+#])")
+
+
+def build_topic_index(resume_data: Optional[Dict] = None) -> Dict[str, Dict]:
+    """
+    Skills and technologies with the places the resume mentions them
+
+    Returns:
+        {lowercased topic: {"name", "sources", "pattern"}}, most
+        mentioned first (ties keep resume order). Sources are "skills",
+        "project: <name>" and "experience: <role>"; pattern matches the
+        topic in lowercased text.
+    """
+    if not resume_data:
+        return {}
+
+    index: Dict[str, Dict] = {}
+
+    def add(name, source):
+        name = (name or "").strip()
+        if not name:
+            return
+        entry = index.setdefault(name.lower(), {
+            "name": name, "sources": [], "pattern": _mention_pattern(name)
+        })
+        if source not in entry["sources"]:
+            entry["sources"].append(source)
+
+    for skill in resume_data.get('skills') or []:
+        add(skill, "skills")
+    for proj in resume_data.get('projects') or []:
+        for tech in proj.get('technologies') or []:
+            add(tech, f"project: {proj.get('name', 'N/A')}")
+
+    # Experience bullets don't list technologies; credit known topics they mention
+    for exp in resume_data.get('experiences') or []:
+        text = " ".join(exp.get('description') or []).lower()
+        if not text:
+            continue
+        for entry in index.values():
+            if entry["pattern"].search(text):
+                source = f"experience: {exp.get('role', 'N/A')}"
+                if source not in entry["sources"]:
+                    entry["sources"].append(source)
+
+    ranked = sorted(index.items(), key=lambda item: -len(item[1]["sources"]))
+    return dict(ranked)
+
+
+class ResumeContext:
+    """Everything the prompts need from one parsed resume, precomputed"""
+
+    def __init__(self, resume_data: Optional[Dict] = None, resume_id: Optional[str] = None):
+        """
+        Args:
+            resume_data: Parsed resume (ResumeSchema dict), or None
+            resume_id: Key to store it under (default: make_resume_id)
+        """
+        self.resume_data = resume_data
+        self.resume_id = resume_id or make_resume_id(resume_data)
+        self.question_context = format_question_context(resume_data)
+        self.evaluation_context = format_evaluation_context(resume_data)
+        self.topics = build_topic_index(resume_data)
+        self._question_template = None
+
+    @property
+    def question_template(self) -> PromptTemplate:
+        """Question template with the resume block bound (rebound after prompt edits)"""
+        template = get_prompt_registry().get("question_generation")
+        bound = self._question_template
+        if bound is None or bound.source_hash != template.hash:
+            bound = template.bind(resume_context=self.question_context)
+            self._question_template = bound
+        return bound
+
+    def uncovered_topics(self, conversation_history=None, limit: int = 5) -> List[str]:
+        """
+        Up to ``limit`` topics no previous question has asked about, most
+        mentioned in the resume first
+        """
+        asked = "\n".join(
+            (qa.get('question') or '') for qa in (conversation_history or [])
+        ).lower()
+        topics = []
+        for entry in self.topics.values():
+            if len(topics) >= limit:
+                break
+            if not entry["pattern"].search(asked):
+                topics.append(entry["name"])
+        return topics
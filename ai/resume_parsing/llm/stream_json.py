@@ -0,0 +1,152 @@
+"""
+Incremental parser for a streamed JSON object
+
+Feeds on LLM output chunks and reports each top-level field of the object
+the moment its value is complete, so a streamed
+``{"question": "...", "difficulty": "...", ...}`` can be acted on as soon
+as the question string closes instead of after the whole completion.
+"""
+
+import json
+from typing import Any, List, Tuple
+
+# Parser states
+_BEFORE_OBJECT = 0
+_EXPECT_KEY = 1
+_IN_KEY = 2
+_EXPECT_COLON = 3
+_EXPECT_VALUE = 4
+_IN_STRING_VALUE = 5
+_IN_OTHER_VALUE = 6
+_AFTER_VALUE = 7
+_DONE = 8
+
+
+class StreamingJSONObject:
+    """
+    Incrementally parse the first top-level JSON object in a text stream
+
+    Text before the opening brace (e.g. a chatty preamble or a ``` fence)
+    is skipped. Nested values are collected whole and decoded when they
+    end.
+
+    Example:
+        parser = StreamingJSONObject()
+        for chunk in chunks:
+            for key, value in parser.feed(chunk):
+                ...
+    """
+
+    def __init__(self):
+        self.fields = {}
+        self._state = _BEFORE_OBJECT
+        self._buffer = []
+        self._key = None
+        self._escaped = False
+        # Nesting depth / open string while inside a non-string value
+        self._depth = 0
+        self._in_nested_string = False
+
+    @property
+    def done(self) -> bool:
+        """True once the object's closing brace has been seen"""
+        return self._state == _DONE
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Consume the next chunk of text
+
+        Returns:
+            (key, value) pairs for the fields completed within this chunk
+        """
+        completed = []
+        for ch in chunk:
+            if self._state == _DONE:
+                break
+            field = self._step(ch)
+            if field is not None:
+                completed.append(field)
+        return completed
+
+    def _finish_value(self, raw: str) -> Tuple[str, Any]:
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            value = raw.strip()
+        self.fields[self._key] = value
+        return self._key, value
+
+    def _step(self, ch: str):
+        state = self._state
+
+        if state == _BEFORE_OBJECT:
+            if ch == "{":
+                self._state = _EXPECT_KEY
+            return None
+
+        if state in (_IN_KEY, _IN_STRING_VALUE):
+            self._buffer.append(ch)
+            if self._escaped:
+                self._escaped = False
+            elif ch == "\\":
+                self._escaped = True
+            elif ch == '"':
+                raw = "".join(self._buffer)
+                self._buffer = []
+                if state == _IN_KEY:
+                    self._key = json.loads(raw)
+                    self._state = _EXPECT_COLON
+                    return None
+                self._state = _AFTER_VALUE
+                return self._finish_value(raw)
+            return None
+
+        if state == _IN_OTHER_VALUE:
+            if self._in_nested_string:
+                self._buffer.append(ch)
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_nested_string = False
+                return None
+            if self._depth == 0 and ch in ",}":
+                raw = "".join(self._buffer)
+                self._buffer = []
+                self._state = _EXPECT_KEY if ch == "," else _DONE
+                return self._finish_value(raw)
+            self._buffer.append(ch)
+            if ch == '"':
+                self._in_nested_string = True
+            elif ch in "[{":
+                self._depth += 1
+            elif ch in "]}":
+                self._depth -= 1
+            return None
+
+        if ch.isspace():
+            return None
+
+        if state == _EXPECT_KEY:
+            if ch == '"':
+                self._buffer = ['"']
+                self._state = _IN_KEY
+            elif ch == "}":
+                self._state = _DONE
+        elif state == _EXPECT_COLON:
+            if ch == ":":
+                self._state = _EXPECT_VALUE
+        elif state == _EXPECT_VALUE:
+            self._buffer = [ch]
+            if ch == '"':
+                self._state = _IN_STRING_VALUE
+            else:
+                self._depth = 1 if ch in "[{" else 0
+                self._state = _IN_OTHER_VALUE
+        elif state == _AFTER_VALUE:
+            if ch == ",":
+                self._state = _EXPECT_KEY
+            elif ch == "}":
+                self._state = _DONE
+        return None
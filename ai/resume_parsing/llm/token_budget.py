@@ -0,0 +1,196 @@
+"""
+Token budgeting for LLM prompts
+
+Counts tokens with the model's own tokenizer (the optional ``tokenizers``
+package, loaded once per model) and packs prompt sections into the model's
+context window by priority, so prompts use the context they have without
+overflowing it. Without ``tokenizers`` - or when the tokenizer can't be
+downloaded - a conservative characters-per-token estimate is used.
+"""
+
+import math
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+DEFAULT_MODEL = "meta-llama/Meta-Llama-3-8B-Instruct"
+
+# Context windows (prompt + completion) of the models we run
+MODEL_CONTEXT_WINDOWS = {
+    "meta-llama/Meta-Llama-3-8B-Instruct": 8192,
+    "meta-llama/Meta-Llama-3-70B-Instruct": 8192,
+    "meta-llama/Llama-3.1-8B-Instruct": 131072,
+    "mistralai/Mistral-7B-Instruct-v0.3": 32768,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Chat template tokens and counting drift between tokenizer and server
+SAFETY_MARGIN_TOKENS = 64
+
+# English prose averages ~4 characters per Llama-3 token; undercounting
+# characters per token over-estimates tokens, which is the safe side
+ESTIMATE_CHARS_PER_TOKEN = 3.5
+
+
+class TokenCounter:
+    """Counts and truncates text in tokens of one model"""
+
+    def __init__(self, tokenizer=None):
+        """
+        Args:
+            tokenizer: ``tokenizers.Tokenizer`` instance, or None to use
+                the characters-per-token estimate
+        """
+        self.tokenizer = tokenizer
+        # Resumes, templates and history turns are counted over and over
+        self._count = lru_cache(maxsize=4096)(self._count_uncached)
+
+    @property
+    def exact(self) -> bool:
+        return self.tokenizer is not None
+
+    def _count_uncached(self, text: str) -> int:
+        if self.tokenizer is None:
+            return math.ceil(len(text) / ESTIMATE_CHARS_PER_TOKEN)
+        return len(self.tokenizer.encode(text, add_special_tokens=False).ids)
+
+    def count(self, text: str) -> int:
+        """Number of tokens in ``text``"""
+        if not text:
+            return 0
+        return self._count(text)
+
+    def truncate(self, text: str, max_tokens: int, keep: str = "head") -> str:
+        """
+        Cut ``text`` to at most ``max_tokens`` tokens
+
+        Args:
+            text: Text to cut
+            max_tokens: Token limit
+            keep: 'head' keeps the start of the text, 'tail' the end
+        """
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+
+        if self.tokenizer is None:
+            max_chars = int(max_tokens * ESTIMATE_CHARS_PER_TOKEN)
+            return text[:max_chars] if keep == "head" else text[-max_chars:]
+
+        offsets = self.tokenizer.encode(text, add_special_tokens=False).offsets
+        if keep == "head":
+            return text[:offsets[max_tokens - 1][1]]
+        return text[offsets[len(offsets) - max_tokens][0]:]
+
+
+@lru_cache(maxsize=8)
+def get_token_counter(model: Optional[str] = None) -> TokenCounter:
+    """
+    Cached TokenCounter for ``model``
+
+    ``TOKENIZER_MODEL`` overrides the repo the tokenizer is loaded from
+    (e.g. an ungated mirror of a gated model's tokenizer).
+    """
+    repo = os.getenv("TOKENIZER_MODEL") or model or DEFAULT_MODEL
+    try:
+        from tokenizers import Tokenizer
+    except ImportError:
+        return TokenCounter()
+
+    try:
+        tokenizer = Tokenizer.from_pretrained(repo, token=os.getenv("HUGGINGFACEHUB_API_TOKEN"))
+    except Exception as e:
+        print(f"⚠️ Could not load tokenizer for {repo} ({e}) - estimating token counts")
+        return TokenCounter()
+    print(f"✅ Loaded tokenizer for {repo}")
+    return TokenCounter(tokenizer)
+
+
+def context_window(model: Optional[str] = None) -> int:
+    """Context window of ``model`` in tokens (``LLM_CONTEXT_TOKENS`` overrides)"""
+    override = os.getenv("LLM_CONTEXT_TOKENS")
+    if override:
+        return int(override)
+    return MODEL_CONTEXT_WINDOWS.get(model or DEFAULT_MODEL, DEFAULT_CONTEXT_WINDOW)
+
+
+def prompt_budget(llm=None) -> int:
+    """
+    Tokens available for the prompt of one call to ``llm``
+
+    The completion's ``max_tokens`` and a safety margin are reserved out of
+    the model's context window.
+    """
+    model = getattr(llm, "model", None)
+    max_output = getattr(llm, "max_tokens", None) or 1500
+    return context_window(model) - max_output - SAFETY_MARGIN_TOKENS
+
+
+def counter_for(llm=None) -> TokenCounter:
+    """TokenCounter matching ``llm``'s model"""
+    return get_token_counter(getattr(llm, "model", None))
+
+
+class PromptSection:
+    """
+    One variable part of a prompt
+
+    Args:
+        name: Key in pack_sections' result
+        text: Full text of the section
+        priority: Lower numbers are kept first when the budget is short
+        max_tokens: Cap on this section even when the budget allows more
+        min_tokens: If less than this is left the section is dropped
+            rather than truncated (set to the full size for all-or-nothing)
+        keep: Part kept when truncating - 'head' or 'tail'
+    """
+
+    __slots__ = ("name", "text", "priority", "max_tokens", "min_tokens", "keep")
+
+    def __init__(
+        self,
+        name: str,
+        text: str,
+        priority: int = 0,
+        max_tokens: Optional[int] = None,
+        min_tokens: int = 1,
+        keep: str = "head",
+    ):
+        self.name = name
+        self.text = text or ""
+        self.priority = priority
+        self.max_tokens = max_tokens
+        self.min_tokens = min_tokens
+        self.keep = keep
+
+
+def pack_sections(sections: List[PromptSection], budget: int, counter: TokenCounter) -> Dict[str, str]:
+    """
+    Fit sections into ``budget`` tokens, trimming lowest priority first
+
+    Sections are granted tokens in priority order; the first one that
+    doesn't fit is truncated to what is left and everything after it gets
+    only the leftovers (usually nothing).
+
+    Returns:
+        dict of section name -> text to put in the prompt ('' if dropped)
+    """
+    packed = {}
+    remaining = max(0, budget)
+
+    for section in sorted(sections, key=lambda s: s.priority):
+        text = section.text
+        if section.max_tokens is not None:
+            text = counter.truncate(text, section.max_tokens, section.keep)
+        tokens = counter.count(text)
+        if tokens > remaining:
+            if remaining < section.min_tokens:
+                packed[section.name] = ""
+                continue
+            text = counter.truncate(text, remaining, section.keep)
+            tokens = counter.count(text)
+        packed[section.name] = text
+        remaining -= tokens
+
+    return packed
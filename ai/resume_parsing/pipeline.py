@@ -0,0 +1,57 @@
+"""
+Lazy resume text pipeline: extract -> clean -> truncate
+
+The LLM only reads the first RESUME_MAX_TOKENS tokens of a resume (at most
+RESUME_CHAR_LIMIT characters), so pages and lines are pulled through
+extraction and cleaning only until that budget is filled. A 30-page CV costs about the same as a one-page one.
+"""
+
+from pathlib import Path
+from typing import Optional, Union
+
+from resume_parsing.cleaning.clean_text import iter_clean_lines
+from resume_parsing.extraction.extract import iter_text_lines
+from resume_parsing.llm.llm_extract import RESUME_CHAR_LIMIT
+
+
+def extract_resume_text(
+    data: bytes,
+    suffix: str,
+    max_chars: Optional[int] = RESUME_CHAR_LIMIT,
+) -> str:
+    """
+    Extract and clean resume text, stopping once the budget is met
+
+    Args:
+        data: PDF/DOCX file contents
+        suffix: File extension ('.pdf' or '.docx')
+        max_chars: Budget of cleaned characters (None = whole document)
+
+    Returns:
+        ``clean_text(extract_text(...))[:max_chars]``
+    """
+    raw_lines = iter_text_lines(data, suffix)
+    cleaned_lines = iter_clean_lines(raw_lines)
+    kept = []
+    total = 0
+    try:
+        for line in cleaned_lines:
+            kept.append(line)
+            total += len(line) + 1
+            if max_chars is not None and total > max_chars:
+                break
+    finally:
+        # Stops any page extraction still in flight
+        cleaned_lines.close()
+        raw_lines.close()
+
+    text = "\n".join(kept)
+    return text if max_chars is None else text[:max_chars]
+
+
+def extract_resume_file(file_path: Union[str, Path], max_chars: Optional[int] = RESUME_CHAR_LIMIT) -> str:
+    """extract_resume_text for a file on disk"""
+    file_path = Path(file_path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"The file {file_path} does not exist.")
+    return extract_resume_text(file_path.read_bytes(), file_path.suffix, max_chars)
@@ -0,0 +1,61 @@
+"""
+Compact, TypeScript-like rendering of Pydantic models for LLM prompts
+
+``json.dumps(Model.model_json_schema(), indent=2)`` spends most of its
+tokens on indentation, ``$defs``/``$ref`` plumbing, titles and ``anyOf``
+wrappers. The signature form carries the same field names, types,
+optionality and descriptions in a fraction of the tokens:
+
+    ResumeSchema = {skills?: string[], experiences?: Experience[]}
+    Experience = {role: string, start_date?: string|null /* YYYY-MM or YYYY */}
+"""
+
+from typing import Dict, List, Type
+
+from pydantic import BaseModel
+
+_JSON_TYPES = {
+    "string": "string",
+    "integer": "number",
+    "number": "number",
+    "boolean": "boolean",
+    "null": "null",
+    "object": "object",
+}
+
+
+def _type_of(prop: Dict) -> str:
+    if "$ref" in prop:
+        return prop["$ref"].rsplit("/", 1)[-1]
+    if "anyOf" in prop:
+        return "|".join(_type_of(option) for option in prop["anyOf"])
+    if prop.get("type") == "array":
+        item = _type_of(prop.get("items", {}))
+        return f"({item})[]" if "|" in item else f"{item}[]"
+    return _JSON_TYPES.get(prop.get("type"), "any")
+
+
+def _render_object(name: str, schema: Dict) -> str:
+    required = set(schema.get("required", []))
+    fields = []
+    for field, prop in schema.get("properties", {}).items():
+        text = f"{field}{'' if field in required else '?'}: {_type_of(prop)}"
+        if prop.get("description"):
+            text += f" /* {prop['description']} */"
+        fields.append(text)
+    return f"{name} = {{{', '.join(fields)}}}"
+
+
+def render_compact_schema(model: Type[BaseModel]) -> str:
+    """
+    Render ``model`` and the models it references, one line per type
+
+    ``?`` marks fields that may be omitted, ``|null`` fields that may be
+    null. The root model comes first, referenced models follow in the
+    order Pydantic defines them.
+    """
+    schema = model.model_json_schema()
+    lines: List[str] = [_render_object(schema.get("title", model.__name__), schema)]
+    for name, definition in schema.get("$defs", {}).items():
+        lines.append(_render_object(name, definition))
+    return "\n".join(lines)
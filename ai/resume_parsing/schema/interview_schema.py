@@ -0,0 +1,16 @@
+from typing import Literal
+from pydantic import BaseModel, Field
+
+class GeneratedQuestion(BaseModel):
+    question: str
+    difficulty: Literal["easy", "medium", "hard"] = "medium"
+    category: Literal["technical", "behavioral", "resume-based"] = "technical"
+
+class AnswerEvaluation(BaseModel):
+    technical_accuracy: int = Field(ge=1, le=10)
+    depth: int = Field(ge=1, le=10)
+    clarity: int = Field(ge=1, le=10)
+    relevance: int = Field(ge=1, le=10)
+    final_score: float
+    signal: Literal["GOOD", "AVERAGE", "BAD"]
+    feedback: str
@@ -1,5 +1,6 @@
 from typing import List, Optional 
 from pydantic import BaseModel, Field
+from resume_parsing.schema.compact import render_compact_schema
 
 class Experience(BaseModel):
     role: str
@@ -55,4 +56,18 @@ class ResumeSchema(BaseModel):
     projects: List[Project] = []
     education: List[Education] = []
     achievements: List[Achievement] = [] 
-    extra_sections: List[ExtraSection] = []
\ No newline at end of file
+    extra_sections: List[ExtraSection] = []
+
+
+_compact = None
+
+
+def __getattr__(name):
+    # RESUME_SCHEMA_COMPACT: prompt form of ResumeSchema, rendered on first
+    # use (generating the JSON schema is a noticeable part of import time)
+    global _compact
+    if name == "RESUME_SCHEMA_COMPACT":
+        if _compact is None:
+            _compact = render_compact_schema(ResumeSchema)
+        return _compact
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
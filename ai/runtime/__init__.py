@@ -0,0 +1 @@
+# Runtime services (execution pools, lifecycle)
@@ -0,0 +1,163 @@
+"""
+Service configuration, read from the environment in one place
+
+``load_env_file()`` applies ``.env`` once per process; the entrypoint calls
+it before importing the modules that read their settings at import.
+``get_config()`` then turns the variables simple_api uses into explicit,
+immutable config objects instead of ``os.getenv`` calls scattered through
+the request handlers.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+_env_loaded = False
+
+
+def load_env_file():
+    """Load .env into os.environ (existing variables win); no-op after the first call"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+@dataclass(frozen=True)
+class STTConfig:
+    """Speech-to-text backend selection (STT_* variables)"""
+
+    provider: str = "whisper_local"
+    model_size: str = "small"
+    compute_type: str = "int8"
+    cpu_threads: int = 0
+    num_workers: int = 1
+    batch_size: int = 8
+    batch_wait_ms: float = 10.0
+    # > 0 spreads transcription over that many processes
+    workers: int = 0
+    worker_max_jobs: int = 200
+    job_timeout: float = 300.0
+
+    @classmethod
+    def from_env(cls) -> "STTConfig":
+        return cls(
+            provider=os.getenv("STT_PROVIDER", cls.provider),
+            model_size=os.getenv("STT_MODEL_SIZE", cls.model_size),
+            compute_type=os.getenv("STT_COMPUTE_TYPE", cls.compute_type),
+            cpu_threads=_env_int("STT_CPU_THREADS", cls.cpu_threads),
+            num_workers=_env_int("STT_NUM_WORKERS", cls.num_workers),
+            batch_size=_env_int("STT_BATCH_SIZE", cls.batch_size),
+            batch_wait_ms=_env_float("STT_BATCH_WAIT_MS", cls.batch_wait_ms),
+            workers=_env_int("STT_WORKERS", cls.workers),
+            worker_max_jobs=_env_int("STT_WORKER_MAX_JOBS", cls.worker_max_jobs),
+            job_timeout=_env_float("STT_JOB_TIMEOUT", cls.job_timeout),
+        )
+
+    def provider_kwargs(self) -> dict:
+        """Keyword arguments for get_stt_service(self.provider, ...)"""
+        if self.provider == "whisper_api":
+            return {}
+        if self.provider == "faster_whisper":
+            return {
+                "model_size": self.model_size,
+                "compute_type": self.compute_type,
+                "cpu_threads": self.cpu_threads,
+                "num_workers": self.num_workers,
+            }
+        if self.provider == "whisper_batched":
+            return {
+                "model_size": self.model_size,
+                "max_batch_size": self.batch_size,
+                "max_wait_ms": self.batch_wait_ms,
+            }
+        return {"model_size": self.model_size}
+
+
+@dataclass(frozen=True)
+class ServiceConfig:
+    """Settings of the FastAPI service"""
+
+    stt: STTConfig
+    # Cleaned characters of resume text to extract (None = the extraction
+    # prompt's own limit, 0 = the whole document)
+    resume_text_budget: Optional[int] = None
+    # Upper limits on what a /api/evaluate-answers:batch client may ask for
+    batch_max_concurrency: int = 8
+    batch_max_pack_size: int = 8
+
+    @classmethod
+    def from_env(cls) -> "ServiceConfig":
+        budget = os.getenv("RESUME_TEXT_BUDGET")
+        return cls(
+            stt=STTConfig.from_env(),
+            resume_text_budget=int(budget) if budget else None,
+            batch_max_concurrency=_env_int("BATCH_EVAL_MAX_CONCURRENCY", cls.batch_max_concurrency),
+            batch_max_pack_size=_env_int("BATCH_EVAL_MAX_PACK_SIZE", cls.batch_max_pack_size),
+        )
+
+
+@dataclass(frozen=True)
+class PreforkConfig:
+    """Multi-worker launcher settings (PREFORK_* variables, see runtime/prefork.py)"""
+
+    app: str = "simple_api:app"
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 2
+    # Recycle a worker after this many requests (0 = never), +/- jitter so
+    # workers don't all restart at once
+    max_requests: int = 0
+    max_requests_jitter: int = 0
+    # Concurrent connections per worker before it answers 503 (0 = no limit)
+    limit_concurrency: int = 0
+    # Seconds a stopping worker gets to finish in-flight requests
+    graceful_timeout: float = 30.0
+    # Torch intra-op threads per worker (0 = CPU count / workers)
+    torch_threads: int = 0
+    # Shared directory for the resume cache and downloaded model weights
+    cache_dir: Optional[str] = None
+    preload: bool = True
+
+    @classmethod
+    def from_env(cls) -> "PreforkConfig":
+        return cls(
+            app=os.getenv("PREFORK_APP", cls.app),
+            host=os.getenv("PREFORK_HOST", cls.host),
+            port=_env_int("PORT", cls.port),
+            workers=_env_int("PREFORK_WORKERS", cls.workers),
+            max_requests=_env_int("PREFORK_MAX_REQUESTS", cls.max_requests),
+            max_requests_jitter=_env_int("PREFORK_MAX_REQUESTS_JITTER", cls.max_requests_jitter),
+            limit_concurrency=_env_int("PREFORK_LIMIT_CONCURRENCY", cls.limit_concurrency),
+            graceful_timeout=_env_float("PREFORK_GRACEFUL_TIMEOUT", cls.graceful_timeout),
+            torch_threads=_env_int("PREFORK_TORCH_THREADS", cls.torch_threads),
+            cache_dir=os.getenv("PREFORK_CACHE_DIR") or None,
+            preload=os.getenv("PREFORK_PRELOAD", "1").lower() not in ("0", "false", "no"),
+        )
+
+
+_config = None
+
+
+def get_config() -> ServiceConfig:
+    """Shared ServiceConfig, read from the environment on first use"""
+    global _config
+    if _config is None:
+        load_env_file()
+        _config = ServiceConfig.from_env()
+    return _config
@@ -0,0 +1,282 @@
+"""
+Bounded execution pools for blocking work
+
+The FastAPI endpoints are async, but LLM calls, PDF extraction and Whisper
+inference are all blocking. Running them inline freezes the event loop, so
+each workload class gets its own bounded pool here. When a pool already has
+``max_workers + max_queue`` jobs in flight, new submissions are rejected with
+``PoolSaturated`` instead of piling up, and the API turns that into a 503.
+
+Work that is awaited natively (the async LLM client) needs no thread, only
+the same admission control: ``AsyncLimiter`` caps it the same way.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict
+
+from runtime.config import get_config
+
+
+class PoolSaturated(RuntimeError):
+    """Raised when a pool has no free worker or queue slot"""
+
+    def __init__(self, pool_name: str, retry_after: int):
+        super().__init__(f"{pool_name} pool is saturated, retry in {retry_after}s")
+        self.pool_name = pool_name
+        self.retry_after = retry_after
+
+
+class BoundedPool:
+    """
+    Thread or process pool with a hard cap on in-flight jobs
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_queue: int = 0,
+        kind: str = "thread",
+        retry_after: int = 5,
+    ):
+        """
+        Args:
+            name: Pool name (used in errors and thread names)
+            max_workers: Number of worker threads/processes
+            max_queue: Extra jobs allowed to wait for a free worker
+            kind: 'thread' or 'process'
+            retry_after: Seconds suggested to clients when saturated
+        """
+        if max_workers < 1:
+            raise ValueError(f"{name} pool needs at least one worker")
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown pool kind: {kind}")
+
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max(0, max_queue)
+        self.kind = kind
+        self.retry_after = retry_after
+
+        self._capacity = self.max_workers + self.max_queue
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=f"{self.name}-pool",
+                )
+        return self._executor
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _acquire(self):
+        with self._lock:
+            if self._in_flight >= self._capacity:
+                raise PoolSaturated(self.name, self.retry_after)
+            self._in_flight += 1
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """
+        Run ``fn(*args, **kwargs)`` on the pool and await its result
+
+        Raises:
+            PoolSaturated: If the pool is at capacity
+        """
+        self._acquire()
+        try:
+            future = self._get_executor().submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        # Release the slot when the job really finishes, not when the caller
+        # stops waiting (a cancelled request does not stop a running thread).
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+        }
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+class AsyncLimiter:
+    """
+    Concurrency cap for awaited work, with a bounded wait queue
+
+    ``async with limiter:`` admits ``max_concurrency`` holders at once and
+    lets ``max_queue`` more wait; anyone beyond that gets PoolSaturated
+    right away instead of an unbounded wait.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int = 0, retry_after: int = 5):
+        if max_concurrency < 1:
+            raise ValueError(f"{name} limiter needs a concurrency of at least one")
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+
+        self._active = 0
+        self._waiting = 0
+        # Created per event loop (asyncio primitives bind to the first one)
+        self._semaphore = None
+        self._loop = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    @property
+    def in_flight(self) -> int:
+        return self._active + self._waiting
+
+    async def __aenter__(self):
+        semaphore = self._get_semaphore()
+        if semaphore.locked() and self._waiting >= self.max_queue:
+            raise PoolSaturated(self.name, self.retry_after)
+        self._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._active += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "kind": "async",
+            "max_workers": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+        }
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+# Pool settings per workload class. Sizes can be overridden with
+# <PREFIX>_WORKERS / <PREFIX>_QUEUE environment variables, and the kind
+# with <PREFIX>_KIND where more than one is listed.
+POOL_DEFAULTS = {
+    # PDF/DOCX extraction is CPU-bound but short; its job is a plain
+    # function of bytes, so it can also run in processes
+    "pdf": {"env": "PDF_POOL", "workers": 4, "queue": 8, "kinds": ("thread", "process")},
+    # Whisper shares one in-process model and runs one inference at a time
+    # (stt_service._inference_lock); the second thread decodes/preprocesses
+    # the next upload meanwhile. Raised for the STT process pool and for
+    # micro-batching. Threads only: jobs are bound methods of the shared
+    # service and the per-connection streaming transcriber.
+    "stt": {"env": "STT_POOL", "workers": 2, "queue": 4, "kinds": ("thread",)},
+}
+
+# Async workload classes: concurrency (<PREFIX>_MAX_CONCURRENCY) and extra
+# waiters (<PREFIX>_MAX_QUEUE) per process
+LIMITER_DEFAULTS = {
+    # LLM calls are remote HTTP requests awaited on the event loop
+    "llm": {"env": "LLM", "concurrency": 8, "queue": 32},
+}
+
+_pools: Dict[str, BoundedPool] = {}
+_limiters: Dict[str, AsyncLimiter] = {}
+_pools_lock = threading.Lock()
+
+
+def get_limiter(name: str) -> AsyncLimiter:
+    """Return the shared limiter for an async workload class ('llm')"""
+    if name not in LIMITER_DEFAULTS:
+        raise ValueError(f"Unknown limiter: {name}. Available: {list(LIMITER_DEFAULTS.keys())}")
+
+    with _pools_lock:
+        if name not in _limiters:
+            cfg = LIMITER_DEFAULTS[name]
+            prefix = cfg["env"]
+            _limiters[name] = AsyncLimiter(
+                name=name,
+                max_concurrency=_env_int(f"{prefix}_MAX_CONCURRENCY", cfg["concurrency"]),
+                max_queue=_env_int(f"{prefix}_MAX_QUEUE", cfg["queue"]),
+            )
+        return _limiters[name]
+
+
+def get_pool(name: str) -> BoundedPool:
+    """Return the shared pool for a workload class ('pdf', 'stt')"""
+    if name not in POOL_DEFAULTS:
+        raise ValueError(f"Unknown pool: {name}. Available: {list(POOL_DEFAULTS.keys())}")
+
+    with _pools_lock:
+        if name not in _pools:
+            cfg = POOL_DEFAULTS[name]
+            prefix = cfg["env"]
+            workers = cfg["workers"]
+            if name == "stt":
+                # One feeding thread per STT worker process, and enough
+                # concurrent callers for micro-batches to fill up; same
+                # settings get_stt() builds the service from
+                stt = get_config().stt
+                workers = max(workers, stt.workers)
+                if stt.provider == "whisper_batched":
+                    workers = max(workers, stt.batch_size)
+            kind = os.getenv(f"{prefix}_KIND", cfg["kinds"][0])
+            if kind not in cfg["kinds"]:
+                raise ValueError(f"{prefix}_KIND={kind} is not supported. Available: {list(cfg['kinds'])}")
+            _pools[name] = BoundedPool(
+                name=name,
+                max_workers=_env_int(f"{prefix}_WORKERS", workers),
+                max_queue=_env_int(f"{prefix}_QUEUE", max(cfg["queue"], workers)),
+                kind=kind,
+            )
+        return _pools[name]
+
+
+async def run_in_pool(name: str, fn: Callable, *args, **kwargs):
+    """Shortcut for ``get_pool(name).run(fn, *args, **kwargs)``"""
+    return await get_pool(name).run(fn, *args, **kwargs)
+
+
+def pool_stats() -> dict:
+    """Stats for every pool and limiter created so far"""
+    stats = {name: pool.stats() for name, pool in _pools.items()}
+    stats.update((name, limiter.stats()) for name, limiter in _limiters.items())
+    return stats
+
+
+def shutdown_pools(wait: bool = True):
+    """Shut down all pools (called on application shutdown)"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=wait)
+        _pools.clear()
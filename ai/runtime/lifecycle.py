@@ -0,0 +1,88 @@
+"""
+Startup warm-up and readiness tracking
+
+Models are loaded lazily by default, which makes the first request after a
+deploy pay the full load time. On startup the API preloads the configured
+models and runs a dummy inference per component; ``/ready`` only reports
+ready once every component has warmed up, so a load balancer can keep
+traffic away from cold workers. ``/health`` stays a plain liveness check.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class Readiness:
+    """Thread-safe per-component warm-up status"""
+
+    PENDING = "pending"
+    WARMING = "warming"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self):
+        self._components = {}
+        self._lock = threading.Lock()
+
+    def set(self, name: str, status: str, detail: Optional[str] = None, seconds: Optional[float] = None):
+        with self._lock:
+            entry = {"status": status}
+            if detail:
+                entry["detail"] = detail
+            if seconds is not None:
+                entry["seconds"] = round(seconds, 2)
+            self._components[name] = entry
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return bool(self._components) and all(
+                c["status"] == self.READY for c in self._components.values()
+            )
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._components.items()}
+
+
+readiness = Readiness()
+
+
+def env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+async def _warm_component(name: str, fn: Callable):
+    readiness.set(name, Readiness.WARMING)
+    start = time.perf_counter()
+    try:
+        if asyncio.iscoroutinefunction(fn):
+            await fn()
+        else:
+            await asyncio.to_thread(fn)
+    except Exception as e:
+        print(f"❌ Warm-up failed for {name}: {type(e).__name__}: {e}")
+        readiness.set(name, Readiness.FAILED, detail=str(e))
+        return
+
+    elapsed = time.perf_counter() - start
+    print(f"🔥 {name} warmed up in {elapsed:.1f}s")
+    readiness.set(name, Readiness.READY, seconds=elapsed)
+
+
+async def warm_up(components: Dict[str, Callable]):
+    """
+    Warm up all components concurrently
+
+    Args:
+        components: Name -> warm-up callable (sync callables run in a thread)
+    """
+    for name in components:
+        readiness.set(name, Readiness.PENDING)
+    await asyncio.gather(*(_warm_component(name, fn) for name, fn in components.items()))
@@ -0,0 +1,369 @@
+"""
+Production launcher: preload once, fork workers that share the models
+
+``python simple_api.py`` is a single process. Running N copies of it to use
+N cores loads the Whisper weights N times. This launcher instead:
+
+- binds the listening socket and imports the app in a master process
+- preloads the STT weights there (stt_service.preload_model), then
+  freezes the GC so the workers don't dirty those pages
+- forks ``workers`` uvicorn servers that accept on the shared socket and
+  reuse the inherited weights copy-on-write, so an extra worker costs its
+  own Python heap rather than another copy of the model
+- respawns workers that exit: recycled after ``max_requests`` (uvicorn's
+  limit_max_requests, with jitter) or crashed (with backoff)
+
+Nothing that holds threads, sockets or file handles is created before the
+fork - LLM clients, worker pools, the resume cache connection and the
+micro-batcher thread all start lazily inside each worker.
+
+Signals to the master:
+    SIGTERM / SIGINT  graceful shutdown (workers drain for graceful_timeout)
+    SIGHUP            rolling restart, one worker at a time
+    SIGUSR1           print per-worker memory (private vs shared)
+
+Run from the ai/ directory:
+    python -m runtime.prefork --workers 4 --port 8000
+"""
+
+import argparse
+import dataclasses
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Optional
+
+from runtime.config import PreforkConfig, get_config, load_env_file
+
+# A worker exiting sooner than this after its start counts as a crash
+CRASH_WINDOW = 5.0
+MAX_BACKOFF = 30.0
+
+
+def apply_cache_dir(cache_dir: str):
+    """
+    Point every on-disk cache at one shared directory (explicit settings win)
+
+    The SQLite resume cache is then shared by all workers, and model
+    downloads (Whisper, Hugging Face tokenizers) happen once.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    os.environ.setdefault("RESUME_CACHE_PATH", os.path.join(cache_dir, "resume_cache.sqlite3"))
+    os.environ.setdefault("XDG_CACHE_HOME", cache_dir)
+    os.environ.setdefault("HF_HOME", os.path.join(cache_dir, "huggingface"))
+
+
+def apply_worker_defaults(workers: int):
+    """
+    Turn off features that assume one process when there are several
+
+    Prefetched questions live in the worker that generated them, and the
+    socket hands the follow-up /api/generate-question to any worker, so
+    prefetch is disabled unless QUESTION_PREFETCH is set explicitly (do that
+    only behind a proxy with sticky routing by session).
+    """
+    if workers > 1 and os.getenv("QUESTION_PREFETCH") is None:
+        os.environ["QUESTION_PREFETCH"] = "0"
+        print(f"⚠️ Question prefetch disabled with {workers} workers "
+              "(set QUESTION_PREFETCH=1 with sticky session routing)")
+
+
+def preload_models():
+    """Load the configured STT weights in the master (PRELOAD_STT, default on)"""
+    from runtime.lifecycle import env_flag
+    from stt.stt_service import preload_model
+
+    if not env_flag("PRELOAD_STT", True):
+        return
+    stt = get_config().stt
+    if stt.workers > 0:
+        # STT_WORKERS runs its own model processes inside each worker
+        print("ℹ️ STT_WORKERS is set - STT weights are not shared across workers")
+        return
+    started = time.monotonic()
+    try:
+        loaded = preload_model(stt.provider, stt.model_size)
+    except Exception as e:
+        print(f"⚠️ STT preload failed, workers will load on first use: {e}")
+        return
+    if loaded:
+        print(f"✅ Preloaded STT '{stt.provider}/{stt.model_size}' in {time.monotonic() - started:.1f}s")
+    else:
+        print(f"ℹ️ STT provider '{stt.provider}' is not preloaded (loaded per worker)")
+
+
+def memory_mb(pid: int) -> Optional[Dict[str, float]]:
+    """Private (unshared) and proportional memory of a process, Linux only"""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return None
+
+    def kb(name):
+        return int(fields.get(name, "0 kB").split()[0])
+
+    return {
+        "private": (kb("Private_Clean") + kb("Private_Dirty")) / 1024,
+        "pss": kb("Pss") / 1024,
+        "rss": kb("Rss") / 1024,
+    }
+
+
+class PreforkServer:
+    """Master process managing forked uvicorn workers on one shared socket"""
+
+    def __init__(self, config: PreforkConfig):
+        self.config = config
+        self.app = None
+        self.sock = None
+        self.workers: Dict[int, float] = {}  # pid -> start time
+        # Workers told to stop; uvicorn re-raises SIGTERM once drained, so
+        # their exit status isn't a crash
+        self._retiring = set()
+        self._stopping = False
+        self._reload = False
+        self._report = False
+        # Crash backoff: missing workers are respawned from _respawn_at on
+        self._backoff = 0.0
+        self._respawn_at = 0.0
+        self._last_crash = 0.0
+
+    def bind(self) -> int:
+        """Create the listening socket; returns the bound port"""
+        family = socket.AF_INET6 if ":" in self.config.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.config.host, self.config.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        self.sock = sock
+        return sock.getsockname()[1]
+
+    def load(self):
+        """Import the app (and everything it imports) and preload models"""
+        from uvicorn.importer import import_from_string
+
+        apply_worker_defaults(self.config.workers)
+        self.app = import_from_string(self.config.app)
+        if self.config.preload:
+            preload_models()
+        # Move everything loaded so far out of the collector's reach: its
+        # bookkeeping writes would otherwise un-share those pages
+        gc.collect()
+        gc.freeze()
+
+    def run(self) -> int:
+        port = self.bind()
+        print(f"🚀 Listening on http://{self.config.host}:{port} (master pid {os.getpid()})", flush=True)
+        self.load()
+
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        signal.signal(signal.SIGHUP, self._on_reload)
+        signal.signal(signal.SIGUSR1, self._on_report)
+
+        for _ in range(self.config.workers):
+            self.spawn()
+
+        while not self._stopping:
+            self._reap()
+            if self._stopping:
+                break
+            if self._reload:
+                self._reload = False
+                self._rolling_restart()
+            if self._report:
+                self._report = False
+                self.report_memory()
+            self._settle_backoff()
+            missing = self.config.workers - len(self.workers)
+            if missing > 0 and time.monotonic() >= self._respawn_at:
+                for _ in range(missing):
+                    self.spawn()
+            # Short ticks: signals and the backoff deadline are checked here
+            time.sleep(0.2)
+
+        self.shutdown()
+        return 0
+
+    def spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                self._run_worker()
+                code = 0
+            except BaseException as e:
+                print(f"❌ Worker {os.getpid()} failed: {type(e).__name__}: {e}", flush=True)
+            finally:
+                os._exit(code)
+        self.workers[pid] = time.monotonic()
+        print(f"👷 Worker {pid} started", flush=True)
+        return pid
+
+    def _run_worker(self):
+        import uvicorn
+
+        # The master's handlers don't apply here; uvicorn installs its own
+        # for SIGTERM/SIGINT
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, signal.SIG_DFL)
+        for sig in (signal.SIGHUP, signal.SIGUSR1):
+            signal.signal(sig, signal.SIG_IGN)
+
+        torch_threads = self.config.torch_threads or max(1, (os.cpu_count() or 1) // self.config.workers)
+        if "torch" in sys.modules:
+            sys.modules["torch"].set_num_threads(torch_threads)
+
+        config = uvicorn.Config(
+            self.app,
+            limit_max_requests=self.config.max_requests or None,
+            limit_max_requests_jitter=self.config.max_requests_jitter,
+            limit_concurrency=self.config.limit_concurrency or None,
+            timeout_graceful_shutdown=self.config.graceful_timeout,
+        )
+        server = uvicorn.Server(config)
+        server.run(sockets=[self.sock])
+        if not server.started:
+            # e.g. the app's startup hook failed - counts as a crash
+            raise RuntimeError("server did not start")
+
+    def _reap(self):
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.workers.clear()
+                return
+            if pid == 0:
+                return
+            started = self.workers.pop(pid, None)
+            if started is None or self._stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            lifetime = time.monotonic() - started
+            if pid in self._retiring:
+                self._retiring.discard(pid)
+                print(f"♻️ Worker {pid} stopped after {lifetime:.0f}s", flush=True)
+            elif code != 0 and lifetime < CRASH_WINDOW:
+                self._backoff = min(MAX_BACKOFF, max(1.0, self._backoff * 2))
+                self._last_crash = time.monotonic()
+                self._respawn_at = self._last_crash + self._backoff
+                print(f"❌ Worker {pid} exited with {code} after {lifetime:.1f}s, "
+                      f"respawning in {self._backoff:.0f}s", flush=True)
+            else:
+                reason = "recycled" if code == 0 else f"exited with {code}"
+                print(f"♻️ Worker {pid} {reason} after {lifetime:.0f}s", flush=True)
+
+    def _settle_backoff(self):
+        """Forget past crashes once a worker started since then stays up"""
+        if not self._backoff:
+            return
+        now = time.monotonic()
+        if any(started > self._last_crash and now - started > CRASH_WINDOW
+               for started in self.workers.values()):
+            self._backoff = 0.0
+            self._respawn_at = 0.0
+
+    def _rolling_restart(self):
+        """Replace workers one at a time: start the new one, then drain the old"""
+        print("🔄 Rolling restart", flush=True)
+        for old in list(self.workers):
+            if self._stopping:
+                return
+            self.spawn()
+            self._terminate(old)
+            deadline = time.monotonic() + self.config.graceful_timeout + 5
+            while old in self.workers and time.monotonic() < deadline and not self._stopping:
+                self._reap()
+                time.sleep(0.1)
+
+    def _terminate(self, pid: int, sig=signal.SIGTERM):
+        self._retiring.add(pid)
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            self.workers.pop(pid, None)
+            self._retiring.discard(pid)
+
+    def shutdown(self):
+        print(f"🛑 Stopping {len(self.workers)} workers", flush=True)
+        for pid in list(self.workers):
+            self._terminate(pid)
+        deadline = time.monotonic() + self.config.graceful_timeout + 5
+        while self.workers and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in list(self.workers):
+            print(f"⚠️ Worker {pid} did not stop in time, killing it", flush=True)
+            self._terminate(pid, signal.SIGKILL)
+        while self.workers:
+            self._reap()
+            time.sleep(0.05)
+        self.sock.close()
+
+    def report_memory(self):
+        """Print how much of each worker's memory is its own vs shared"""
+        for pid in [os.getpid(), *self.workers]:
+            mem = memory_mb(pid)
+            if mem is None:
+                print("ℹ️ Memory report needs /proc/<pid>/smaps_rollup (Linux)", flush=True)
+                return
+            role = "master" if pid == os.getpid() else "worker"
+            print(f"📊 {role} {pid}: private {mem['private']:.0f} MB, "
+                  f"pss {mem['pss']:.0f} MB, rss {mem['rss']:.0f} MB", flush=True)
+
+    def _on_stop(self, signum, frame):
+        self._stopping = True
+
+    def _on_reload(self, signum, frame):
+        self._reload = True
+
+    def _on_report(self, signum, frame):
+        self._report = True
+
+
+def parse_args(argv=None) -> PreforkConfig:
+    defaults = PreforkConfig.from_env()
+    parser = argparse.ArgumentParser(description="Prefork launcher for the AI service")
+    parser.add_argument("--app", default=defaults.app, help="module:attribute of the ASGI app")
+    parser.add_argument("--host", default=defaults.host)
+    parser.add_argument("--port", type=int, default=defaults.port, help="0 picks a free port")
+    parser.add_argument("--workers", type=int, default=defaults.workers)
+    parser.add_argument("--max-requests", type=int, default=defaults.max_requests,
+                        help="recycle a worker after this many requests (0 = never)")
+    parser.add_argument("--max-requests-jitter", type=int, default=defaults.max_requests_jitter)
+    parser.add_argument("--limit-concurrency", type=int, default=defaults.limit_concurrency,
+                        help="connections per worker before answering 503 (0 = no limit)")
+    parser.add_argument("--graceful-timeout", type=float, default=defaults.graceful_timeout)
+    parser.add_argument("--torch-threads", type=int, default=defaults.torch_threads,
+                        help="torch threads per worker (0 = CPU count / workers)")
+    parser.add_argument("--cache-dir", default=defaults.cache_dir,
+                        help="shared directory for the resume cache and model downloads")
+    parser.add_argument("--no-preload", dest="preload", action="store_false", default=defaults.preload,
+                        help="don't load the STT weights in the master")
+    args = parser.parse_args(argv)
+    return dataclasses.replace(defaults, **vars(args))
+
+
+def main(argv=None) -> int:
+    load_env_file()
+    config = parse_args(argv)
+    if config.workers < 1:
+        raise SystemExit("--workers must be at least 1")
+    if config.cache_dir:
+        apply_cache_dir(config.cache_dir)
+    # Intra-op threads are split between workers unless set explicitly
+    os.environ.setdefault(
+        "OMP_NUM_THREADS",
+        str(config.torch_threads or max(1, (os.cpu_count() or 1) // config.workers)),
+    )
+    return PreforkServer(config).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
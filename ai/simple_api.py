@@ -1,26 +1,40 @@
 """
 Minimal FastAPI server - Resume parsing and question generation
+
+Heavy backends (Whisper/numpy, the HF inference client, PDF and DOCX
+readers) are imported on first use, so importing this module - a worker
+starting, pytest collecting - stays cheap.
 """
-from urllib import request
+from runtime.config import get_config, load_env_file
+
+# Before the modules below read their settings at import
+load_env_file()
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from typing import Optional, List, Dict
 from pathlib import Path
-import shutil
-from dotenv import load_dotenv
+import asyncio
+import json
+import threading
 
-from resume_parsing.extraction.extract import extract_text
-from resume_parsing.cleaning.clean_text import clean_text
+from resume_parsing.pipeline import RESUME_CHAR_LIMIT, extract_resume_text
 from resume_parsing.llm.hf_llm import HuggingFaceLLM
-from resume_parsing.llm.llm_extract import extract_structured_resume
-from resume_parsing.llm.generate_question import generate_question
-from resume_parsing.llm.evaluate_answer import evaluate_answer
-from stt.stt_service import get_stt_service
-
-# Load environment variables
-load_dotenv()
+from resume_parsing.llm.llm_extract import RESUME_MAX_TOKENS, aextract_structured_resume, load_prompt
+from resume_parsing.schema import resume_schema
+from resume_parsing.cache.resume_cache import get_resume_cache, make_resume_cache_key
+from resume_parsing.cache.evaluation_cache import get_evaluation_cache
+from resume_parsing.cache.resume_context_store import get_resume_context_store
+from resume_parsing.cache.question_prefetch import NEXT_STATES, get_question_prefetcher, make_prefetch_fingerprint
+from resume_parsing.llm.generate_question import agenerate_question, astream_question
+from resume_parsing.llm.evaluate_answer import aevaluate_answer, aevaluate_answers_batch
+from resume_parsing.llm.resume_context import ResumeContext
+from resume_parsing.llm.prompt_registry import get_prompt_registry
+from resume_parsing.extraction.pdf_engine import shutdown_executor as shutdown_pdf_executor
+from runtime.executor import PoolSaturated, run_in_pool, pool_stats, shutdown_pools
+from runtime.lifecycle import readiness, warm_up, env_flag
 
 app = FastAPI(title="AI Resume Parser", version="0.1.0")
 
@@ -36,6 +50,9 @@ app.add_middleware(
 # Initialize LLM once
 llm = None
 stt = None
+# Building the STT service loads a model (or starts worker processes):
+# one builder at a time, never on the event loop (see aget_stt)
+_stt_lock = threading.Lock()
 
 def get_llm():
     global llm
@@ -45,24 +62,76 @@ def get_llm():
 
 def get_stt():
     global stt
-    if stt is None:
+    if stt is not None:
+        return stt
+    with _stt_lock:
+        if stt is not None:
+            return stt
         # Use 'small' model for better accuracy (base -> small -> medium -> large)
         # Options: 'tiny', 'base', 'small', 'medium', 'large'
         # 'small' is ~2x better than 'base' with moderate speed tradeoff
-        stt = get_stt_service('whisper_local', model_size='small')
+        # STT_PROVIDER=faster_whisper runs the same model int8-quantized on CPU;
+        # STT_PROVIDER=whisper_batched batches concurrent requests together
+        config = get_config().stt
+
+        # STT_WORKERS > 0 spreads transcription over that many processes
+        if config.workers > 0 and config.provider != "whisper_api":
+            from stt.worker_pool import STTWorkerPool
+            stt = STTWorkerPool(
+                config.provider,
+                processes=config.workers,
+                max_jobs_per_worker=config.worker_max_jobs,
+                job_timeout=config.job_timeout,
+                **config.provider_kwargs(),
+            )
+        else:
+            from stt.stt_service import get_stt_service
+            stt = get_stt_service(config.provider, **config.provider_kwargs())
         print(f"Initialized STT: {stt.get_provider_name()}")
     return stt
 
-# Temp upload directory
-TEMP_UPLOAD_DIR = Path(__file__).parent / "temp_uploads"
-TEMP_UPLOAD_DIR.mkdir(exist_ok=True)
+
+async def aget_stt():
+    """get_stt for request handlers: a first-time build runs on the 'stt' pool"""
+    if stt is not None:
+        return stt
+    return await run_in_pool("stt", get_stt)
+
+# Cleaned characters of resume text to extract; pages past this budget are
+# never read (0 = extract the whole document)
+RESUME_TEXT_BUDGET = get_config().resume_text_budget
+if RESUME_TEXT_BUDGET is None:
+    RESUME_TEXT_BUDGET = RESUME_CHAR_LIMIT
+
+
+def _extract_and_clean(contents: bytes, suffix: str) -> str:
+    """Blocking extraction + cleaning step (runs on the 'pdf' pool)"""
+    return extract_resume_text(contents, suffix, max_chars=RESUME_TEXT_BUDGET or None)
+
+
+# Server-side caps on the batch evaluation knobs clients choose
+BATCH_MAX_CONCURRENCY = get_config().batch_max_concurrency
+BATCH_MAX_PACK_SIZE = get_config().batch_max_pack_size
 
 
 # Pydantic models for request/response
 class QuestionRequest(BaseModel):
     state: str  # introduction, resume-based, follow-up, deep-dive, closing
     resume_data: Optional[Dict] = None
+    resume_id: Optional[str] = None  # from /api/parse-resume, selects the precomputed context
+    job_description: Optional[str] = None
+    conversation_history: Optional[List[Dict]] = None
+    session_id: Optional[str] = None  # serves a prefetched question if one matches
+
+
+class PrefetchRequest(BaseModel):
+    session_id: str
+    current_state: str
+    states: Optional[List[str]] = None  # default: transitions from current_state
+    resume_data: Optional[Dict] = None
+    resume_id: Optional[str] = None
     job_description: Optional[str] = None
+    # Including the question just answered, with the submitted answer
     conversation_history: Optional[List[Dict]] = None
 
 
@@ -71,12 +140,92 @@ class EvaluationRequest(BaseModel):
     answer: str
     state: Optional[str] = "unknown"
     resume_data: Optional[Dict] = None
+    resume_id: Optional[str] = None
+
+
+class BatchEvaluationRequest(BaseModel):
+    items: List[EvaluationRequest]
+    max_concurrency: Optional[int] = Field(4, ge=1, le=BATCH_MAX_CONCURRENCY)
+    pack_size: Optional[int] = Field(1, ge=1, le=BATCH_MAX_PACK_SIZE)  # Q/A pairs per LLM call
+
+
+@app.exception_handler(PoolSaturated)
+async def pool_saturated_handler(request: Request, exc: PoolSaturated):
+    """Reject work with 503 + Retry-After when a worker pool is full"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "pool": exc.pool_name},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+_warmup_task = None
+
+
+@app.on_event("startup")
+async def warm_up_models():
+    """
+    Preload models in the background so /health answers immediately and
+    /ready flips once everything is warm
+
+    PRELOAD_STT (default on) loads Whisper and runs a dummy inference;
+    PRELOAD_LLM (default on) creates the LLM client; WARMUP_LLM (default
+    off) also sends one tiny prompt to open the pooled connection.
+    """
+    global _warmup_task
+
+    async def warm_llm():
+        llm_instance = get_llm()
+        if env_flag("WARMUP_LLM", False):
+            await llm_instance.ainvoke("Reply with OK.")
+
+    components = {}
+    if env_flag("PRELOAD_STT", True):
+        components["stt"] = lambda: get_stt().warm_up()
+    if env_flag("PRELOAD_LLM", True):
+        components["llm"] = warm_llm
+
+    if components:
+        _warmup_task = asyncio.create_task(warm_up(components))
+    else:
+        readiness.set("models", readiness.READY, detail="preloading disabled")
+
+
+@app.on_event("shutdown")
+async def shutdown_worker_pools():
+    shutdown_pools(wait=False)
+    shutdown_pdf_executor(wait=False)
+    if stt is not None:
+        from stt.worker_pool import STTWorkerPool
+        if isinstance(stt, STTWorkerPool):
+            stt.close()
+    if llm is not None:
+        await llm.aclose()
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "resume-parser", "version": "0.1.0"}
+    return {
+        "status": "healthy",
+        "service": "resume-parser",
+        "version": "0.1.0",
+        "pools": pool_stats(),
+        "resume_cache": get_resume_cache().stats(),
+        "evaluation_cache": get_evaluation_cache().stats(),
+        "resume_contexts": get_resume_context_store().stats(),
+        "prompts": get_prompt_registry().stats(),
+        "question_prefetch": get_question_prefetcher().stats(),
+    }
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 200 once all preloaded models are warm, else 503"""
+    body = {"ready": readiness.ready, "components": readiness.snapshot()}
+    if not readiness.ready:
+        return JSONResponse(status_code=503, content=body)
+    return body
 
 
 @app.post("/api/parse-resume")
@@ -85,68 +234,186 @@ async def parse_resume(file: UploadFile = File(...)):
     Parse uploaded resume and extract structured data
     """
     try:
-        # Save uploaded file temporarily
-        file_path = TEMP_UPLOAD_DIR / file.filename
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Extract text from PDF/DOCX
-        raw_text = extract_text(file_path)
-        
-        # Clean the text
-        cleaned_text = clean_text(raw_text)
-        
-        # Extract structured data using LLM
+        contents = await file.read()
         llm_instance = get_llm()
-        resume_data = extract_structured_resume(llm_instance, cleaned_text)
+
+        # Same bytes + prompt + schema + budgets + model always parse the same way
+        cache = get_resume_cache()
+        cache_key = make_resume_cache_key(
+            contents, load_prompt().hash, llm_instance.model,
+            schema=resume_schema.RESUME_SCHEMA_COMPACT,
+            text_budget=RESUME_TEXT_BUDGET,
+            token_budget=RESUME_MAX_TOKENS,
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            context = get_resume_context_store().put(ResumeContext(cached))
+            return {
+                "success": True,
+                "data": cached,
+                "resume_id": context.resume_id,
+                "cached": True,
+                "message": "Resume parsed successfully"
+            }
+
+        # Extract text from the in-memory PDF/DOCX and clean it
+        suffix = Path(file.filename or "").suffix
+        cleaned_text = await run_in_pool("pdf", _extract_and_clean, contents, suffix)
         
-        # Clean up temp file
-        file_path.unlink()
+        # Extract structured data using LLM
+        resume_data = await aextract_structured_resume(llm_instance, cleaned_text)
+
+        data = resume_data.model_dump()
+        cache.put(cache_key, data)
+
+        # Prompt context for the interview is built here, once per resume
+        context = get_resume_context_store().put(ResumeContext(data))
         
         return {
             "success": True,
-            "data": resume_data.model_dump(),
+            "data": data,
+            "resume_id": context.resume_id,
+            "cached": False,
             "message": "Resume parsed successfully"
         }
         
+    except PoolSaturated:
+        raise
     except ValueError as e:
-        # Clean up on error
-        if file_path.exists():
-            file_path.unlink()
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        # Clean up on error
-        if file_path.exists():
-            file_path.unlink()
         raise HTTPException(status_code=500, detail=f"Parsing failed: {str(e)}")
 
 
+def _resume_context(request) -> ResumeContext:
+    """Precomputed context for the request's resume (by resume_id, else by data)"""
+    return get_resume_context_store().resolve(request.resume_data, request.resume_id)
+
+
+def _sse(event: str, data) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @app.post("/api/generate-question")
-async def generate_interview_question(request: QuestionRequest):
+async def generate_interview_question(request: QuestionRequest, stream: bool = False):
     """
     Generate interview question based on state and context
+
+    With ``?stream=true`` the response is a server-sent event stream: a
+    ``question`` event as soon as the question text is generated, then a
+    ``done`` event with question, difficulty and category (or ``error``).
     """
+    if stream:
+        return StreamingResponse(
+            _stream_question_events(request),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
     try:
+        prefetched = await _take_prefetched_question(request)
+        if prefetched is not None:
+            return {
+                "success": True,
+                "data": prefetched,
+                "prefetched": True,
+                "message": "Question generated successfully"
+            }
+
         llm_instance = get_llm()
         
-        question_data = generate_question(
+        question_data = await agenerate_question(
             llm=llm_instance,
             state=request.state,
             resume_data=request.resume_data,
             job_description=request.job_description,
-            conversation_history=request.conversation_history
+            conversation_history=request.conversation_history,
+            context=_resume_context(request)
         )
         
         return {
             "success": True,
             "data": question_data,
+            "prefetched": False,
             "message": "Question generated successfully"
         }
         
+    except PoolSaturated:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Question generation failed: {str(e)}")
 
 
+async def _take_prefetched_question(request: QuestionRequest) -> Optional[Dict]:
+    if not request.session_id:
+        return None
+    fingerprint = make_prefetch_fingerprint(
+        _resume_context(request).resume_id, request.job_description, request.conversation_history
+    )
+    return await get_question_prefetcher().take(request.session_id, request.state, fingerprint)
+
+
+async def _stream_question_events(request: QuestionRequest):
+    try:
+        prefetched = await _take_prefetched_question(request)
+        if prefetched is not None:
+            yield _sse("question", {"question": prefetched["question"]})
+            yield _sse("done", prefetched)
+            return
+
+        async for event, data in astream_question(
+            llm=get_llm(),
+            state=request.state,
+            resume_data=request.resume_data,
+            job_description=request.job_description,
+            conversation_history=request.conversation_history,
+            context=_resume_context(request)
+        ):
+            yield _sse(event, data)
+    except Exception as e:
+        print(f"❌ Question streaming failed: {e}")
+        yield _sse("error", {"detail": f"Question generation failed: {str(e)}"})
+
+
+@app.post("/api/prefetch-questions", status_code=202)
+async def prefetch_questions(request: PrefetchRequest):
+    """
+    Start generating the likely next questions once an answer is submitted
+
+    Called alongside the answer's evaluation, which decides the next state.
+    Returns immediately; a later /api/generate-question with the same
+    session_id, a matching state and the same context (submitted answer
+    included) is served from the prefetched results.
+    """
+    if not env_flag("QUESTION_PREFETCH", True):
+        return {"success": True, "states": [], "message": "Question prefetch disabled"}
+
+    states = request.states or NEXT_STATES.get(request.current_state, [])
+    llm_instance = get_llm()
+    context = _resume_context(request)
+
+    async def generate(state):
+        return await agenerate_question(
+            llm=llm_instance,
+            state=state,
+            resume_data=request.resume_data,
+            job_description=request.job_description,
+            conversation_history=request.conversation_history,
+            context=context
+        )
+
+    scheduled = get_question_prefetcher().schedule(
+        request.session_id,
+        states,
+        make_prefetch_fingerprint(
+            context.resume_id, request.job_description, request.conversation_history
+        ),
+        generate
+    )
+    return {"success": True, "states": scheduled, "message": "Prefetch started"}
+
+
 @app.post("/api/evaluate-answer")
 async def evaluate_interview_answer(request: EvaluationRequest):
     """
@@ -156,17 +423,20 @@ async def evaluate_interview_answer(request: EvaluationRequest):
         llm_instance = get_llm()
         print("DEBUG QUESTION:", request.question)
         print("DEBUG ANSWER:", request.answer)
-        evaluation_result = evaluate_answer(
+        evaluation_result = await aevaluate_answer(
             llm=llm_instance,
             question=request.question,
             answer=request.answer,
             state=request.state,
-            resume_data=request.resume_data
+            resume_data=request.resume_data,
+            cache=get_evaluation_cache(),
+            context=_resume_context(request)
         )
         print("DEBUG EVALUATION RESULT:", evaluation_result)
         return {
             "success": True,
-            "evaluation": evaluation_result
+            "evaluation": evaluation_result,
+            "cached": evaluation_result["cached"]
         }
         
     except Exception as e:
@@ -174,56 +444,166 @@ async def evaluate_interview_answer(request: EvaluationRequest):
         raise
 
 
+@app.post("/api/evaluate-answers:batch")
+async def evaluate_interview_answers_batch(request: BatchEvaluationRequest):
+    """
+    Evaluate several answers in one request (e.g. end-of-interview re-scoring)
+
+    Returns per-item evaluations in input order plus the overall score
+    (average of the per-question final scores).
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="No items to evaluate")
+
+    llm_instance = get_llm()
+    batch_result = await aevaluate_answers_batch(
+        llm=llm_instance,
+        items=[item.model_dump() for item in request.items],
+        cache=get_evaluation_cache(),
+        max_concurrency=request.max_concurrency or 4,
+        pack_size=request.pack_size or 1
+    )
+    return {
+        "success": True,
+        "evaluations": batch_result["results"],
+        "overall_score": batch_result["overall_score"]
+    }
+
+
 @app.post("/api/transcribe")
-async def transcribe_audio(file: UploadFile = File(...)):
+async def transcribe_audio(file: UploadFile = File(...), vad: bool = False):
     """
     Transcribe audio/video file to text using Whisper STT
     
     Supports: mp3, wav, m4a, webm, mp4, avi, etc.
+
+    Pass ``?vad=true`` to trim silence before inference; the response then
+    also includes pause/speech-pace statistics.
     """
     # Validate file
     if not file:
         raise HTTPException(status_code=400, detail="No file provided")
     
-    # Save uploaded file temporarily
-    temp_dir = Path("temp_uploads")
-    temp_dir.mkdir(exist_ok=True)
-    
-    file_extension = Path(file.filename).suffix or ".webm"
-    temp_path = temp_dir / f"audio_{Path(file.filename).stem}{file_extension}"
-    
     try:
-        # Save file
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Decode straight from the upload's bytes - no temp file on disk
+        contents = await file.read()
+        if not contents:
+            raise HTTPException(status_code=400, detail="Empty audio file")
         
-        print(f"📁 Saved uploaded file: {temp_path.name} ({temp_path.stat().st_size} bytes)")
+        print(f"📁 Received uploaded file: {file.filename} ({len(contents)} bytes)")
         
         # Get STT service
-        stt_service = get_stt()
+        stt_service = await aget_stt()
         
         # Transcribe
-        result = stt_service.transcribe(str(temp_path))
+        result = await run_in_pool("stt", stt_service.transcribe, contents, vad=vad)
         
         print(f"✅ Transcription complete: {len(result['text'])} characters")
         print("📝 Transcribed text:", result['text'])
-        return {
+        response = {
             "transcript": result['text'],
             "language": result['language'],
             "word_count": len(result['text'].split()),
             "char_count": len(result['text'])
         }
+        if 'speech_stats' in result:
+            response["speech_stats"] = result['speech_stats']
+        return response
         
+    except (PoolSaturated, HTTPException):
+        raise
     except Exception as e:
         print(f"❌ Transcription error: {type(e).__name__}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
-    
+
+
+@app.websocket("/ws/transcribe")
+async def transcribe_stream(websocket: WebSocket):
+    """
+    Stream audio while the candidate speaks and get partial transcripts back
+
+    Protocol:
+        client -> {"event": "start", "format": "webm" | "pcm_s16le" | "pcm_f32le",
+                   "sample_rate": 16000}              (optional, defaults shown)
+        client -> binary audio chunks
+        server -> {"type": "partial", "text": ...}   (running transcript)
+        client -> {"event": "end"}
+        server -> {"type": "final", "transcript": ..., "language": ..., ...}
+    """
+    from stt.streaming import StreamingTranscriber, supports_streaming
+
+    await websocket.accept()
+    config = {}
+    transcriber = None
+
+    async def get_transcriber():
+        nonlocal transcriber
+        if transcriber is None:
+            transcriber = StreamingTranscriber(
+                stt_service,
+                input_format=config.get("format", "pcm_s16le"),
+                sample_rate=int(config.get("sample_rate", 16000)),
+                window_seconds=float(config.get("window_seconds", 8.0)),
+                overlap_seconds=float(config.get("overlap_seconds", 1.0)),
+            )
+        return transcriber
+
+    try:
+        stt_service = await aget_stt()
+        if not supports_streaming(stt_service):
+            await websocket.send_json({
+                "type": "error",
+                "detail": f"{stt_service.get_provider_name()} does not support streaming, use /api/transcribe"
+            })
+            await websocket.close(code=1003)  # Unsupported data
+            return
+
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+            if message.get("bytes") is not None:
+                partial = await run_in_pool("stt", (await get_transcriber()).feed, message["bytes"])
+                if partial is not None:
+                    await websocket.send_json({"type": "partial", "text": partial})
+                continue
+
+            payload = json.loads(message.get("text") or "{}")
+            event = payload.get("event")
+            if event == "start":
+                if transcriber is not None:
+                    raise ValueError("'start' must be sent before any audio")
+                config = payload
+                await get_transcriber()
+            elif event == "end":
+                result = await run_in_pool("stt", (await get_transcriber()).finish)
+                print(f"✅ Streaming transcription complete: {len(result['text'])} characters")
+                await websocket.send_json({
+                    "type": "final",
+                    "transcript": result['text'],
+                    "language": result['language'],
+                    "duration": result['duration'],
+                    "word_count": len(result['text'].split()),
+                    "char_count": len(result['text'])
+                })
+                await websocket.close()
+                return
+            else:
+                raise ValueError(f"Unknown event: {event}")
+
+    except WebSocketDisconnect:
+        return
+    except PoolSaturated as e:
+        await websocket.send_json({"type": "error", "detail": str(e), "retry_after": e.retry_after})
+        await websocket.close(code=1013)  # Try again later
+    except Exception as e:
+        print(f"❌ Streaming transcription error: {type(e).__name__}: {str(e)}")
+        await websocket.send_json({"type": "error", "detail": f"Transcription failed: {str(e)}"})
+        await websocket.close(code=1011)
     finally:
-        # pass
-        # Clean up temp file
-        if temp_path.exists():
-            temp_path.unlink()
-            print(f"🗑️  Deleted temp file: {temp_path.name}")
+        if transcriber is not None:
+            transcriber.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,304 @@
+"""
+In-memory audio decoding
+
+Uploads are decoded straight from their bytes into a mono float32 16 kHz
+NumPy buffer, so nothing is written to (or read back from) disk. WAV data is
+viewed in place with ``np.frombuffer``; any other container is piped through
+FFmpeg. The exception is MP4/M4A without "faststart": its index (``moov``)
+comes after the media data and FFmpeg must seek back to it, which a pipe
+can't do, so those go through a temporary file. ``FFmpegStreamDecoder`` does the same for a container that arrives
+in chunks (streaming), with one FFmpeg process for the whole stream.
+"""
+
+import os
+import struct
+import subprocess
+import tempfile
+import threading
+
+import numpy as np
+
+from stt.preprocess import SAMPLE_RATE, to_model_input
+
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_IEEE_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def is_wav(data: bytes) -> bool:
+    return len(data) >= 12 and data[:4] == b"RIFF" and data[8:12] == b"WAVE"
+
+
+def parse_wav(data: bytes):
+    """
+    Parse a RIFF/WAVE buffer without copying the sample data
+
+    Returns:
+        (sample_rate, samples) where samples is a read-only view shaped
+        (frames,) or (frames, channels) in the file's native dtype.
+        24-bit PCM has no NumPy dtype and is widened to int32 (a copy).
+    """
+    if not is_wav(data):
+        raise ValueError("Not a RIFF/WAVE buffer")
+
+    view = memoryview(data)
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = bytes(view[offset:offset + 4])
+        chunk_size = struct.unpack_from("<I", data, offset + 4)[0]
+        body = offset + 8
+
+        if chunk_id == b"fmt ":
+            format_tag, channels, sample_rate = struct.unpack_from("<HHI", data, body)
+            bits = struct.unpack_from("<H", data, body + 14)[0]
+            if format_tag == _WAVE_FORMAT_EXTENSIBLE and chunk_size >= 26:
+                # Real format tag is the first two bytes of the sub-format GUID
+                format_tag = struct.unpack_from("<H", data, body + 24)[0]
+            fmt = (format_tag, channels, sample_rate, bits)
+
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("WAV data chunk before fmt chunk")
+            format_tag, channels, sample_rate, bits = fmt
+            packed24 = format_tag == _WAVE_FORMAT_PCM and bits == 24
+            dtype = np.dtype(np.uint8) if packed24 else _wav_dtype(format_tag, bits)
+            itemsize = 3 if packed24 else dtype.itemsize
+
+            # Streamed WAVs may carry a bogus size; clamp to what we have
+            size = min(chunk_size, len(data) - body)
+            size -= size % (itemsize * channels)
+            samples = np.frombuffer(view[body:body + size], dtype=dtype)
+            if packed24:
+                samples = _widen_int24(samples)
+            if channels > 1:
+                samples = samples.reshape(-1, channels)
+            return sample_rate, samples
+
+        offset = body + chunk_size + (chunk_size & 1)
+
+    raise ValueError("WAV buffer has no data chunk")
+
+
+def _widen_int24(raw: np.ndarray) -> np.ndarray:
+    """Little-endian 3-byte samples -> int32 (value << 8, same full scale)"""
+    widened = np.zeros((len(raw) // 3, 4), dtype=np.uint8)
+    widened[:, 1:] = raw.reshape(-1, 3)
+    return widened.view("<i4").reshape(-1)
+
+
+def _wav_dtype(format_tag: int, bits: int) -> np.dtype:
+    if format_tag == _WAVE_FORMAT_PCM:
+        dtypes = {8: np.uint8, 16: np.int16, 32: np.int32}
+    elif format_tag == _WAVE_FORMAT_IEEE_FLOAT:
+        dtypes = {32: np.float32, 64: np.float64}
+    else:
+        raise ValueError(f"Unsupported WAV format tag: {format_tag}")
+
+    if bits not in dtypes:
+        raise ValueError(f"Unsupported WAV bit depth: {bits}")
+    return np.dtype(dtypes[bits]).newbyteorder("<")
+
+
+def needs_seekable_input(data: bytes) -> bool:
+    """
+    True for an MP4/M4A/MOV whose ``moov`` box comes after ``mdat``
+
+    Walks the top-level boxes (size + type headers) until one of the two
+    shows up; anything that is not an ISO media file is pipe-safe.
+    """
+    if len(data) < 12 or data[4:8] != b"ftyp":
+        return False
+    offset = 0
+    while offset + 8 <= len(data):
+        size, box = struct.unpack_from(">I4s", data, offset)
+        if box == b"moov":
+            return False
+        if box == b"mdat":
+            return True
+        if size == 1:
+            if offset + 16 > len(data):
+                break
+            size = struct.unpack_from(">Q", data, offset + 8)[0]
+        elif size == 0:
+            break  # box runs to the end of the file
+        if size < 8:
+            break
+        offset += size
+    return False
+
+
+def _run_ffmpeg(source: str, data=None):
+    return subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-loglevel", "error",
+            "-i", source,
+            "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE),
+            "pipe:1",
+        ],
+        input=data,
+        capture_output=True,
+    )
+
+
+def _run_ffmpeg_on_file(data: bytes):
+    fd, path = tempfile.mkstemp(suffix=".mp4")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return _run_ffmpeg(path)
+    finally:
+        os.unlink(path)
+
+
+def decode_with_ffmpeg(data: bytes) -> np.ndarray:
+    """
+    Decode any FFmpeg-readable container to mono float32 16 kHz via pipes
+
+    MP4s with the index at the end are written to a temporary file instead,
+    and so is any ISO media file the pipe decode yields nothing for.
+    """
+    try:
+        if needs_seekable_input(data):
+            proc = _run_ffmpeg_on_file(data)
+        else:
+            proc = _run_ffmpeg("pipe:0", data)
+            if not proc.stdout and data[4:8] == b"ftyp":
+                proc = _run_ffmpeg_on_file(data)
+    except FileNotFoundError:
+        raise RuntimeError(
+            "FFmpeg is required to process this audio format. "
+            "Install FFmpeg and add it to your system PATH."
+        )
+    # A stream cut mid-cluster makes FFmpeg complain but still yields the
+    # samples decoded so far, so only fail when nothing came out at all
+    if not proc.stdout and proc.returncode != 0:
+        raise RuntimeError(f"FFmpeg decode failed: {proc.stderr.decode(errors='ignore').strip()}")
+    return np.frombuffer(proc.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def decode_audio(data: bytes) -> np.ndarray:
+    """
+    Decode uploaded audio bytes to mono float32 16 kHz samples
+
+    WAV is parsed in memory (no FFmpeg needed); everything else, and WAV
+    encodings the fast path doesn't read (A-law, 12-bit, ...), goes
+    through an FFmpeg pipe.
+    """
+    if is_wav(data):
+        try:
+            sample_rate, samples = parse_wav(data)
+        except ValueError:
+            return decode_with_ffmpeg(data)
+        return to_model_input(samples, sample_rate)
+    return decode_with_ffmpeg(data)
+
+
+class FFmpegStreamDecoder:
+    """
+    Decode a container stream chunk by chunk through one FFmpeg process
+
+    Chunks are written to FFmpeg's stdin as they arrive and the PCM it
+    produces is collected from stdout by a reader thread, so each byte of
+    the stream is decoded once however long the stream runs.
+    """
+
+    # Start decoding from the container header instead of buffering
+    # megabytes of input to probe it, and flush output per packet
+    COMMAND = [
+        "ffmpeg", "-nostdin", "-loglevel", "error",
+        "-fflags", "nobuffer", "-probesize", "32768", "-analyzeduration", "0",
+        "-i", "pipe:0",
+        "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-flush_packets", "1",
+        "pipe:1",
+    ]
+
+    def __init__(self, command=None):
+        """
+        Args:
+            command: Decoder command line reading the container on stdin and
+                writing mono s16le 16 kHz to stdout (default: COMMAND)
+        """
+        try:
+            self._proc = subprocess.Popen(
+                command or self.COMMAND,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            )
+        except FileNotFoundError:
+            raise RuntimeError(
+                "FFmpeg is required to process this audio format. "
+                "Install FFmpeg and add it to your system PATH."
+            )
+        self._pcm = bytearray()
+        self._errors = bytearray()
+        self._decoded_any = False
+        self._lock = threading.Lock()
+        self._readers = [
+            threading.Thread(target=self._drain, args=(self._proc.stdout, self._pcm), daemon=True),
+            threading.Thread(target=self._drain, args=(self._proc.stderr, self._errors), daemon=True),
+        ]
+        for reader in self._readers:
+            reader.start()
+
+    def _drain(self, pipe, buffer: bytearray):
+        fd = pipe.fileno()
+        while True:
+            data = os.read(fd, 65536)
+            if not data:
+                return
+            with self._lock:
+                buffer.extend(data)
+
+    def _error(self) -> str:
+        with self._lock:
+            return self._errors.decode(errors="ignore").strip()
+
+    def write(self, data: bytes):
+        """Feed the next chunk of the container"""
+        try:
+            self._proc.stdin.write(data)
+            self._proc.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            raise RuntimeError(f"FFmpeg decode failed: {self._error() or 'decoder exited'}")
+
+    def read(self) -> np.ndarray:
+        """Samples decoded since the last read (mono float32 16 kHz)"""
+        with self._lock:
+            size = len(self._pcm) - len(self._pcm) % 2
+            data = bytes(self._pcm[:size])
+            del self._pcm[:size]
+        if data:
+            self._decoded_any = True
+        return np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+
+    def close(self) -> np.ndarray:
+        """End the stream; returns the samples not read yet"""
+        try:
+            self._proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._proc.wait()
+        self._release()
+        samples = self.read()
+        # A stream cut mid-cluster makes FFmpeg complain but still yields the
+        # samples decoded so far, so only fail when nothing came out at all
+        if not self._decoded_any and self._proc.returncode != 0:
+            raise RuntimeError(f"FFmpeg decode failed: {self._error()}")
+        return samples
+
+    def abort(self):
+        """Stop the decoder without waiting for the rest of the stream"""
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._proc.wait()
+        self._release()
+
+    def _release(self):
+        # The process has exited: readers hit EOF, pipes can go
+        for reader in self._readers:
+            reader.join()
+        for pipe in (self._proc.stdin, self._proc.stdout, self._proc.stderr):
+            try:
+                pipe.close()
+            except OSError:
+                pass
@@ -0,0 +1,288 @@
+"""
+Dynamic micro-batching for Whisper
+
+When several candidates finish answers at the same time, each transcription
+would run its own batch-size-1 encoder/decoder pass. ``MicroBatcher``
+collects pending items from concurrent callers for up to ``max_wait_ms``
+(or until ``max_batch_size`` is reached), runs them as one batch and hands
+each caller its own result. ``BatchedWhisperSTT`` uses it to batch 30-second
+mel segments through ``whisper.decode``, with the quality checks of
+``model.transcribe`` (temperature fallback, no-speech filtering) applied
+per segment.
+"""
+
+import os
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Callable, Hashable, List
+
+from stt import stt_service
+from stt.stt_service import WhisperLocalSTT
+
+SAMPLE_RATE = 16000
+SEGMENT_SECONDS = 30
+
+# model.transcribe's defaults: a segment is re-decoded at the next
+# temperature if its text is repetitive or unlikely, and dropped as silence
+# if it is probably not speech and unlikely
+TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+
+def is_silence(result) -> bool:
+    """Whether model.transcribe would skip this decoded segment"""
+    return result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD
+
+
+def needs_fallback(result) -> bool:
+    """Whether model.transcribe would re-decode this segment hotter"""
+    if is_silence(result):
+        return False
+    return (
+        result.compression_ratio > COMPRESSION_RATIO_THRESHOLD
+        or result.avg_logprob < LOGPROB_THRESHOLD
+    )
+
+
+def decode_with_fallback(decode: Callable[[List, float], List], items: List, temperatures=TEMPERATURES) -> List:
+    """
+    Decode ``items`` at the first temperature, then re-decode (as one
+    smaller batch) only those that need a fallback, until each passes or
+    the temperatures run out - the last attempt is kept, like transcribe
+
+    Args:
+        decode: ``decode(items, temperature)`` returning one result per item
+    """
+    results = [None] * len(items)
+    pending = list(range(len(items)))
+    for temperature in temperatures:
+        decoded = decode([items[i] for i in pending], temperature)
+        for index, result in zip(pending, decoded):
+            results[index] = result
+        pending = [index for index in pending if needs_fallback(results[index])]
+        if not pending:
+            break
+    return results
+
+
+# Batchers whose scheduler must be restarted in a forked child
+_batchers = weakref.WeakSet()
+
+
+def _reset_batchers_after_fork():
+    for batcher in list(_batchers):
+        batcher._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_batchers_after_fork)
+
+
+class MicroBatcher:
+    """
+    Thread-safe batching scheduler
+
+    Items submitted with the same ``group`` key are batched together; items
+    from different groups (e.g. different decoding options) never mix.
+
+    The scheduler thread starts on the first submit in each process: a
+    batcher built before a fork (STT worker pool, prefork launcher) gets
+    its own thread in every child instead of one that didn't survive.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[Hashable, List], List],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        name: str = "micro-batcher",
+    ):
+        """
+        Args:
+            run_batch: Called as ``run_batch(group, items)``; must return one
+                result per item, in order
+            max_batch_size: Largest batch handed to ``run_batch``
+            max_wait_ms: How long the first item of a batch waits for company
+            name: Scheduler thread name
+        """
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+        self.batches = 0
+        self.items = 0
+
+        self._reset()
+        _batchers.add(self)
+
+    def _reset(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._loop, args=(self._queue,), name=self.name, daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def submit(self, item, group: Hashable = None) -> Future:
+        self._ensure_started()
+        future = Future()
+        self._queue.put((group, item, future))
+        return future
+
+    def _collect(self, pending: queue.Queue):
+        batch = [pending.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self, queue_: queue.Queue):
+        while True:
+            pending = self._collect(queue_)
+
+            groups = {}
+            for group, item, future in pending:
+                groups.setdefault(group, []).append((item, future))
+
+            for group, entries in groups.items():
+                self.batches += 1
+                self.items += len(entries)
+                try:
+                    results = self.run_batch(group, [item for item, _ in entries])
+                    if len(results) != len(entries):
+                        raise RuntimeError(f"Batch returned {len(results)} results for {len(entries)} items")
+                except Exception as e:
+                    for _, future in entries:
+                        future.set_exception(e)
+                    continue
+                for (_, future), result in zip(entries, results):
+                    future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
+
+
+class BatchedWhisperSTT(WhisperLocalSTT):
+    """
+    Local Whisper with cross-request micro-batching (FREE)
+
+    In-memory audio is cut into 30-second segments whose mel spectrograms
+    are decoded in shared batches. Segments are decoded independently (no
+    seek/timestamp realignment), so a word straddling a 30 s boundary can
+    be clipped; answers under 30 s are unaffected. File paths fall back to
+    the regular unbatched path.
+    """
+
+    def __init__(
+        self,
+        model_size: str = "small",
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        result_timeout: float = 300.0,
+    ):
+        """
+        Args:
+            model_size: Whisper model size (tiny, base, small, medium, large)
+            max_batch_size: Maximum segments per encoder/decoder pass
+            max_wait_ms: How long a segment waits for others to batch with
+            result_timeout: Seconds a caller waits for its segments
+        """
+        super().__init__(model_size=model_size)
+        self.result_timeout = result_timeout
+        self.batcher = MicroBatcher(
+            self._decode_batch,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            name="whisper-batcher",
+        )
+
+    def _decode_batch(self, group, mels):
+        import torch
+        import whisper
+
+        language, prompt = group
+        model = self._load_model()
+
+        def decode(batch_mels, temperature):
+            options = whisper.DecodingOptions(
+                language=language,
+                prompt=prompt,
+                temperature=temperature,
+                # Sampled fallbacks keep the best of 5, as transcribe does
+                best_of=5 if temperature > 0 else None,
+                fp16=False,
+                without_timestamps=True,
+            )
+            batch = torch.stack(batch_mels).to(model.device)
+            # Shares the model with the unbatched file-path fallback
+            with stt_service._inference_lock:
+                return whisper.decode(model, batch, options)
+
+        return decode_with_fallback(decode, mels)
+
+    def _run_model(self, audio, initial_prompt: str = None, language: str = None) -> dict:
+        import numpy as np
+
+        if not isinstance(audio, np.ndarray):
+            # Serialized with the batches by the inference lock
+            return super()._run_model(audio, initial_prompt=initial_prompt, language=language)
+
+        import whisper
+
+        model = self._load_model()
+        segment_len = SEGMENT_SECONDS * SAMPLE_RATE
+        offsets = list(range(0, max(len(audio), 1), segment_len))
+
+        futures = []
+        for offset in offsets:
+            chunk = whisper.pad_or_trim(audio[offset:offset + segment_len])
+            mel = whisper.log_mel_spectrogram(chunk, n_mels=model.dims.n_mels)
+            futures.append(self.batcher.submit(mel, group=(language, initial_prompt)))
+
+        segments = []
+        detected = None
+        deadline = time.monotonic() + self.result_timeout
+        for offset, future in zip(offsets, futures):
+            try:
+                decoded = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                raise TimeoutError(f"Batched transcription exceeded {self.result_timeout:.0f}s")
+            detected = detected or decoded.language
+            if is_silence(decoded):
+                # Mostly padding or silence: transcribe would drop it
+                continue
+            segments.append({
+                'start': offset / SAMPLE_RATE,
+                'end': min(offset + segment_len, len(audio)) / SAMPLE_RATE,
+                'text': decoded.text.strip()
+            })
+
+        return {
+            'text': " ".join(seg['text'] for seg in segments if seg['text']),
+            'language': detected or language or 'unknown',
+            'segments': segments
+        }
+
+    def get_provider_name(self) -> str:
+        return f"Whisper Local batched ({self.model_size}, batch<={self.batcher.max_batch_size})"
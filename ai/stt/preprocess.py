@@ -0,0 +1,80 @@
+"""
+Audio preprocessing for Whisper input
+
+Turns decoded audio of any common dtype / channel layout / sample rate into
+the mono float32 16 kHz array Whisper expects:
+
+- dtype-aware normalization to [-1, 1] (uint8, int16, int32, float)
+- float32 downmixing (no float64 temporaries)
+- rational polyphase resampling (``resample_poly``) with the anti-aliasing
+  filter designed once per (up, down) ratio and reused
+"""
+
+from functools import lru_cache
+from math import gcd
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# Kaiser window as used by scipy's resample_poly default
+_FILTER_WINDOW = ("kaiser", 5.0)
+
+
+def normalize(samples: np.ndarray) -> np.ndarray:
+    """Convert integer or float samples to float32 in [-1, 1]"""
+    dtype = samples.dtype
+    if dtype == np.float32:
+        return samples
+    if dtype.kind == "f":
+        return samples.astype(np.float32)
+    if dtype == np.uint8:
+        # 8-bit WAV is unsigned with a 128 midpoint
+        out = samples.astype(np.float32)
+        out -= 128.0
+        out *= 1.0 / 128.0
+        return out
+    if dtype.kind == "i":
+        scale = 1.0 / float(2 ** (8 * dtype.itemsize - 1))
+        out = samples.astype(np.float32)
+        out *= scale
+        return out
+    raise ValueError(f"Unsupported sample dtype: {dtype}")
+
+
+def downmix(samples: np.ndarray) -> np.ndarray:
+    """Average (frames, channels) float32 audio to mono float32"""
+    if samples.ndim == 1:
+        return samples
+    if samples.shape[1] == 1:
+        return samples[:, 0]
+    return samples.mean(axis=1, dtype=np.float32)
+
+
+@lru_cache(maxsize=32)
+def _design_filter(up: int, down: int) -> np.ndarray:
+    from scipy.signal import firwin
+
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    taps = firwin(2 * half_len + 1, 1.0 / max_rate, window=_FILTER_WINDOW)
+    taps.setflags(write=False)
+    return taps
+
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Polyphase resample mono float32 audio between integer sample rates"""
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+
+    from scipy.signal import resample_poly
+
+    g = gcd(source_rate, target_rate)
+    up, down = target_rate // g, source_rate // g
+    out = resample_poly(samples, up, down, window=_design_filter(up, down))
+    return out.astype(np.float32, copy=False)
+
+
+def to_model_input(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Normalize, downmix and resample to mono float32 16 kHz"""
+    return resample(downmix(normalize(samples)), sample_rate)
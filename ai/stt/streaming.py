@@ -0,0 +1,191 @@
+"""
+Incremental (streaming) transcription
+
+Audio arrives in small chunks while the candidate is still speaking. Every
+time ``window_seconds`` of new audio has accumulated, that window (plus
+``overlap_seconds`` of the previous one for context) is transcribed and the
+text is appended to the running transcript. When the stream ends only the
+short tail still has to be transcribed, so the final transcript is ready
+shortly after speech stops instead of after a full-length Whisper pass.
+
+Only the audio a later window can still need is buffered, and container
+input is decoded by one FFmpeg process per stream, so the cost per chunk
+stays flat however long the candidate speaks.
+"""
+
+import re
+from typing import Optional
+
+import numpy as np
+
+from stt.audio_io import SAMPLE_RATE, FFmpegStreamDecoder
+from stt.preprocess import to_model_input
+
+INPUT_FORMATS = ("pcm_s16le", "pcm_f32le", "webm")
+
+_WORD_NORMALIZE = re.compile(r"[^\w']+")
+
+
+def merge_overlap(previous: str, new: str, max_words: int = 12) -> str:
+    """
+    Drop the words at the start of ``new`` that repeat the end of ``previous``
+
+    Consecutive windows overlap in time, so Whisper usually transcribes the
+    overlapping audio twice.
+    """
+    new_words = new.split()
+    if not previous or not new_words:
+        return new.strip()
+
+    prev_words = previous.split()
+    norm = lambda w: _WORD_NORMALIZE.sub("", w.lower())
+    prev_tail = [norm(w) for w in prev_words[-max_words:]]
+    new_head = [norm(w) for w in new_words[:max_words]]
+
+    for k in range(min(len(prev_tail), len(new_head)), 0, -1):
+        if prev_tail[-k:] == new_head[:k]:
+            return " ".join(new_words[k:])
+    return new.strip()
+
+
+def supports_streaming(stt) -> bool:
+    """Whether ``stt`` can transcribe in-memory windows (local models only)"""
+    return callable(getattr(stt, "transcribe_samples", None))
+
+
+class StreamingTranscriber:
+    """Per-connection state for windowed incremental transcription"""
+
+    def __init__(
+        self,
+        stt,
+        input_format: str = "pcm_s16le",
+        sample_rate: int = SAMPLE_RATE,
+        window_seconds: float = 8.0,
+        overlap_seconds: float = 1.0,
+        language: Optional[str] = "en",
+    ):
+        """
+        Args:
+            stt: STT service exposing ``transcribe_samples(audio, initial_prompt=None)``
+            input_format: 'pcm_s16le', 'pcm_f32le' (raw mono) or 'webm' (container chunks)
+            sample_rate: Sample rate of raw PCM input
+            window_seconds: New audio per incremental Whisper pass
+            overlap_seconds: Audio re-fed from the previous window for context
+            language: Language of every window, like the upload path uses
+                (None = auto-detect, which can flip on short windows)
+        """
+        if input_format not in INPUT_FORMATS:
+            raise ValueError(f"Unknown input format: {input_format}. Available: {list(INPUT_FORMATS)}")
+        if overlap_seconds >= window_seconds:
+            raise ValueError("overlap_seconds must be smaller than window_seconds")
+        if not supports_streaming(stt):
+            raise ValueError(f"{stt.get_provider_name()} does not support streaming transcription")
+
+        self.stt = stt
+        self.input_format = input_format
+        self.sample_rate = sample_rate
+        self.window = int(window_seconds * SAMPLE_RATE)
+        self.overlap = int(overlap_seconds * SAMPLE_RATE)
+
+        self.forced_language = language
+        self.transcript = ""
+        self.language = language or "unknown"
+        self._committed = 0  # samples already covered by the transcript
+        # Samples from stream position _offset on; older audio is dropped
+        # once no window reads it again
+        self._pcm = np.zeros(0, dtype=np.float32)
+        self._offset = 0
+        self._decoder = None
+        # Trailing bytes of a PCM chunk that split a sample
+        self._leftover = b""
+
+    def _to_samples(self, data: bytes) -> np.ndarray:
+        dtype = np.dtype(np.float32 if self.input_format == "pcm_f32le" else np.int16)
+        # Chunk boundaries need not fall on a sample: carry the partial one over
+        if self._leftover:
+            data = self._leftover + data
+        usable = len(data) - len(data) % dtype.itemsize
+        self._leftover = data[usable:]
+        # Chunks are resampled independently; the tiny edge effect at chunk
+        # boundaries is inaudible to Whisper
+        return to_model_input(np.frombuffer(data, dtype=dtype, count=usable // dtype.itemsize), self.sample_rate)
+
+    @property
+    def _end(self) -> int:
+        """Stream position just past the last buffered sample"""
+        return self._offset + len(self._pcm)
+
+    def _append(self, data: bytes):
+        if self.input_format == "webm":
+            # Container chunks are not decodable on their own: one FFmpeg
+            # process takes the whole stream and yields PCM as it goes
+            if self._decoder is None:
+                self._decoder = FFmpegStreamDecoder()
+            self._decoder.write(data)
+            samples = self._decoder.read()
+        else:
+            samples = self._to_samples(data)
+        if len(samples):
+            self._pcm = np.concatenate([self._pcm, samples])
+
+    def _transcribe_range(self, end: int) -> str:
+        start = max(0, self._committed - self.overlap)
+        result = self.stt.transcribe_samples(
+            self._pcm[start - self._offset:end - self._offset],
+            initial_prompt=self.transcript[-200:] or None,
+            language=self.forced_language,
+        )
+        if result.get("language"):
+            self.language = result["language"]
+
+        text = merge_overlap(self.transcript, result["text"])
+        if text:
+            self.transcript = f"{self.transcript} {text}".strip()
+        self._committed = end
+
+        # The next window re-reads only the overlap
+        keep_from = max(self._offset, end - self.overlap)
+        self._pcm = self._pcm[keep_from - self._offset:]
+        self._offset = keep_from
+        return text
+
+    def feed(self, data: bytes) -> Optional[str]:
+        """
+        Add an audio chunk; transcribe any completed windows
+
+        Returns:
+            The running transcript if it changed, otherwise None
+        """
+        self._append(data)
+
+        changed = False
+        while self._end - self._committed >= self.window:
+            self._transcribe_range(self._committed + self.window)
+            changed = True
+        return self.transcript if changed else None
+
+    def finish(self) -> dict:
+        """Transcribe the remaining tail and return the final result"""
+        if self._decoder is not None:
+            decoder, self._decoder = self._decoder, None
+            samples = decoder.close()
+            if len(samples):
+                self._pcm = np.concatenate([self._pcm, samples])
+
+        # Anything shorter than ~0.1 s is just the end of the last word
+        if self._end - self._committed > SAMPLE_RATE // 10:
+            self._transcribe_range(self._end)
+
+        return {
+            'text': self.transcript,
+            'language': self.language,
+            'confidence': None,
+            'duration': self._end / SAMPLE_RATE,
+        }
+
+    def close(self):
+        """Release the decoder of a stream that ends without finish()"""
+        if self._decoder is not None:
+            decoder, self._decoder = self._decoder, None
+            decoder.abort()
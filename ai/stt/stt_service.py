@@ -5,20 +5,45 @@ This module provides an abstract interface for STT services,
 allowing easy switching between different providers (Whisper local, API, Google, etc.)
 """
 
+import os
+import threading
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+# PyTorch Whisper weights loaded before the prefork launcher forks its
+# workers (model_size -> model); every worker's service reuses them, so the
+# weights stay shared copy-on-write instead of being loaded per process
+_preloaded_models = {}
+
+# One PyTorch Whisper inference at a time per process: every decode
+# installs kv-cache hooks on the (shared) model's modules, so concurrent
+# decodes on one model corrupt each other's cache
+_inference_lock = threading.Lock()
+
+
+def _reset_inference_lock():
+    # A lock held by another thread at fork time would stay held in the child
+    global _inference_lock
+    _inference_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_inference_lock)
+
 
 class STTService(ABC):
     """Abstract base class for Speech-to-Text services"""
     
     @abstractmethod
-    def transcribe(self, audio_file_path: str) -> dict:
+    def transcribe(self, audio, vad: bool = False) -> dict:
         """
-        Transcribe audio file to text
+        Transcribe audio to text
         
         Args:
-            audio_file_path: Path to audio/video file
+            audio: Path to audio/video file, the file's raw bytes, or a
+                mono float32 16 kHz NumPy array
+            vad: Drop silence before inference (providers that can't
+                may ignore it)
             
         Returns:
             dict with:
@@ -33,6 +58,10 @@ class STTService(ABC):
         """Return the name of the STT provider"""
         pass
 
+    def warm_up(self):
+        """Load models / open connections ahead of the first request"""
+        pass
+
 
 class WhisperLocalSTT(STTService):
     """
@@ -52,6 +81,8 @@ class WhisperLocalSTT(STTService):
 
     def _load_model(self):
         """Lazy load the Whisper model (loads only when first used)"""
+        if self._model is None and self.model_size in _preloaded_models:
+            self._model = _preloaded_models[self.model_size]
         if self._model is None:
             try:
                 import whisper
@@ -64,79 +95,89 @@ class WhisperLocalSTT(STTService):
                 )
         return self._model
 
-    def transcribe(self, audio_file_path: str) -> dict:
+    def _run_model(self, audio, initial_prompt: str = None, language: str = None) -> dict:
+        """
+        Run the model on samples or a file path
+
+        Returns:
+            dict with text, language and segments (start/end/text)
+        """
+        model = self._load_model()
+        with _inference_lock:
+            result = model.transcribe(
+                audio,
+                fp16=False,
+                temperature=0,
+                beam_size=1,
+                best_of=1,
+                initial_prompt=initial_prompt,
+                language=language
+            )
+        return {
+            'text': result['text'].strip(),
+            'language': result.get('language', 'unknown'),
+            'segments': [
+                {'start': seg['start'], 'end': seg['end'], 'text': seg['text'].strip()}
+                for seg in result.get('segments', [])
+            ]
+        }
+
+    def transcribe(self, audio, vad: bool = False) -> dict:
         """
         Transcribe audio using local Whisper model
+
+        Accepts a file path, raw file bytes or a float32 16 kHz sample array.
+        Bytes and WAV files are decoded in memory; other file formats are
+        handed to Whisper's FFmpeg loader. With ``vad=True`` silence is
+        trimmed first and the result also carries ``speech_stats``.
         """
-        from pathlib import Path
         import numpy as np
+        from stt.audio_io import decode_audio, is_wav
 
-        audio_path = Path(audio_file_path)
+        if isinstance(audio, np.ndarray):
+            return self.transcribe_samples(audio, vad=vad)
 
-        if not audio_path.exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+        if isinstance(audio, (bytes, bytearray, memoryview)):
+            data = bytes(audio)
+            print(f"🎤 Transcribing in-memory audio ({len(data)} bytes)")
+            print(f"   Using Whisper model: {self.model_size}")
+            try:
+                samples = decode_audio(data)
+            except RuntimeError:
+                raise
+            except Exception as e:
+                raise RuntimeError(f"Could not decode audio: {e}")
+            print(f"   Audio loaded: {len(samples)/16000:.2f} seconds")
+            # Non-WAV uploads keep the English-only setting of the file path
+            return self.transcribe_samples(samples, language=None if is_wav(data) else "en", vad=vad)
 
-        model = self._load_model()
+        audio_path = Path(audio)
+
+        if not audio_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio}")
 
         print(f"🎤 Transcribing audio: {audio_path.name} ({audio_path.stat().st_size} bytes)")
         print(f"   Using Whisper model: {self.model_size}")
 
-        try:
-            # ===============================
-            # WAV FILE HANDLING (no FFmpeg)
-            # ===============================
-            if audio_path.suffix.lower() in ['.wav', '.wave']:
-                from scipy.io import wavfile
-                from scipy import signal
-
-                sample_rate, audio_data = wavfile.read(str(audio_path))
-
-                # Convert stereo → mono
-                if len(audio_data.shape) > 1:
-                    audio_data = audio_data.mean(axis=1)
-
-                # Normalize
-                if audio_data.dtype == np.int16:
-                    audio_data = audio_data.astype(np.float32) / 32768.0
-                elif audio_data.dtype == np.int32:
-                    audio_data = audio_data.astype(np.float32) / 2147483648.0
-
-                # Resample to 16kHz
-                if sample_rate != 16000:
-                    print(f"   Resampling from {sample_rate}Hz to 16000Hz...")
-                    num_samples = int(len(audio_data) * 16000 / sample_rate)
-                    audio_data = signal.resample(audio_data, num_samples)
-
-                print(f"   Audio loaded: {len(audio_data)/16000:.2f} seconds")
-
-                # 🔥 IMPROVED TRANSCRIPTION SETTINGS
-                result = model.transcribe(
-                    audio_data,
-                    fp16=False,
-                    temperature=0,
-                    beam_size=1,
-                    best_of=1
-            )
+        # ===============================
+        # WAV FILE HANDLING (no FFmpeg)
+        # ===============================
+        if audio_path.suffix.lower() in ['.wav', '.wave']:
+            samples = decode_audio(audio_path.read_bytes())
+            print(f"   Audio loaded: {len(samples)/16000:.2f} seconds")
+            return self.transcribe_samples(samples, vad=vad)
 
-            # ===============================
-            # OTHER FORMATS (requires FFmpeg)
-            # ===============================
-            else:
-                # For other formats, use Whisper's built-in loader (requires FFmpeg)
-                result = model.transcribe(
-                    audio_path,
-                    language="en",
-                    fp16=False,
-                    temperature=0,
-                    verbose=True
-            )
-            
-            return {
-                'text': result['text'].strip(),
-                'language': result.get('language', 'unknown'),
-                'confidence': None
-            }
+        if vad:
+            # VAD needs samples, so decode through the FFmpeg pipe ourselves
+            samples = decode_audio(audio_path.read_bytes())
+            return self.transcribe_samples(samples, language="en", vad=True)
 
+        # ===============================
+        # OTHER FORMATS (requires FFmpeg)
+        # ===============================
+        try:
+            # For other formats, let the backend's own loader read the file
+            result = self._run_model(str(audio_path), language="en")
         except Exception as e:
             error_msg = str(e)
             print(f"❌ Whisper transcription failed: {error_msg}")
@@ -149,10 +190,146 @@ class WhisperLocalSTT(STTService):
             else:
                 raise RuntimeError(f"Whisper transcription failed: {error_msg}")
 
+        return {
+            'text': result['text'],
+            'language': result['language'],
+            'confidence': None
+        }
+
+    def warm_up(self):
+        """Load the model and run one dummy inference to warm the kernels"""
+        import numpy as np
+
+        self._load_model()
+        self.transcribe_samples(np.zeros(16000, dtype=np.float32))
+
+    def transcribe_samples(
+        self,
+        audio,
+        initial_prompt: str = None,
+        language: str = None,
+        vad: bool = False
+    ) -> dict:
+        """
+        Transcribe an in-memory mono float32 16 kHz sample array
+
+        Args:
+            audio: NumPy float32 samples in [-1, 1]
+            initial_prompt: Preceding transcript, keeps wording consistent
+                across streaming windows
+            language: Force a language (None = auto-detect)
+            vad: Trim silence before inference; segment timestamps are
+                mapped back to the original audio
+        """
+        trimmed = None
+        if vad:
+            from stt.vad import trim_silence
+            trimmed = trim_silence(audio)
+            print(f"   VAD: {len(audio)/16000:.2f}s -> {len(trimmed.samples)/16000:.2f}s of audio")
+            audio = trimmed.samples
+
+        try:
+            result = self._run_model(audio, initial_prompt=initial_prompt, language=language)
+        except Exception as e:
+            print(f"❌ Whisper transcription failed: {e}")
+            raise RuntimeError(f"Whisper transcription failed: {e}")
+
+        output = {
+            'text': result['text'],
+            'language': result['language'],
+            'confidence': None
+        }
+        if trimmed is not None:
+            output['segments'] = [
+                {
+                    'start': round(trimmed.to_original(seg['start']), 2),
+                    'end': round(trimmed.to_original(seg['end']), 2),
+                    'text': seg['text']
+                }
+                for seg in result['segments']
+            ]
+            output['speech_stats'] = trimmed.speech_stats()
+        return output
+
     def get_provider_name(self) -> str:
         return f"Whisper Local ({self.model_size})"
 
 
+class FasterWhisperSTT(WhisperLocalSTT):
+    """
+    Quantized CPU Whisper (FREE)
+    Runs int8 Whisper weights through CTranslate2 via faster-whisper.
+    Same transcribe() contract as WhisperLocalSTT, at a fraction of the
+    CPU cost of fp32 PyTorch inference.
+    """
+
+    def __init__(
+        self,
+        model_size: str = "small",
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+    ):
+        """
+        Initialize faster-whisper STT
+
+        Args:
+            model_size: Whisper model size (tiny, base, small, medium, large-v3)
+            compute_type: CTranslate2 quantization (int8, int8_float32, float32)
+            cpu_threads: Intra-op threads per transcription (0 = CTranslate2 default)
+            num_workers: Inter-op parallelism - transcriptions that can run
+                concurrently on one model instance
+        """
+        super().__init__(model_size=model_size)
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+
+    def _load_model(self):
+        """Lazy load the CTranslate2 model (loads only when first used)"""
+        if self._model is None:
+            try:
+                from faster_whisper import WhisperModel
+            except ImportError:
+                raise RuntimeError(
+                    "faster-whisper not installed. Install with: pip install faster-whisper"
+                )
+            print(f"Loading faster-whisper '{self.model_size}' ({self.compute_type}) model...")
+            self._model = WhisperModel(
+                self.model_size,
+                device="cpu",
+                compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads,
+                num_workers=self.num_workers,
+            )
+            print(f"✅ faster-whisper model loaded successfully")
+        return self._model
+
+    def _run_model(self, audio, initial_prompt: str = None, language: str = None) -> dict:
+        model = self._load_model()
+        segments, info = model.transcribe(
+            audio,
+            beam_size=1,
+            best_of=1,
+            temperature=0,
+            initial_prompt=initial_prompt,
+            language=language
+        )
+        # segments is a lazy generator - decoding happens while iterating
+        segments = [
+            {'start': seg.start, 'end': seg.end, 'text': seg.text.strip()}
+            for seg in segments
+        ]
+        return {
+            'text': " ".join(seg['text'] for seg in segments if seg['text']),
+            'language': info.language or 'unknown',
+            'segments': segments
+        }
+
+    def get_provider_name(self) -> str:
+        return f"faster-whisper ({self.model_size}, {self.compute_type})"
+
+
 class WhisperAPISTT(STTService):
     """
     OpenAI Whisper API implementation (PAID)
@@ -171,22 +348,31 @@ class WhisperAPISTT(STTService):
         if not self.api_key:
             raise ValueError("OpenAI API key required for Whisper API")
     
-    def transcribe(self, audio_file_path: str) -> dict:
+    def transcribe(self, audio, vad: bool = False) -> dict:
         """
         Transcribe audio using OpenAI Whisper API
         
         Args:
-            audio_file_path: Path to audio file
+            audio: Path to audio file or the file's raw bytes
+            vad: Ignored (the API bills by duration, not by compute)
             
         Returns:
             dict with text and language
         """
         try:
+            import io
             import openai
             openai.api_key = self.api_key
-            
-            with open(audio_file_path, 'rb') as audio_file:
+
+            if isinstance(audio, (bytes, bytearray, memoryview)):
+                from stt.audio_io import is_wav
+                audio_file = io.BytesIO(bytes(audio))
+                # The API picks the decoder from the file name
+                audio_file.name = "audio.wav" if is_wav(audio_file.getvalue()) else "audio.webm"
                 response = openai.Audio.transcribe("whisper-1", audio_file)
+            else:
+                with open(audio, 'rb') as audio_file:
+                    response = openai.Audio.transcribe("whisper-1", audio_file)
             
             return {
                 'text': response['text'].strip(),
@@ -206,14 +392,19 @@ def get_stt_service(provider: str = "whisper_local", **kwargs) -> STTService:
     Factory function to create STT service instance
     
     Args:
-        provider: STT provider name ('whisper_local', 'whisper_api')
+        provider: STT provider name ('whisper_local', 'whisper_batched',
+            'faster_whisper', 'whisper_api')
         **kwargs: Provider-specific arguments
         
     Returns:
         STTService instance
     """
+    from stt.batching import BatchedWhisperSTT
+
     providers = {
         'whisper_local': WhisperLocalSTT,
+        'whisper_batched': BatchedWhisperSTT,
+        'faster_whisper': FasterWhisperSTT,
         'whisper_api': WhisperAPISTT,
     }
     
@@ -221,3 +412,22 @@ def get_stt_service(provider: str = "whisper_local", **kwargs) -> STTService:
         raise ValueError(f"Unknown STT provider: {provider}. Available: {list(providers.keys())}")
     
     return providers[provider](**kwargs)
+
+
+def preload_model(provider: str = "whisper_local", model_size: str = "small") -> bool:
+    """
+    Load the provider's weights into this process ahead of time
+
+    Meant for a master process that then forks workers (runtime/prefork.py).
+    Only the PyTorch Whisper providers are preloaded: faster-whisper's
+    CTranslate2 runtime keeps native threads that don't survive a fork, and
+    the API provider has no weights.
+
+    Returns:
+        True if the weights are now loaded in this process
+    """
+    if provider not in ("whisper_local", "whisper_batched"):
+        return False
+    if model_size not in _preloaded_models:
+        _preloaded_models[model_size] = WhisperLocalSTT(model_size)._load_model()
+    return True
@@ -0,0 +1,164 @@
+"""
+Energy-based voice activity detection (CPU, NumPy only)
+
+Whisper's cost grows with audio length, and recorded answers often start and
+end with silence and contain long pauses. ``trim_silence`` drops the silent
+stretches before inference and keeps a mapping so timestamps in the trimmed
+audio can be translated back to the original recording. The detected pauses
+double as speech-pace statistics.
+"""
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def _runs(mask: np.ndarray):
+    """(start, end) index pairs of consecutive True values"""
+    if not mask.any():
+        return []
+    padded = np.concatenate([[False], mask, [False]])
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return list(zip(edges[0::2], edges[1::2]))
+
+
+def detect_speech(
+    samples: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    frame_ms: int = 30,
+    threshold_db: float = None,
+    min_speech_ms: int = 150,
+    min_silence_ms: int = 300,
+    pad_ms: int = 150,
+):
+    """
+    Find speech regions in mono float32 audio
+
+    Args:
+        samples: Mono float32 samples in [-1, 1]
+        sample_rate: Sample rate of ``samples``
+        frame_ms: Analysis frame length
+        threshold_db: Energy threshold in dBFS (None = adapt to noise floor)
+        min_speech_ms: Shorter bursts are treated as noise
+        min_silence_ms: Shorter gaps are treated as part of speech
+        pad_ms: Context kept around each speech region
+
+    Returns:
+        List of (start, end) sample offsets, sorted and non-overlapping
+    """
+    frame = max(1, sample_rate * frame_ms // 1000)
+    n_frames = len(samples) // frame
+    if n_frames == 0:
+        return []
+
+    frames = samples[:n_frames * frame].reshape(n_frames, frame)
+    energy_db = 10.0 * np.log10(np.einsum("ij,ij->i", frames, frames) / frame + 1e-10)
+
+    if threshold_db is None:
+        # 10 dB above the noise floor, never below -50 dBFS, and never so
+        # high that a clip with hardly any silence loses its quiet words
+        noise_floor = np.percentile(energy_db, 10)
+        threshold_db = min(max(noise_floor + 10.0, -50.0), energy_db.max() - 20.0)
+        threshold_db = max(threshold_db, -50.0)
+
+    voiced = energy_db > threshold_db
+
+    # Fill short gaps, then drop short bursts
+    min_silence = max(1, min_silence_ms // frame_ms)
+    for start, end in _runs(~voiced):
+        if end - start < min_silence and start > 0 and end < n_frames:
+            voiced[start:end] = True
+    min_speech = max(1, min_speech_ms // frame_ms)
+    for start, end in _runs(voiced):
+        if end - start < min_speech:
+            voiced[start:end] = False
+
+    pad = sample_rate * pad_ms // 1000
+    segments = []
+    for start, end in _runs(voiced):
+        s = max(0, int(start) * frame - pad)
+        e = len(samples) if end == n_frames else min(len(samples), int(end) * frame + pad)
+        if segments and s <= segments[-1][1]:
+            segments[-1] = (segments[-1][0], e)
+        else:
+            segments.append((s, e))
+    return segments
+
+
+class TrimmedAudio:
+    """Speech-only audio plus the mapping back to the original timeline"""
+
+    def __init__(self, samples, segments, original_length, sample_rate=SAMPLE_RATE, gap=0):
+        self.samples = samples
+        self.segments = segments
+        self.original_length = original_length
+        self.sample_rate = sample_rate
+
+        # Where each segment starts inside the trimmed audio
+        starts = []
+        position = 0
+        for start, end in segments:
+            starts.append(position)
+            position += (end - start) + gap
+        self._trimmed_starts = np.array(starts, dtype=np.int64)
+
+    def to_original(self, seconds: float) -> float:
+        """Map a timestamp in the trimmed audio to the original recording"""
+        if not self.segments:
+            return seconds
+        position = int(round(seconds * self.sample_rate))
+        idx = max(0, int(np.searchsorted(self._trimmed_starts, position, side="right")) - 1)
+        start, end = self.segments[idx]
+        original = start + (position - self._trimmed_starts[idx])
+        return min(original, end) / self.sample_rate
+
+    def speech_stats(self, pause_ms: int = 500) -> dict:
+        """Speech vs. silence totals and pause statistics (seconds)"""
+        sr = self.sample_rate
+        duration = self.original_length / sr
+        speech = sum(end - start for start, end in self.segments) / sr
+        pauses = [
+            (self.segments[i + 1][0] - self.segments[i][1]) / sr
+            for i in range(len(self.segments) - 1)
+        ]
+        pauses = [p for p in pauses if p * 1000 >= pause_ms]
+
+        return {
+            "duration": round(duration, 2),
+            "speech_seconds": round(speech, 2),
+            "silence_seconds": round(duration - speech, 2),
+            "speech_ratio": round(speech / duration, 3) if duration else 0.0,
+            "leading_silence": round(self.segments[0][0] / sr, 2) if self.segments else round(duration, 2),
+            "trailing_silence": round((self.original_length - self.segments[-1][1]) / sr, 2) if self.segments else 0.0,
+            "pause_count": len(pauses),
+            "longest_pause": round(max(pauses), 2) if pauses else 0.0,
+            "mean_pause": round(sum(pauses) / len(pauses), 2) if pauses else 0.0,
+        }
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int = SAMPLE_RATE, gap_ms: int = 200, **vad_options) -> TrimmedAudio:
+    """
+    Drop silence from mono float32 audio
+
+    Speech regions are joined with ``gap_ms`` of silence so Whisper still
+    sees a word boundary. If no speech is found the audio is kept as is.
+
+    Args:
+        samples: Mono float32 samples in [-1, 1]
+        sample_rate: Sample rate of ``samples``
+        gap_ms: Silence inserted between kept regions
+        **vad_options: Passed to ``detect_speech``
+    """
+    segments = detect_speech(samples, sample_rate, **vad_options)
+    if not segments:
+        return TrimmedAudio(samples, [(0, len(samples))] if len(samples) else [], len(samples), sample_rate)
+
+    gap = sample_rate * gap_ms // 1000
+    silence = np.zeros(gap, dtype=np.float32)
+    parts = []
+    for i, (start, end) in enumerate(segments):
+        if i:
+            parts.append(silence)
+        parts.append(samples[start:end])
+
+    return TrimmedAudio(np.concatenate(parts), segments, len(samples), sample_rate, gap=gap)
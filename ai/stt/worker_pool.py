@@ -0,0 +1,246 @@
+"""
+Multi-process STT worker pool
+
+A single in-process Whisper model serializes concurrent transcriptions on
+the GIL-bound parts of decoding. This pool runs N worker processes, each
+with its own model. With the 'fork' start method the model is loaded once in
+the parent and inherited copy-on-write, so read-only weights are shared
+between workers instead of being loaded N times.
+
+Each job has a timeout (the worker is killed and replaced if it overruns)
+and every worker is recycled after ``max_jobs_per_worker`` jobs to bound
+memory growth. Replacements start in the background: the request that
+retired a worker returns at once, and later requests go to the workers
+already running.
+"""
+
+import functools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+from stt.stt_service import STTService, get_stt_service
+
+# Longest pause between attempts to start a replacement worker
+MAX_RESPAWN_BACKOFF = 30.0
+
+def _worker_main(conn, factory, preloaded, threads_per_worker):
+    if threads_per_worker:
+        try:
+            import torch
+            torch.set_num_threads(threads_per_worker)
+        except ImportError:
+            pass
+
+    # With fork, ``preloaded`` is the parent's object (not a pickled copy),
+    # so its weights are shared copy-on-write
+    stt = preloaded if preloaded is not None else factory()
+    stt.warm_up()
+    conn.send(("ready", os.getpid()))
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        method, args, kwargs = job
+        try:
+            conn.send(("ok", getattr(stt, method)(*args, **kwargs)))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    def __init__(self, ctx, factory, preloaded, threads_per_worker, start_timeout):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, factory, preloaded, threads_per_worker),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+        if not self.conn.poll(start_timeout):
+            self.kill()
+            raise RuntimeError("STT worker did not start in time")
+        status, self.pid = self.conn.recv()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class STTWorkerPool(STTService):
+    """
+    Process pool that looks like a single STTService
+
+    Calls block the calling thread until a worker is free, so run them from
+    a thread pool sized to at least ``processes`` (the API's 'stt' pool).
+    """
+
+    def __init__(
+        self,
+        provider: str = "whisper_local",
+        processes: int = None,
+        max_jobs_per_worker: int = 200,
+        job_timeout: float = 300.0,
+        threads_per_worker: int = None,
+        preload: bool = True,
+        factory: Optional[Callable[[], STTService]] = None,
+        start_method: str = "fork",
+        start_timeout: float = 600.0,
+        **provider_kwargs,
+    ):
+        """
+        Args:
+            provider: get_stt_service provider name for each worker's model
+            processes: Worker processes (default: CPU count // 4, min 1)
+            max_jobs_per_worker: Recycle a worker after this many jobs
+            job_timeout: Seconds before a job's worker is killed and replaced
+            threads_per_worker: torch intra-op threads per worker
+                (default: CPU count // processes)
+            preload: Load the model in the parent so forked workers share it
+            factory: Zero-arg callable building the STT service (overrides
+                provider/provider_kwargs)
+            start_method: multiprocessing start method ('fork' shares weights)
+            start_timeout: Seconds a new worker may take to load and warm up
+            **provider_kwargs: Passed to get_stt_service (e.g. model_size)
+        """
+        cpus = os.cpu_count() or 1
+        self.processes = processes or max(1, cpus // 4)
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.job_timeout = job_timeout
+        self.threads_per_worker = threads_per_worker or max(1, cpus // self.processes)
+        self.start_timeout = start_timeout
+        self._factory = factory or functools.partial(get_stt_service, provider, **provider_kwargs)
+        self._ctx = multiprocessing.get_context(start_method)
+        self._name = None
+        self._preloaded = None
+
+        if preload and start_method == "fork":
+            # Load weights only - no inference in the parent, since forking
+            # after OpenMP threads have started can deadlock the children
+            self._preloaded = self._factory()
+            load = getattr(self._preloaded, "_load_model", None)
+            if load is not None:
+                load()
+            self._name = self._preloaded.get_provider_name()
+
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers = []
+        self._closed = False
+        for _ in range(self.processes):
+            self._add_worker()
+
+    def _add_worker(self):
+        worker = _Worker(self._ctx, self._factory, self._preloaded, self.threads_per_worker, self.start_timeout)
+        with self._lock:
+            if not self._closed:
+                self._workers.append(worker)
+                self._idle.put(worker)
+                return
+        # Pool closed while the worker was starting
+        worker.stop()
+
+    def _replace(self, worker, kill: bool):
+        """Retire ``worker`` and start its replacement in the background"""
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        threading.Thread(
+            target=self._respawn, args=(worker, kill), name="stt-respawn", daemon=True
+        ).start()
+
+    def _respawn(self, worker, kill: bool):
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+        backoff = 1.0
+        while not self._closed:
+            try:
+                self._add_worker()
+                return
+            except Exception as e:
+                print(f"⚠️ STT worker failed to start ({e}), retrying in {backoff:.0f}s")
+                time.sleep(backoff)
+                backoff = min(MAX_RESPAWN_BACKOFF, backoff * 2)
+
+    def _call(self, method: str, *args, **kwargs):
+        if self._closed:
+            raise RuntimeError("STT worker pool is closed")
+
+        try:
+            worker = self._idle.get(timeout=self.job_timeout)
+        except queue.Empty:
+            raise TimeoutError("No STT worker became available")
+        try:
+            worker.conn.send((method, args, kwargs))
+            if not worker.conn.poll(self.job_timeout):
+                raise TimeoutError(f"Transcription exceeded {self.job_timeout:.0f}s")
+            status, payload = worker.conn.recv()
+        except (TimeoutError, EOFError, OSError) as e:
+            # Worker is stuck or died - replace it
+            self._replace(worker, kill=True)
+            if isinstance(e, TimeoutError):
+                raise
+            raise RuntimeError(f"STT worker crashed: {e}")
+
+        worker.jobs += 1
+        if worker.jobs >= self.max_jobs_per_worker:
+            self._replace(worker, kill=False)
+        else:
+            self._idle.put(worker)
+
+        if status == "error":
+            raise RuntimeError(payload)
+        return payload
+
+    def transcribe(self, audio, vad: bool = False) -> dict:
+        return self._call("transcribe", audio, vad=vad)
+
+    def transcribe_samples(self, audio, initial_prompt: str = None, language: str = None, vad: bool = False) -> dict:
+        return self._call(
+            "transcribe_samples", audio,
+            initial_prompt=initial_prompt, language=language, vad=vad
+        )
+
+    def warm_up(self):
+        # Workers warm themselves up before reporting ready
+        pass
+
+    def get_provider_name(self) -> str:
+        if self._name is None:
+            self._name = self._call("get_provider_name")
+        return f"{self._name} x{self.processes} processes"
+
+    def worker_pids(self):
+        with self._lock:
+            return [w.pid for w in self._workers]
+
+    def close(self):
+        """Stop all workers (replacements still starting stop themselves)"""
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
@@ -0,0 +1,15 @@
+import pytest
+
+from resume_parsing.cache import resume_cache, resume_context_store
+
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_resume_cache(tmp_path_factory):
+    """Keep the shared SQLite resume cache out of the source tree"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("RESUME_CACHE_PATH", str(tmp_path_factory.mktemp("cache") / "resume_cache.sqlite3"))
+        mp.setattr(resume_cache, "_resume_cache", None)
+        mp.setattr(resume_context_store, "_resume_context_store", None)
+        yield
+        if resume_cache._resume_cache is not None:
+            resume_cache._resume_cache.close()
@@ -0,0 +1,117 @@
+import io
+import os
+import shutil
+import struct
+import subprocess
+import wave
+
+import numpy as np
+import pytest
+
+from stt import audio_io
+from stt.audio_io import decode_audio, decode_with_ffmpeg, is_wav, needs_seekable_input, parse_wav
+
+
+def _wav_bytes(samples: np.ndarray, sample_rate: int, channels: int = 1) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(samples.dtype.itemsize)
+        w.setframerate(sample_rate)
+        w.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def test_parse_wav_is_zero_copy():
+    pcm = np.array([0, 16384, -16384, 32767], dtype=np.int16)
+    data = _wav_bytes(pcm, 16000)
+
+    sample_rate, samples = parse_wav(data)
+
+    assert is_wav(data)
+    assert sample_rate == 16000
+    assert np.array_equal(samples, pcm)
+    assert not samples.flags.owndata
+
+
+def test_decode_stereo_wav_to_mono_float32():
+    stereo = np.array([[16384, -16384], [8192, 8192]], dtype=np.int16)
+    samples = decode_audio(_wav_bytes(stereo.reshape(-1), 16000, channels=2))
+
+    assert samples.dtype == np.float32
+    assert np.allclose(samples, [0.0, 0.25])
+
+
+def test_decode_resamples_to_16k():
+    pcm = np.zeros(48000, dtype=np.int16)
+    samples = decode_audio(_wav_bytes(pcm, 48000))
+
+    assert len(samples) == 16000
+
+
+def test_decode_24bit_wav():
+    values = np.array([0, 2 ** 22, -(2 ** 22), 2 ** 23 - 1], dtype=np.int32)
+    packed = values.astype("<i4").view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(3)
+        w.setframerate(16000)
+        w.writeframes(packed)
+
+    sample_rate, samples = parse_wav(buffer.getvalue())
+
+    assert sample_rate == 16000
+    assert np.array_equal(samples >> 8, values)
+    assert np.allclose(decode_audio(buffer.getvalue()), [0.0, 0.5, -0.5, 1.0], atol=1e-6)
+
+
+def _box(kind: bytes, payload: bytes = b"") -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+FTYP = _box(b"ftyp", b"M4A \x00\x00\x00\x00isomM4A ")
+MOOV_AT_END = FTYP + _box(b"free") + _box(b"mdat", b"\x00" * 64) + _box(b"moov", b"\x00" * 16)
+FASTSTART = FTYP + _box(b"moov", b"\x00" * 16) + _box(b"mdat", b"\x00" * 64)
+
+
+def test_moov_at_end_needs_a_seekable_input():
+    assert needs_seekable_input(MOOV_AT_END)
+    assert not needs_seekable_input(FASTSTART)
+    assert not needs_seekable_input(b"\x1aE\xdf\xa3" + b"\x00" * 32)  # WebM
+
+
+def test_moov_at_end_is_decoded_from_a_file(monkeypatch):
+    calls = []
+
+    def fake_run(cmd, input=None, capture_output=False):
+        source = cmd[cmd.index("-i") + 1]
+        calls.append(source)
+        if source != "pipe:0":
+            with open(source, "rb") as f:
+                assert f.read() == MOOV_AT_END
+        pcm = np.array([16384, -16384], dtype=np.int16).tobytes()
+        return subprocess.CompletedProcess(cmd, 0, stdout=pcm, stderr=b"")
+
+    monkeypatch.setattr(audio_io.subprocess, "run", fake_run)
+
+    assert np.allclose(decode_with_ffmpeg(MOOV_AT_END), [0.5, -0.5])
+    assert calls[0] != "pipe:0" and not os.path.exists(calls[0])
+
+    decode_with_ffmpeg(FASTSTART)
+    assert calls[1] == "pipe:0"
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="FFmpeg not installed")
+def test_decode_real_moov_at_end_m4a(tmp_path):
+    path = tmp_path / "tone.m4a"
+    # The mp4 muxer writes the index last unless -movflags +faststart is given
+    subprocess.run(
+        ["ffmpeg", "-nostdin", "-loglevel", "error", "-f", "lavfi",
+         "-i", "sine=frequency=440:duration=1", "-c:a", "aac", str(path)],
+        check=True,
+    )
+    data = path.read_bytes()
+
+    assert needs_seekable_input(data)
+    assert abs(len(decode_audio(data)) - 16000) < 1600
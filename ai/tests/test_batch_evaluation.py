@@ -0,0 +1,89 @@
+import asyncio
+import json
+import os
+
+os.environ.setdefault("HUGGINGFACEHUB_API_TOKEN", "test-token")
+
+from resume_parsing.llm.evaluate_answer import aevaluate_answers_batch
+from resume_parsing.cache.evaluation_cache import EvaluationCache
+
+
+class FakeResp:
+    def __init__(self, content):
+        self.content = content
+
+
+SCORES = {"technical_accuracy": 8, "depth": 6, "clarity": 7, "relevance": 9, "feedback": "ok"}
+
+
+class CountingLLM:
+    def __init__(self):
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if "ITEMS:" in prompt:
+            count = prompt.count("Candidate Answer:")
+            return FakeResp(json.dumps([SCORES] * count))
+        return FakeResp(json.dumps(SCORES))
+
+
+def _items(n):
+    return [{"question": f"Q{i}", "answer": f"A{i}", "state": "resume-based"} for i in range(n)]
+
+
+def test_batch_runs_concurrently_with_cap():
+    llm = CountingLLM()
+    result = asyncio.run(aevaluate_answers_batch(llm, _items(6), max_concurrency=3))
+
+    assert llm.calls == 6
+    assert llm.peak == 3
+    assert len(result["results"]) == 6
+    assert result["overall_score"] == result["results"][0]["final_score"]
+
+
+def test_packed_batch_uses_fewer_calls_and_cache():
+    llm = CountingLLM()
+    cache = EvaluationCache()
+    first = asyncio.run(aevaluate_answers_batch(llm, _items(4), cache=cache, pack_size=2))
+    second = asyncio.run(aevaluate_answers_batch(llm, _items(4), cache=cache, pack_size=2))
+
+    assert llm.calls == 2
+    assert all(not r["cached"] for r in first["results"])
+    assert all(r["cached"] for r in second["results"])
+
+
+def test_packs_never_mix_resumes():
+    llm = CountingLLM()
+    prompts = []
+    original = llm.ainvoke
+
+    async def record(prompt):
+        prompts.append(prompt)
+        return await original(prompt)
+
+    llm.ainvoke = record
+    items = _items(4)
+    for i, item in enumerate(items):
+        item["resume_data"] = {"name": "Ann" if i % 2 else "Bob", "skills": ["Go"]}
+    asyncio.run(aevaluate_answers_batch(llm, items, pack_size=4))
+
+    assert llm.calls == 2
+    assert sorted(p.count("Candidate Answer:") for p in prompts) == [2, 2]
+    assert all(("Ann" in p) != ("Bob" in p) for p in prompts)
+
+
+def test_packed_results_are_not_single_evaluation_hits():
+    llm = CountingLLM()
+    cache = EvaluationCache()
+    asyncio.run(aevaluate_answers_batch(llm, _items(2), cache=cache, pack_size=2))
+    single = asyncio.run(aevaluate_answers_batch(llm, _items(2), cache=cache))
+
+    assert llm.calls == 3
+    assert not any(r["cached"] for r in single["results"])
@@ -0,0 +1,26 @@
+import time
+
+from resume_parsing.cleaning.clean_text import clean_text
+
+
+def test_location_split():
+    assert clean_text("Acme Corp Austin, TX") == "Acme Corp, Austin, TX"
+    assert clean_text("Big & CoNew\tYork, NY") == "Big & Co, New\tYork, NY"
+    assert clean_text("Austin, TX") == "Austin, TX"
+    assert clean_text("Acme 2 Austin, TX") == "Acme 2 Austin, TX"
+
+
+def test_role_and_date_split():
+    assert clean_text("• Engineer  Sept. 2019 – Present") == "- Engineer\nSept. 2019 - Present"
+
+
+def test_adversarial_long_lines_are_linear():
+    lines = [
+        " ".join(["Senior Software Engineer"] * 3000),
+        ("Python Java Go Docker " * 5000)[:100000] + ", T",
+        "A" + "a" * 100000 + ", CA",
+    ]
+    start = time.perf_counter()
+    for line in lines:
+        clean_text(line)
+    assert time.perf_counter() - start < 1.0
@@ -0,0 +1,72 @@
+import json
+import re
+import typing
+
+from pydantic import BaseModel
+
+from resume_parsing.llm.llm_extract import _build_repair_prompt, build_prompt
+from resume_parsing.schema.resume_schema import RESUME_SCHEMA_COMPACT, ResumeSchema
+
+
+def _expected_type(annotation) -> str:
+    """TypeScript-like type of a field annotation, worked out independently"""
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin in (list, typing.List):
+        return f"{_expected_type(args[0])}[]"
+    if origin is typing.Union:
+        return "|".join(_expected_type(arg) for arg in args)
+    if annotation is type(None):
+        return "null"
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation.__name__
+    return {str: "string", int: "number", float: "number", bool: "boolean"}[annotation]
+
+
+def _models(model, seen=None):
+    seen = seen if seen is not None else {}
+    seen[model.__name__] = model
+    for field in model.model_fields.values():
+        for arg in typing.get_args(field.annotation) or (field.annotation,):
+            for inner in typing.get_args(arg) or (arg,):
+                if isinstance(inner, type) and issubclass(inner, BaseModel) and inner.__name__ not in seen:
+                    _models(inner, seen)
+    return seen
+
+
+def _parse_compact(text):
+    types = {}
+    for line in text.splitlines():
+        name, body = line.split(" = ", 1)
+        body = re.sub(r"/\*.*?\*/", "", body).strip()[1:-1]
+        fields = {}
+        for part in body.split(", "):
+            field, type_ = part.split(": ")
+            fields[field.rstrip("?")] = (field.endswith("?"), type_.strip())
+        types[name] = fields
+    return types
+
+
+def test_compact_schema_in_sync_with_models():
+    compact = _parse_compact(RESUME_SCHEMA_COMPACT)
+    models = _models(ResumeSchema)
+
+    assert set(compact) == set(models)
+    for name, model in models.items():
+        expected = {
+            field_name: (not field.is_required(), _expected_type(field.annotation))
+            for field_name, field in model.model_fields.items()
+        }
+        assert compact[name] == expected, name
+
+
+def test_compact_schema_keeps_descriptions():
+    assert "start_date?: string|null /* YYYY-MM or YYYY */" in RESUME_SCHEMA_COMPACT
+
+
+def test_compact_schema_is_smaller_and_used_in_prompts():
+    full = json.dumps(ResumeSchema.model_json_schema(), indent=2)
+
+    assert len(RESUME_SCHEMA_COMPACT) * 4 < len(full)
+    assert RESUME_SCHEMA_COMPACT in build_prompt("resume")
+    assert RESUME_SCHEMA_COMPACT in _build_repair_prompt("{bad")
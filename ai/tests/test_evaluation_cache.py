@@ -0,0 +1,27 @@
+import time
+
+from resume_parsing.cache.evaluation_cache import EvaluationCache, make_evaluation_cache_key
+
+
+def test_key_normalizes_whitespace_and_case():
+    a = make_evaluation_cache_key("What is REST?", "It uses  HTTP.\n", "resume-based", "ctx", "h")
+    b = make_evaluation_cache_key("what is rest?", "it uses HTTP.", "Resume-Based", "ctx", "h")
+    c = make_evaluation_cache_key("what is rest?", "it uses HTTP.", "resume-based", "ctx", "other")
+
+    assert a == b
+    assert a != c
+
+
+def test_lru_and_ttl():
+    cache = EvaluationCache(max_entries=2, ttl=0.05)
+    cache.put("a", {"final_score": 7.0})
+    cache.put("b", {"final_score": 5.0})
+    cache.get("a")
+    cache.put("c", {"final_score": 3.0})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"final_score": 7.0}
+
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 2
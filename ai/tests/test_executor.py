@@ -0,0 +1,83 @@
+import asyncio
+import threading
+
+import pytest
+
+from runtime import executor
+from runtime.executor import AsyncLimiter, BoundedPool, PoolSaturated
+
+
+def test_pool_runs_blocking_work_off_loop():
+    pool = BoundedPool("test", max_workers=2)
+    loop_thread = threading.get_ident()
+
+    async def main():
+        return await pool.run(threading.get_ident)
+
+    worker_thread = asyncio.run(main())
+    pool.shutdown()
+
+    assert worker_thread != loop_thread
+    assert pool.in_flight == 0
+
+
+def test_pool_rejects_when_saturated():
+    pool = BoundedPool("test", max_workers=1, max_queue=1, retry_after=7)
+    gate = threading.Event()
+
+    async def main():
+        first = asyncio.ensure_future(pool.run(gate.wait))
+        second = asyncio.ensure_future(pool.run(gate.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(PoolSaturated) as exc_info:
+            await pool.run(gate.wait)
+        gate.set()
+        await asyncio.gather(first, second)
+        return exc_info.value
+
+    err = asyncio.run(main())
+    pool.shutdown()
+
+    assert err.retry_after == 7
+    assert pool.in_flight == 0
+
+
+def test_limiter_bounds_waiters():
+    limiter = AsyncLimiter("llm", max_concurrency=1, max_queue=1, retry_after=3)
+
+    async def hold(gate):
+        async with limiter:
+            await gate.wait()
+
+    async def main():
+        gate = asyncio.Event()
+        first = asyncio.ensure_future(hold(gate))
+        second = asyncio.ensure_future(hold(gate))
+        await asyncio.sleep(0)
+        assert limiter.in_flight == 2
+        with pytest.raises(PoolSaturated) as exc_info:
+            async with limiter:
+                pass
+        gate.set()
+        await asyncio.gather(first, second)
+        return exc_info.value
+
+    err = asyncio.run(main())
+
+    assert err.pool_name == "llm" and err.retry_after == 3
+    assert limiter.in_flight == 0
+
+    async def reuse():
+        async with limiter:
+            return True
+
+    # Usable again from a fresh event loop
+    assert asyncio.run(reuse())
+
+
+def test_stt_pool_kind_cannot_be_process(monkeypatch):
+    monkeypatch.setenv("STT_POOL_KIND", "process")
+    monkeypatch.setattr(executor, "_pools", {})
+
+    with pytest.raises(ValueError):
+        executor.get_pool("stt")
@@ -0,0 +1,35 @@
+import numpy as np
+
+from stt.stt_service import FasterWhisperSTT, get_stt_service
+
+
+class FakeSegment:
+    def __init__(self, start, end, text):
+        self.start, self.end, self.text = start, end, text
+
+
+class FakeInfo:
+    language = "en"
+
+
+class FakeCT2Model:
+    def transcribe(self, audio, **kwargs):
+        segments = (s for s in [FakeSegment(0.0, 1.0, " Hello"), FakeSegment(1.0, 2.0, " world. ")])
+        return segments, FakeInfo()
+
+
+def test_factory_knows_faster_whisper():
+    stt = get_stt_service("faster_whisper", model_size="tiny", cpu_threads=4)
+
+    assert isinstance(stt, FasterWhisperSTT)
+    assert stt.cpu_threads == 4
+    assert "int8" in stt.get_provider_name()
+
+
+def test_same_transcribe_contract():
+    stt = FasterWhisperSTT()
+    stt._model = FakeCT2Model()
+
+    result = stt.transcribe(np.zeros(32000, dtype=np.float32))
+
+    assert result == {"text": "Hello world.", "language": "en", "confidence": None}
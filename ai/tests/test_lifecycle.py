@@ -0,0 +1,24 @@
+import asyncio
+
+from runtime.lifecycle import Readiness, readiness, warm_up
+
+
+def test_ready_only_after_all_components_warm():
+    calls = []
+
+    async def warm_async():
+        calls.append("async")
+
+    def warm_sync():
+        calls.append("sync")
+
+    def broken():
+        raise RuntimeError("no model")
+
+    asyncio.run(warm_up({"a": warm_async, "b": warm_sync}))
+    assert readiness.ready
+    assert sorted(calls) == ["async", "sync"]
+
+    asyncio.run(warm_up({"a": warm_async, "c": broken}))
+    assert not readiness.ready
+    assert readiness.snapshot()["c"]["status"] == Readiness.FAILED
@@ -55,4 +55,19 @@ def test_repair_path():
     result = extract_structured_resume(llm, "resume")
 
     assert result.skills == []
-    assert llm.calls == 3
\ No newline at end of file
+    assert llm.calls == 3
+
+class AsyncFlakyLLM(FlakyLLM):
+    async def ainvoke(self, prompt):
+        return self.invoke(prompt)
+
+
+def test_async_retry_works():
+    import asyncio
+    from resume_parsing.llm.llm_extract import aextract_structured_resume
+
+    llm = AsyncFlakyLLM()
+    result = asyncio.run(aextract_structured_resume(llm, "skills: Python"))
+
+    assert result.skills == ["Python"]
+    assert llm.calls == 2
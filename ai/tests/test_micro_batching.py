@@ -0,0 +1,116 @@
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from stt.batching import TEMPERATURES, MicroBatcher, decode_with_fallback, is_silence
+from stt.stt_service import STTService
+from stt.worker_pool import STTWorkerPool
+
+
+def test_concurrent_submissions_share_a_batch():
+    batch_sizes = []
+
+    def run_batch(group, items):
+        batch_sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(run_batch, max_batch_size=4, max_wait_ms=200)
+    results = {}
+    start = threading.Barrier(4)
+
+    def caller(i):
+        start.wait()
+        results[i] = batcher.submit(i).result(timeout=5)
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {0: 0, 1: 2, 2: 4, 3: 6}
+    assert batch_sizes == [4]
+
+
+def test_groups_never_mix_and_errors_propagate():
+    seen = []
+
+    def run_batch(group, items):
+        seen.append((group, list(items)))
+        if group == "bad":
+            raise ValueError("boom")
+        return items
+
+    batcher = MicroBatcher(run_batch, max_batch_size=8, max_wait_ms=50)
+    ok = batcher.submit(1, group="en")
+    bad = batcher.submit(2, group="bad")
+
+    assert ok.result(timeout=5) == 1
+    with pytest.raises(ValueError):
+        bad.result(timeout=5)
+    assert ("en", [1]) in seen and ("bad", [2]) in seen
+
+
+def _result(text, avg_logprob=-0.2, no_speech_prob=0.1, compression_ratio=1.5):
+    return SimpleNamespace(text=text, avg_logprob=avg_logprob,
+                           no_speech_prob=no_speech_prob, compression_ratio=compression_ratio)
+
+
+def test_only_failed_segments_are_redecoded_hotter():
+    calls = []
+
+    def decode(items, temperature):
+        calls.append((list(items), temperature))
+        results = []
+        for item in items:
+            if item == "repetitive" and temperature < 0.4:
+                results.append(_result("again again again", compression_ratio=3.0))
+            elif item == "unlikely":
+                results.append(_result("???", avg_logprob=-2.0))
+            elif item == "silence":
+                results.append(_result("Thanks for watching!", avg_logprob=-1.5, no_speech_prob=0.9))
+            else:
+                results.append(_result(f"{item} at {temperature}"))
+        return results
+
+    results = decode_with_fallback(decode, ["speech", "repetitive", "silence", "unlikely"])
+
+    assert calls[0] == (["speech", "repetitive", "silence", "unlikely"], 0.0)
+    assert calls[1] == (["repetitive", "unlikely"], 0.2)
+    assert calls[2] == (["repetitive", "unlikely"], 0.4)
+    assert [temperature for _, temperature in calls] == list(TEMPERATURES)
+    assert results[1].text == "repetitive at 0.4"
+    # Never passes: the last attempt is kept
+    assert results[3].text == "???"
+    # Silence is not retried, and is dropped by the caller
+    assert is_silence(results[2]) and not is_silence(results[0])
+
+
+class BatchingSTT(STTService):
+    """STT stub answering through a MicroBatcher, like BatchedWhisperSTT"""
+
+    def __init__(self):
+        self.batcher = MicroBatcher(lambda group, items: [os.getpid() for _ in items], max_wait_ms=1)
+
+    def warm_up(self):
+        self.batcher.submit(0).result(timeout=5)
+
+    def transcribe(self, audio, vad=False):
+        return {"text": str(self.batcher.submit(audio).result(timeout=5)), "language": "en"}
+
+    def get_provider_name(self):
+        return "batching"
+
+
+def test_batcher_built_before_fork_works_in_workers():
+    parent = BatchingSTT()
+    parent.warm_up()  # scheduler thread running in the parent
+    pool = STTWorkerPool(processes=2, factory=lambda: parent, start_timeout=10)
+    try:
+        pids = {pool.transcribe(0)["text"] for _ in range(4)}
+    finally:
+        pool.close()
+
+    assert str(os.getpid()) not in pids
@@ -0,0 +1,93 @@
+import io
+from pathlib import Path
+
+import pypdf
+from pypdf import PdfWriter
+
+from resume_parsing.extraction import pdf_engine
+from resume_parsing.extraction.extract import extract_text, extract_text_from_bytes
+
+RESUME_PDF = Path(__file__).parent / "test_resume.pdf"
+
+
+def _repeat_pdf(pages: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.append(str(RESUME_PDF))
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_bytes_and_path_agree():
+    data = RESUME_PDF.read_bytes()
+    text = extract_text_from_bytes(data, ".PDF")
+
+    assert text
+    assert text == extract_text(RESUME_PDF)
+
+
+def test_parallel_matches_sequential():
+    data = _repeat_pdf(10)
+
+    sequential = pdf_engine.extract_pdf_text(data, parallel_min_pages=100)
+    parallel = pdf_engine.extract_pdf_text(data, parallel_min_pages=2, max_workers=2)
+
+    assert parallel == sequential
+    assert sequential.count("\n\n") >= 9
+
+
+def test_char_budget_stops_early(monkeypatch):
+    data = _repeat_pdf(5)
+    calls = []
+    original = pypdf.PdfReader
+
+    class CountingReader(original):
+        @property
+        def pages(self):
+            pages = super().pages
+            return [_Counted(page, calls) for page in pages]
+
+    monkeypatch.setattr(pypdf, "PdfReader", CountingReader)
+    page_len = len(pdf_engine.extract_pdf_text(_repeat_pdf(1)))
+    calls.clear()
+
+    text = pdf_engine.extract_pdf_text(data, max_chars=page_len + 10)
+
+    assert len(calls) == 2
+    assert len(text) < page_len * 3
+
+
+class _Counted:
+    def __init__(self, page, calls):
+        self._page = page
+        self._calls = calls
+
+    def extract_text(self):
+        self._calls.append(1)
+        return self._page.extract_text()
+
+
+def test_budget_met_inline_never_starts_the_pool(monkeypatch):
+    data = _repeat_pdf(10)
+    page_len = len(pdf_engine.extract_pdf_text(_repeat_pdf(1)))
+    monkeypatch.setattr(pdf_engine, "_get_executor", _fail)
+
+    text = pdf_engine.extract_pdf_text(data, max_chars=page_len, parallel_min_pages=2)
+
+    assert text == pdf_engine.extract_pdf_text(_repeat_pdf(1))
+
+
+def test_parallel_extraction_reuses_one_pool():
+    data = _repeat_pdf(10)
+    pdf_engine.extract_pdf_text(data, parallel_min_pages=2, max_workers=2)
+    executor = pdf_engine._get_executor()
+
+    pdf_engine.extract_pdf_text(data, parallel_min_pages=2, max_workers=2)
+
+    assert pdf_engine._get_executor() is executor
+    pdf_engine.shutdown_executor()
+
+
+def _fail():
+    raise AssertionError("process pool started")
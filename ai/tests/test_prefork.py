@@ -0,0 +1,114 @@
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from runtime.config import PreforkConfig
+from runtime.prefork import CRASH_WINDOW, PreforkServer, apply_worker_defaults
+
+AI_DIR = Path(__file__).resolve().parents[1]
+
+
+async def app(scope, receive, send):
+    """Tiny ASGI app answering with the worker's pid"""
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": str(os.getpid()).encode()})
+
+
+async def failing_app(scope, receive, send):
+    """ASGI app whose startup always fails: every worker crashes at once"""
+    await receive()
+    await send({"type": "lifespan.startup.failed", "message": "boom"})
+
+
+def _start(tmp_path, app, *args):
+    env = {**os.environ, "PRELOAD_STT": "0", "PYTHONUNBUFFERED": "1"}
+    master = subprocess.Popen(
+        [sys.executable, "-m", "runtime.prefork", "--app", app,
+         "--host", "127.0.0.1", "--port", "0", "--graceful-timeout", "2",
+         "--cache-dir", str(tmp_path), *args],
+        cwd=AI_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+    port = int(re.search(r":(\d+) \(master", master.stdout.readline()).group(1))
+    return master, port
+
+
+def _get(port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=2) as response:
+                return int(response.read())
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def test_workers_share_socket_and_are_recycled(tmp_path):
+    master, port = _start(tmp_path, "tests.test_prefork:app", "--workers", "2", "--max-requests", "3")
+    try:
+        pids = []
+        for _ in range(12):
+            pids.append(_get(port))
+            time.sleep(0.15)  # uvicorn checks the request limit every 0.1 s
+
+        assert master.pid not in pids
+        # 12 requests at 3 per worker lifetime: replacements must have served
+        assert len(set(pids)) >= 4
+    finally:
+        master.send_signal(signal.SIGTERM)
+        output = master.communicate(timeout=30)[0]
+
+    assert master.returncode == 0, output
+    assert "recycled" in output
+
+
+def test_stop_is_not_delayed_by_crash_backoff(tmp_path):
+    master, _ = _start(tmp_path, "tests.test_prefork:failing_app", "--workers", "1")
+    time.sleep(4)  # crashes at ~0, 1 and 3 s: now waiting out a 4 s backoff
+    started = time.monotonic()
+    master.send_signal(signal.SIGTERM)
+    output = master.communicate(timeout=30)[0]
+
+    assert time.monotonic() - started < 2, output
+    assert output.count("respawning in") >= 2
+
+
+def test_backoff_resets_once_a_new_worker_stays_up():
+    server = PreforkServer(PreforkConfig())
+    now = time.monotonic()
+    server._backoff, server._last_crash = 8.0, now - 2 * CRASH_WINDOW
+
+    server.workers = {1: now - 1}  # started after the crash, still young
+    server._settle_backoff()
+    assert server._backoff == 8.0
+
+    server.workers = {1: now - 1.5 * CRASH_WINDOW}
+    server._settle_backoff()
+    assert server._backoff == 0.0
+
+
+def test_prefetch_disabled_with_several_workers(monkeypatch):
+    monkeypatch.delenv("QUESTION_PREFETCH", raising=False)
+    apply_worker_defaults(1)
+    assert os.getenv("QUESTION_PREFETCH") is None
+
+    apply_worker_defaults(4)
+    assert os.environ["QUESTION_PREFETCH"] == "0"
+
+    monkeypatch.setenv("QUESTION_PREFETCH", "1")  # sticky routing in front
+    apply_worker_defaults(4)
+    assert os.environ["QUESTION_PREFETCH"] == "1"
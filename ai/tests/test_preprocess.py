@@ -0,0 +1,30 @@
+import numpy as np
+
+from stt.preprocess import _design_filter, normalize, to_model_input
+
+
+def test_normalize_dtypes():
+    assert np.allclose(normalize(np.array([0, 128, 255], dtype=np.uint8)), [-1.0, 0.0, 127 / 128])
+    assert np.allclose(normalize(np.array([-32768, 16384], dtype=np.int16)), [-1.0, 0.5])
+    assert np.allclose(normalize(np.array([2 ** 30], dtype=np.int32)), [0.5])
+    assert normalize(np.array([0.5], dtype=np.float64)).dtype == np.float32
+
+
+def test_to_model_input_stereo_48k():
+    t = np.arange(48000) / 48000
+    tone = (np.sin(2 * np.pi * 440 * t) * 16000).astype(np.int16)
+    stereo = np.stack([tone, tone], axis=1)
+
+    out = to_model_input(stereo, 48000)
+
+    assert out.dtype == np.float32
+    assert len(out) == 16000
+    assert abs(np.abs(out[1000:-1000]).max() - 16000 / 32768) < 0.01
+
+
+def test_filter_design_is_cached():
+    _design_filter.cache_clear()
+    to_model_input(np.zeros(4410, dtype=np.int16), 44100)
+    to_model_input(np.zeros(4410, dtype=np.int16), 44100)
+
+    assert _design_filter.cache_info().hits == 1
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from resume_parsing.llm.prompt_registry import PromptRegistry, PromptTemplate
+
+
+def test_compiled_format_matches_str_format():
+    text = 'A {a} B {b!r} C {c:>4} {{"literal": {{}}}}'
+    template = PromptTemplate("t", text)
+
+    assert template.fields == {"a", "b", "c"}
+    assert template.format(a=1, b="x", c=7, unused=0) == text.format(a=1, b="x", c=7)
+    with pytest.raises(KeyError):
+        template.format(a=1, b="x")
+
+
+def test_bind_leaves_other_fields_open():
+    text = "A {a} B {b!r} C {c:>4} {{literal}}"
+    bound = PromptTemplate("t", text).bind(a="{x}")
+
+    assert bound.fields == {"b", "c"}
+    assert bound.source_hash == PromptTemplate("t", text).hash
+    assert bound.format(b="y", c="z") == text.format(a="{x}", b="y", c="z")
+
+
+def _write(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+
+
+def test_edits_are_reloaded_and_bad_edits_rejected(tmp_path):
+    prompt = tmp_path / "greeting.txt"
+    _write(prompt, "Hello {name}", 1_000_000)
+    registry = PromptRegistry(tmp_path, reload_interval=0.0001)
+    registry.require("greeting", ["name"])
+    first = registry.get("greeting")
+
+    _write(prompt, "Hi {name}!", 1_000_100)
+    assert registry.get("greeting").format(name="Ada") == "Hi Ada!"
+    assert registry.get("greeting").hash != first.hash
+    assert registry.reloads == 1
+
+    # Placeholder the caller doesn't fill: keep serving the last good version
+    _write(prompt, "Hi {name} from {city}", 1_000_200)
+    assert registry.get("greeting").text == "Hi {name}!"
+    assert registry.rejected == 1
+
+
+def test_require_checks_placeholders(tmp_path):
+    (tmp_path / "greeting.txt").write_text("Hello {name}")
+    registry = PromptRegistry(tmp_path, reload_interval=0)
+
+    with pytest.raises(ValueError):
+        registry.require("greeting", ["user"])
+    with pytest.raises(KeyError):
+        registry.require("missing", ["name"])
+
+
+def test_shipped_prompts_compile_identically():
+    registry = PromptRegistry(reload_interval=0)
+    for name, template in registry._templates.items():
+        values = {field: f"<{field}>" for field in template.fields}
+        assert template.format(**values) == template.text.format(**values), name
@@ -0,0 +1,81 @@
+import asyncio
+
+from resume_parsing.cache.question_prefetch import QuestionPrefetcher, make_prefetch_fingerprint
+
+HISTORY = [{"question": "Q1", "answer": "A1"}, {"question": "Q2", "answer": "final answer"}]
+
+
+def test_fingerprint_covers_every_answer():
+    base = make_prefetch_fingerprint({"skills": ["Go"]}, "SRE", HISTORY)
+
+    assert base == make_prefetch_fingerprint({"skills": ["Go"]}, "SRE", [dict(qa) for qa in HISTORY])
+    assert base != make_prefetch_fingerprint({"skills": ["Go"]}, "SRE", HISTORY[:1])
+    other_answer = [HISTORY[0], {"question": "Q2", "answer": "another answer"}]
+    assert base != make_prefetch_fingerprint({"skills": ["Go"]}, "SRE", other_answer)
+    edited = [{"question": "Q1", "answer": "changed"}, HISTORY[1]]
+    assert base != make_prefetch_fingerprint({"skills": ["Go"]}, "SRE", edited)
+
+
+def _generator(calls, delay=0.0):
+    async def generate(state):
+        calls.append(state)
+        await asyncio.sleep(delay)
+        return {"question": f"{state} question"}
+    return generate
+
+
+def test_matching_state_is_served_and_others_discarded():
+    async def run():
+        prefetcher = QuestionPrefetcher()
+        calls = []
+        fp = make_prefetch_fingerprint(None, None, HISTORY)
+        prefetcher.schedule("s1", ["deep-dive", "follow-up"], fp, _generator(calls, delay=0.05))
+        await asyncio.sleep(0)  # answer is being evaluated
+
+        result = await prefetcher.take("s1", "follow-up", make_prefetch_fingerprint(None, None, HISTORY))
+        again = await prefetcher.take("s1", "follow-up", fp)
+        return prefetcher, calls, result, again
+
+    prefetcher, calls, result, again = asyncio.run(run())
+
+    assert calls == ["deep-dive", "follow-up"]
+    assert result == {"question": "follow-up question"}
+    assert again is None
+    assert prefetcher.stats()["hits"] == 1
+    assert prefetcher.stats()["discarded"] == 1
+
+
+def test_stale_context_or_state_misses():
+    async def run():
+        prefetcher = QuestionPrefetcher()
+        fp = make_prefetch_fingerprint(None, None, HISTORY)
+
+        prefetcher.schedule("s1", ["deep-dive"], fp, _generator([]))
+        other_state = await prefetcher.take("s1", "resume-based", fp)
+
+        prefetcher.schedule("s1", ["deep-dive"], fp, _generator([]))
+        other_context = await prefetcher.take("s1", "deep-dive", "different")
+        return prefetcher, other_state, other_context
+
+    prefetcher, other_state, other_context = asyncio.run(run())
+
+    assert other_state is None and other_context is None
+    assert prefetcher.stats()["misses"] == 2
+
+
+def test_failed_generation_is_a_miss_and_sessions_are_bounded():
+    async def failing(state):
+        raise RuntimeError("LLM down")
+
+    async def run():
+        prefetcher = QuestionPrefetcher(max_sessions=2)
+        for session in ("a", "b", "c"):
+            prefetcher.schedule(session, ["deep-dive"], "fp", failing)
+        failed = await prefetcher.take("c", "deep-dive", "fp")
+        evicted = await prefetcher.take("a", "deep-dive", "fp")
+        return prefetcher, failed, evicted
+
+    prefetcher, failed, evicted = asyncio.run(run())
+
+    assert failed is None and evicted is None
+    assert prefetcher.stats()["sessions"] == 1
@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+from resume_parsing.llm.generate_question import astream_question
+from resume_parsing.llm.stream_json import StreamingJSONObject
+
+
+def _feed_in_pieces(parser, text, size):
+    events = []
+    for i in range(0, len(text), size):
+        events.extend((i, field) for field in parser.feed(text[i:i + size]))
+    return events
+
+
+def test_fields_complete_as_soon_as_they_close():
+    text = 'Sure!\n```json\n{"question": "Tell me about \\"X\\", ok?", "difficulty": "easy", "n": 3, "tags": ["a", "}"]}'
+    parser = StreamingJSONObject()
+
+    events = _feed_in_pieces(parser, text, 3)
+
+    assert [field for _, field in events] == [
+        ("question", 'Tell me about "X", ok?'),
+        ("difficulty", "easy"),
+        ("n", 3),
+        ("tags", ["a", "}"]),
+    ]
+    # The question is reported in the chunk that closes it
+    assert events[0][0] < text.index("difficulty")
+    assert parser.done
+
+
+def test_unicode_escapes_and_nested_objects():
+    parser = StreamingJSONObject()
+    events = parser.feed('{"q": "caf\\u00e9", "meta": {"a": [1, {"b": "x,y"}]}, "ok": true}')
+
+    assert events == [("q", "café"), ("meta", {"a": [1, {"b": "x,y"}]}), ("ok", True)]
+
+
+class StreamingLLM:
+    def __init__(self, text, size=4):
+        self.text = text
+        self.size = size
+        self.sent = 0
+
+    async def astream(self, prompt):
+        for i in range(0, len(self.text), self.size):
+            self.sent = i + self.size
+            yield self.text[i:i + self.size]
+
+
+def _collect(llm):
+    async def run():
+        events = []
+        async for event, data in astream_question(llm, "introduction"):
+            events.append((event, data, llm.sent))
+        return events
+    return asyncio.run(run())
+
+
+def test_question_event_precedes_completion():
+    text = json.dumps({"question": "Why this role?", "difficulty": "easy", "category": "behavioral"})
+    llm = StreamingLLM(text)
+
+    events = _collect(llm)
+
+    assert [e[0] for e in events] == ["question", "done"]
+    assert events[0][1] == {"question": "Why this role?"}
+    assert events[0][2] < len(text)
+    assert events[1][1] == {"question": "Why this role?", "difficulty": "easy", "category": "behavioral"}
+
+
+def test_unstructured_reply_still_yields_question():
+    events = _collect(StreamingLLM("What motivates you?"))
+
+    assert events[0][:2] == ("question", {"question": "What motivates you?"})
+    assert events[1][1]["category"] == "general"
@@ -0,0 +1,39 @@
+from resume_parsing.cache.resume_cache import ResumeParseCache, make_resume_cache_key
+
+
+def test_key_depends_on_all_inputs():
+    base = make_resume_cache_key(b"pdf bytes", "prompt", "model-a")
+
+    assert base == make_resume_cache_key(b"pdf bytes", "prompt", "model-a")
+    assert base != make_resume_cache_key(b"pdf bytes!", "prompt", "model-a")
+    assert base != make_resume_cache_key(b"pdf bytes", "prompt v2", "model-a")
+    assert base != make_resume_cache_key(b"pdf bytes", "prompt", "model-b")
+    assert base != make_resume_cache_key(b"pdf bytes", "prompt", "model-a", schema="{name: str}")
+    assert base != make_resume_cache_key(b"pdf bytes", "prompt", "model-a", text_budget=9000)
+    assert base != make_resume_cache_key(b"pdf bytes", "prompt", "model-a", token_budget=1500)
+
+
+def test_hit_miss_counters():
+    cache = ResumeParseCache(":memory:")
+
+    assert cache.get("k") is None
+    cache.put("k", {"skills": ["Python"]})
+    assert cache.get("k") == {"skills": ["Python"]}
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def test_lru_eviction_by_size():
+    cache = ResumeParseCache(":memory:", max_bytes=60)
+    cache.put("a", {"skills": ["a" * 10]})
+    cache.put("b", {"skills": ["b" * 10]})
+    cache.get("a")  # a is now more recent than b
+    cache.put("c", {"skills": ["c" * 10]})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
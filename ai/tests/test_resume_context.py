@@ -0,0 +1,86 @@
+from resume_parsing.cache.resume_cache import ResumeParseCache
+from resume_parsing.cache.resume_context_store import ResumeContextStore
+from resume_parsing.llm.generate_question import build_question_prompt
+from resume_parsing.llm.prompt_registry import get_prompt_registry
+from resume_parsing.llm.resume_context import ResumeContext, make_resume_id
+
+RESUME = {
+    "skills": ["Python", "C++", "Docker", "SQL"],
+    "experiences": [
+        {"role": "Backend Engineer", "organization": "Acme",
+         "description": ["Built Docker images for Python services"]},
+    ],
+    "projects": [
+        {"name": "Tracker", "technologies": ["Python", "React"]},
+    ],
+}
+
+
+def test_prompt_matches_the_unbound_template():
+    context = ResumeContext(RESUME)
+    prompt = build_question_prompt("deep-dive", RESUME, "SRE", None, context=context)
+
+    expected = get_prompt_registry().get("question_generation").text.format(
+        state="deep-dive",
+        job_description="SRE",
+        resume_context=context.question_context,
+        conversation_history="\nPREVIOUS CONVERSATION: None (this is the first question)",
+    )
+    assert prompt == expected
+    assert "CANDIDATE SKILLS: Python, C++, Docker, SQL" in prompt
+    assert "Tracker (Python, React)" in prompt
+
+
+def test_topic_index_ranks_by_mentions():
+    topics = ResumeContext(RESUME).topics
+
+    assert list(topics)[:2] == ["python", "docker"]
+    assert topics["python"]["sources"] == [
+        "skills", "project: Tracker", "experience: Backend Engineer"
+    ]
+    assert topics["react"]["sources"] == ["project: Tracker"]
+
+
+def test_uncovered_topics_skip_what_was_asked():
+    context = ResumeContext(RESUME)
+    history = [{"question": "How did you use Python at Acme?", "answer": "C++ too"}]
+
+    assert context.uncovered_topics(history, limit=3) == ["Docker", "C++", "SQL"]
+
+    prompt = build_question_prompt("resume-based", RESUME, None, history, context=context)
+    assert "RESUME TOPICS NOT YET COVERED: Docker, C++, SQL, React" in prompt
+
+
+def test_store_resolves_by_id_or_content():
+    store = ResumeContextStore()
+    built = store.put(ResumeContext(RESUME))
+
+    assert built.resume_id == make_resume_id(dict(reversed(list(RESUME.items()))))
+    assert store.resolve(resume_id=built.resume_id) is built
+    assert store.resolve(RESUME) is built
+    assert store.resolve({"skills": ["Go"]}) is not built
+    assert store.stats()["entries"] == 2
+
+    missing = store.resolve(resume_id="unknown")
+    assert "Not provided" in missing.question_context
+
+
+def test_store_evicts_least_recently_used():
+    store = ResumeContextStore(max_entries=1)
+    first = store.put(ResumeContext({"skills": ["Go"]}))
+    store.put(ResumeContext({"skills": ["Rust"]}))
+
+    assert store.get(first.resume_id) is None
+
+
+def test_store_rebuilds_from_backing_in_another_worker(tmp_path):
+    db_path = tmp_path / "resume_cache.sqlite3"
+    parsed_in = ResumeContextStore(backing=ResumeParseCache(db_path))
+    other_worker = ResumeContextStore(backing=ResumeParseCache(db_path))
+
+    built = parsed_in.put(ResumeContext(RESUME))
+    resolved = other_worker.resolve(resume_id=built.resume_id)
+
+    assert resolved.resume_data == RESUME
+    assert resolved.question_context == built.question_context
+    assert other_worker.get(built.resume_id) is resolved
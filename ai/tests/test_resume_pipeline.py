@@ -0,0 +1,74 @@
+import io
+from pathlib import Path
+
+from docx import Document
+from pypdf import PdfWriter
+
+from resume_parsing import pipeline
+from resume_parsing.cleaning.clean_text import clean_text, iter_clean_lines
+from resume_parsing.extraction import pdf_engine
+from resume_parsing.extraction.extract import extract_text_from_bytes
+
+RESUME_PDF = Path(__file__).parent / "test_resume.pdf"
+
+MESSY_TEXT = (
+    "  \n\n   Jane Doe   \r\nEXPERIENCE\n\n\n\n"
+    "Acme Corp San Francisco, CA\n"
+    "• Built things\r"
+    "Software Engineer Jan 2020 - Present\n"
+    "\n  \n"
+    "▪ Led a team   \n\n\n"
+)
+
+
+def test_iter_clean_lines_matches_clean_text():
+    streamed = "\n".join(iter_clean_lines(MESSY_TEXT.split("\n")))
+    assert streamed == clean_text(MESSY_TEXT) == (
+        "Jane Doe\nEXPERIENCE\n\nAcme Corp San, Francisco, CA\n- Built things\n"
+        "Software Engineer\nJan 2020 - Present\n\n- Led a team"
+    )
+
+
+def test_pipeline_matches_full_pdf_extraction():
+    data = RESUME_PDF.read_bytes()
+    full = clean_text(extract_text_from_bytes(data, ".pdf"))
+
+    assert pipeline.extract_resume_text(data, ".pdf", max_chars=None) == full
+    assert pipeline.extract_resume_text(data, ".pdf", max_chars=500) == full[:500]
+
+
+def test_pipeline_docx():
+    doc = Document()
+    for para in ["Jane Doe", "Skills", "• Python", "Engineer Jan 2020 - 2022"]:
+        doc.add_paragraph(para)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    data = buffer.getvalue()
+
+    text = pipeline.extract_resume_text(data, ".docx")
+
+    assert text == clean_text(extract_text_from_bytes(data, ".docx"))
+    assert "- Python" in text
+
+
+def test_pipeline_stops_reading_pages(monkeypatch):
+    writer = PdfWriter()
+    for _ in range(6):
+        writer.append(str(RESUME_PDF))
+    buffer = io.BytesIO()
+    writer.write(buffer)
+
+    pulled = []
+    original = pdf_engine.iter_pdf_pages
+
+    def counting_pages(data, *args, **kwargs):
+        for text in original(data, parallel_min_pages=100):
+            pulled.append(text)
+            yield text
+
+    monkeypatch.setattr("resume_parsing.extraction.extract.iter_pdf_pages", counting_pages)
+
+    text = pipeline.extract_resume_text(buffer.getvalue(), ".pdf", max_chars=2000)
+
+    assert len(text) == 2000
+    assert len(pulled) == 1
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from stt.audio_io import FFmpegStreamDecoder
+from stt.streaming import StreamingTranscriber, merge_overlap
+
+
+def test_merge_overlap_drops_repeated_words():
+    assert merge_overlap("I worked on the API", "the API gateway for payments") == "gateway for payments"
+    assert merge_overlap("Hello there.", "General Kenobi") == "General Kenobi"
+    assert merge_overlap("", "first words") == "first words"
+
+
+class FakeSTT:
+    def __init__(self):
+        self.lengths = []
+        self.languages = []
+
+    def transcribe_samples(self, audio, initial_prompt=None, language=None):
+        self.lengths.append(len(audio))
+        self.languages.append(language)
+        return {"text": f"chunk{len(self.lengths)}", "language": "en"}
+
+
+def test_windows_are_transcribed_incrementally():
+    stt = FakeSTT()
+    transcriber = StreamingTranscriber(stt, window_seconds=1.0, overlap_seconds=0.25)
+    one_second = (np.zeros(16000, dtype=np.int16)).tobytes()
+
+    assert transcriber.feed(one_second[:16000]) is None  # half a window
+    assert transcriber.feed(one_second[:16000]) == "chunk1"
+    assert transcriber.feed(one_second + one_second[:16000]) == "chunk1 chunk2"
+
+    result = transcriber.finish()
+
+    # Only the half-second tail (plus overlap) is left for the final pass
+    assert stt.lengths == [16000, 20000, 12000]
+    assert stt.languages == ["en"] * 3
+    assert result["text"] == "chunk1 chunk2 chunk3"
+    assert result["duration"] == 2.5
+
+
+def test_pcm_chunks_split_mid_sample():
+    transcriber = StreamingTranscriber(FakeSTT(), input_format="pcm_f32le", window_seconds=1.0, overlap_seconds=0.25)
+    samples = np.linspace(-1, 1, 1000, dtype=np.float32)
+    data = samples.tobytes()
+
+    for start in range(0, len(data), 333):  # odd-length chunks
+        transcriber.feed(data[start:start + 333])
+
+    assert np.array_equal(transcriber._pcm, samples)
+    assert transcriber._leftover == b""
+
+
+def test_provider_without_sample_input_is_rejected():
+    from stt.stt_service import WhisperAPISTT
+
+    with pytest.raises(ValueError, match="does not support streaming"):
+        StreamingTranscriber(WhisperAPISTT(api_key="test"))
+
+
+def test_container_stream_uses_one_decoder_process():
+    # `cat` stands in for FFmpeg: the "container" is already s16le PCM
+    stt = FakeSTT()
+    transcriber = StreamingTranscriber(stt, input_format="webm", window_seconds=1.0, overlap_seconds=0.25)
+    transcriber._decoder = FFmpegStreamDecoder(command=["cat"])
+    quarter_second = np.ones(4000, dtype=np.int16).tobytes()
+
+    for _ in range(10):
+        transcriber.feed(quarter_second)
+    process = transcriber._decoder._proc
+    result = transcriber.finish()
+
+    assert process.returncode == 0
+    assert result["duration"] == 2.5
+    # Everything decoded was transcribed, and only the overlap is kept
+    assert sum(stt.lengths) - 4000 * (len(stt.lengths) - 1) == 40000
+    assert len(transcriber._pcm) == 4000
+
+
+def test_abandoned_stream_stops_its_decoder():
+    transcriber = StreamingTranscriber(FakeSTT(), input_format="webm")
+    transcriber._decoder = decoder = FFmpegStreamDecoder(command=["cat"])
+    transcriber.feed(b"\x00\x00" * 100)
+    transcriber.close()
+
+    assert decoder._proc.poll() is not None
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+os.environ.setdefault("HUGGINGFACEHUB_API_TOKEN", "test-token")
+
+from resume_parsing.llm.generate_question import generate_question
+from resume_parsing.llm.hf_llm import HuggingFaceLLM
+from resume_parsing.llm.llm_extract import aextract_structured_resume, extract_structured_resume
+from resume_parsing.schema.resume_schema import ResumeSchema
+
+RESUME_JSON = json.dumps({"skills": ["Python"], "experiences": []})
+
+
+class _Message:
+    def __init__(self, content):
+        self.message = {"content": content}
+
+
+class _Completion:
+    def __init__(self, content):
+        self.choices = [_Message(content)]
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code, text=""):
+        super().__init__(f"HTTP {status_code}")
+        self.response = type("Response", (), {"status_code": status_code, "text": text})()
+
+
+UNSUPPORTED = "Model does not support response_format of type json_schema"
+
+
+class FakeClient:
+    def __init__(self, content, reject_format_with=None, error_text=UNSUPPORTED):
+        self.content = content
+        self.reject_format_with = reject_format_with
+        self.error_text = error_text
+        self.calls = []
+
+    def chat_completion(self, **kwargs):
+        self.calls.append(kwargs)
+        if "response_format" in kwargs and self.reject_format_with:
+            raise _HTTPError(self.reject_format_with, self.error_text)
+        return _Completion(self.content)
+
+
+class FakeAsyncClient(FakeClient):
+    async def chat_completion(self, **kwargs):
+        return FakeClient.chat_completion(self, **kwargs)
+
+
+def _llm(client):
+    llm = HuggingFaceLLM()
+    llm.client = client
+    return llm
+
+
+def test_invoke_sends_json_schema_and_validates():
+    client = FakeClient(RESUME_JSON)
+    response = _llm(client).invoke("prompt", schema=ResumeSchema)
+
+    response_format = client.calls[0]["response_format"]
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["schema"] == ResumeSchema.model_json_schema()
+    assert isinstance(response.parsed, ResumeSchema)
+    assert response.parsed.skills == ["Python"]
+
+
+def test_invalid_content_leaves_parsed_empty():
+    response = _llm(FakeClient("not json")).invoke("prompt", schema=ResumeSchema)
+
+    assert response.parsed is None
+    assert response.content == "not json"
+
+
+def test_unsupported_backend_falls_back_once():
+    client = FakeClient(RESUME_JSON, reject_format_with=422)
+    llm = _llm(client)
+
+    llm.invoke("prompt", schema=ResumeSchema)
+    llm.invoke("prompt", schema=ResumeSchema)
+
+    assert not llm.structured_output
+    assert ["response_format" in call for call in client.calls] == [True, False, False]
+
+
+@pytest.mark.parametrize("status, text", [
+    (503, UNSUPPORTED),
+    (400, "Input validation error: inputs tokens + max_new_tokens must be <= 8192"),
+    (401, "Invalid credentials in Authorization header"),
+    (404, "Model not found"),
+])
+def test_other_errors_are_not_treated_as_unsupported(status, text):
+    client = FakeClient(RESUME_JSON, reject_format_with=status, error_text=text)
+    llm = _llm(client)
+
+    with pytest.raises(_HTTPError):
+        llm.invoke("prompt", schema=ResumeSchema)
+    assert llm.structured_output
+    assert len(client.calls) == 1
+
+
+def test_extraction_uses_parsed_result_in_one_call():
+    client = FakeClient(RESUME_JSON)
+    llm = _llm(client)
+
+    result = extract_structured_resume(llm, "skills: Python")
+
+    assert result.skills == ["Python"]
+    assert len(client.calls) == 1
+
+
+def test_async_extraction_with_schema():
+    client = FakeAsyncClient(RESUME_JSON)
+    llm = _llm(FakeClient(RESUME_JSON))
+    llm._async_client = client
+
+    result = asyncio.run(aextract_structured_resume(llm, "skills: Python"))
+
+    assert result.skills == ["Python"]
+    assert "response_format" in client.calls[0]
+
+
+def test_question_from_schema_response():
+    content = json.dumps({"question": "Why Python?", "difficulty": "easy", "category": "technical"})
+    client = FakeClient(content)
+
+    result = generate_question(_llm(client), "introduction")
+
+    assert result == {"question": "Why Python?", "difficulty": "easy", "category": "technical"}
+    assert client.calls[0]["response_format"]["json_schema"]["name"] == "GeneratedQuestion"
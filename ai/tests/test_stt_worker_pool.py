@@ -0,0 +1,70 @@
+import os
+import time
+
+import pytest
+
+from stt.stt_service import STTService
+from stt.worker_pool import STTWorkerPool
+
+
+class SleepySTT(STTService):
+    def transcribe(self, audio, vad=False):
+        time.sleep(audio)
+        return {"text": str(os.getpid()), "language": "en", "confidence": None}
+
+    def get_provider_name(self):
+        return "sleepy"
+
+
+def test_jobs_run_in_worker_processes_and_recycle():
+    pool = STTWorkerPool(processes=1, max_jobs_per_worker=2, factory=SleepySTT)
+    try:
+        first = pool.transcribe(0)["text"]
+        second = pool.transcribe(0)["text"]
+        third = pool.transcribe(0)["text"]
+    finally:
+        pool.close()
+
+    assert first == second != str(os.getpid())
+    assert third != first  # recycled after two jobs
+
+
+def test_timeout_replaces_worker():
+    pool = STTWorkerPool(processes=1, job_timeout=0.5, factory=SleepySTT)
+    try:
+        stuck_pid = pool.worker_pids()[0]
+        with pytest.raises(TimeoutError):
+            pool.transcribe(5)
+        # Served by the replacement once it is up
+        assert pool.transcribe(0)["text"] != str(stuck_pid)
+        assert stuck_pid not in pool.worker_pids()
+    finally:
+        pool.close()
+
+
+class SlowStartSTT(SleepySTT):
+    """Warm-up takes a second once ``marker`` exists"""
+
+    def __init__(self, marker):
+        self.marker = marker
+
+    def warm_up(self):
+        if os.path.exists(self.marker):
+            time.sleep(1.0)
+
+
+def test_replacement_starts_in_background(tmp_path):
+    marker = str(tmp_path / "slow")
+    pool = STTWorkerPool(processes=1, max_jobs_per_worker=1, factory=lambda: SlowStartSTT(marker))
+    try:
+        open(marker, "w").close()
+        started = time.monotonic()
+        first = pool.transcribe(0)["text"]
+        retire_took = time.monotonic() - started
+        second = pool.transcribe(0)["text"]
+    finally:
+        pool.close()
+
+    # The job that retired the worker didn't wait for the replacement
+    assert retire_took < 0.5
+    assert second != first
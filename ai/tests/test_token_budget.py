@@ -0,0 +1,104 @@
+import re
+
+from resume_parsing.llm import generate_question
+from resume_parsing.llm.token_budget import (
+    PromptSection,
+    TokenCounter,
+    pack_sections,
+    prompt_budget,
+)
+
+
+class _Encoding:
+    def __init__(self, text):
+        spans = [m.span() for m in re.finditer(r"\S+", text)]
+        self.ids = list(range(len(spans)))
+        self.offsets = spans
+
+
+class WordTokenizer:
+    """One token per whitespace-separated word"""
+
+    def encode(self, text, add_special_tokens=False):
+        return _Encoding(text)
+
+
+class FakeLLM:
+    model = "meta-llama/Meta-Llama-3-8B-Instruct"
+    max_tokens = 1500
+
+
+def test_exact_truncate_head_and_tail():
+    counter = TokenCounter(WordTokenizer())
+
+    assert counter.count("one two three four") == 4
+    assert counter.truncate("one two three four", 2) == "one two"
+    assert counter.truncate("one two three four", 2, keep="tail") == "three four"
+    assert counter.truncate("one two", 5) == "one two"
+
+
+def test_estimated_counter():
+    counter = TokenCounter()
+
+    assert counter.count("x" * 35) == 10
+    assert counter.count(counter.truncate("x" * 1000, 10)) <= 10
+
+
+def test_pack_sections_trims_lowest_priority_first():
+    counter = TokenCounter(WordTokenizer())
+    packed = pack_sections(
+        [
+            PromptSection("low", "l1 l2 l3 l4", priority=2),
+            PromptSection("high", "h1 h2 h3", priority=0),
+            PromptSection("mid", "m1 m2 m3 m4", priority=1),
+            PromptSection("whole", "w1 w2", priority=3, min_tokens=2),
+        ],
+        budget=6,
+        counter=counter,
+    )
+
+    assert packed == {"high": "h1 h2 h3", "mid": "m1 m2 m3", "low": "", "whole": ""}
+
+
+def test_prompt_budget_reserves_output(monkeypatch):
+    monkeypatch.delenv("LLM_CONTEXT_TOKENS", raising=False)
+    assert prompt_budget(FakeLLM()) == 8192 - 1500 - 64
+
+    monkeypatch.setenv("LLM_CONTEXT_TOKENS", "4096")
+    assert prompt_budget(FakeLLM()) == 4096 - 1500 - 64
+
+
+def test_history_keeps_newest_turns_within_budget():
+    counter = TokenCounter(WordTokenizer())
+    history = [{"question": f"q{i}", "answer": " ".join(["word"] * 10)} for i in range(6)]
+
+    text = generate_question.build_history_text(history, budget=30, counter=counter)
+
+    # Each turn is 14 words, so only the last two fit
+    assert "q4" in text and "q5" in text and "q3" not in text
+    assert text.index("q4") < text.index("q5")
+
+
+def test_history_clips_long_answers(monkeypatch):
+    monkeypatch.setattr(generate_question, "HISTORY_ANSWER_MAX_TOKENS", 3)
+    counter = TokenCounter(WordTokenizer())
+
+    text = generate_question.build_history_text(
+        [{"question": "q", "answer": "a b c d e"}], budget=100, counter=counter
+    )
+
+    assert text.endswith("A1: a b c...")
+
+
+def test_evaluation_prompt_fits_long_answer(monkeypatch):
+    monkeypatch.setenv("HUGGINGFACEHUB_API_TOKEN", "test-token")
+    monkeypatch.setenv("LLM_CONTEXT_TOKENS", "2500")
+    from resume_parsing.llm.evaluate_answer import build_evaluation_prompt
+    from resume_parsing.llm.token_budget import counter_for
+
+    answer = "because " * 20000
+    prompt = build_evaluation_prompt("Why?", answer, llm=FakeLLM())
+
+    assert "Why?" in prompt
+    assert "because because" in prompt
+    assert counter_for(FakeLLM()).count(prompt) <= prompt_budget(FakeLLM())
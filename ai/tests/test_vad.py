@@ -0,0 +1,43 @@
+import numpy as np
+
+from stt.vad import detect_speech, trim_silence
+
+SR = 16000
+
+
+def _clip():
+    """Speech (tone) at 1-2 s and 4-5 s, near-silence elsewhere"""
+    rng = np.random.default_rng(0)
+    t = np.arange(SR) / SR
+    tone = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    noise = lambda seconds: (rng.standard_normal(SR * seconds) * 1e-4).astype(np.float32)
+    return np.concatenate([noise(1), tone, noise(2), tone, noise(1)])
+
+
+def test_detects_two_speech_regions():
+    segments = detect_speech(_clip(), pad_ms=0)
+
+    assert len(segments) == 2
+    assert abs(segments[0][0] - SR) < 0.05 * SR
+    assert abs(segments[1][1] - 5 * SR) < 0.05 * SR
+
+
+def test_trim_maps_timestamps_back():
+    trimmed = trim_silence(_clip(), gap_ms=200, pad_ms=0)
+
+    # ~2 s of speech + one 0.2 s gap instead of 6 s
+    assert len(trimmed.samples) < 2.4 * SR
+    assert abs(trimmed.to_original(0.0) - 1.0) < 0.05
+    # Second region starts after ~1 s of speech + the 0.2 s gap
+    assert abs(trimmed.to_original(1.25 + 0.5) - 4.5) < 0.05
+
+    stats = trimmed.speech_stats()
+    assert stats["pause_count"] == 1
+    assert abs(stats["longest_pause"] - 2.0) < 0.1
+
+
+def test_silence_only_keeps_audio():
+    silence = np.zeros(SR, dtype=np.float32)
+    trimmed = trim_silence(silence)
+
+    assert len(trimmed.samples) == SR
@@ -0,0 +1,42 @@
+import threading
+import time
+
+import numpy as np
+
+from stt.stt_service import WhisperLocalSTT
+
+
+class OverlapDetectingModel:
+    """Stands in for a PyTorch Whisper model; records concurrent decodes"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        return {"text": " ok ", "language": "en", "segments": []}
+
+
+def test_inference_on_a_shared_model_is_serialized():
+    model = OverlapDetectingModel()
+    services = [WhisperLocalSTT(), WhisperLocalSTT()]
+    for service in services:
+        service._model = model
+
+    threads = [
+        threading.Thread(target=service.transcribe, args=(np.zeros(16000, dtype=np.float32),))
+        for service in services * 2
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert model.peak == 1
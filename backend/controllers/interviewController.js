@@ -248,6 +248,19 @@ if (session.resumeId) {
   }
 }
 
+// While the answer is evaluated, prefetch questions for the states it can
+// lead to. The history is what the next-question call will send.
+aiService.prefetchQuestions({
+  sessionId: session._id.toString(),
+  currentState: session.currentState,
+  resumeData,
+  jobDescription: session.jobDescription,
+  conversationHistory: session.questions.slice(-3).map(qa => ({
+    question: qa.question,
+    answer: qa.answer
+  }))
+});
+
 // AI-powered answer evaluation
 const aiResponse = await aiService.evaluateAnswer({
   question,
@@ -337,12 +350,14 @@ const getNextQuestion = async (req, res) => {
       answer: qa.answer
     }));
 
-    // Call AI service to generate question
+    // Call AI service to generate question (served from the prefetch when
+    // it was generated for this state and conversation)
     const aiResponse = await aiService.generateQuestion({
       state: session.currentState,
       resumeData: resumeData,
       jobDescription: session.jobDescription,
-      conversationHistory: conversationHistory
+      conversationHistory: conversationHistory,
+      sessionId: session._id.toString()
     });
 
     res.json({
@@ -592,6 +607,20 @@ const addVideoQuestionAnswer = async (req, res) => {
       }
     }
 
+    // While the answer is evaluated, prefetch questions for the states it
+    // can lead to. The history is what the next-question call will send
+    // once this answer is stored.
+    aiService.prefetchQuestions({
+      sessionId: session._id.toString(),
+      currentState: session.currentState,
+      resumeData,
+      jobDescription: session.jobDescription,
+      conversationHistory: [
+        ...session.questions.map(qa => ({ question: qa.question, answer: qa.answer })),
+        { question, answer }
+      ].slice(-3)
+    });
+
     // Step 3: AI-powered answer evaluation
     console.log('📤 Calling AI evaluation service...');
     const evaluation = await aiService.evaluateAnswer({
@@ -43,9 +43,10 @@ class AIService {
    * @param {Object} params.resumeData - Parsed resume data (optional)
    * @param {string} params.jobDescription - Job description (optional)
    * @param {Array} params.conversationHistory - Previous Q&A pairs (optional)
+   * @param {string} params.sessionId - Interview session, serves a prefetched question if one matches (optional)
    * @returns {Promise<Object>} Generated question
    */
-  async generateQuestion({ state, resumeData, jobDescription, conversationHistory }) {
+  async generateQuestion({ state, resumeData, jobDescription, conversationHistory, sessionId }) {
     try {
       const response = await axios.post(
         `${AI_SERVICE_URL}/api/generate-question`,
@@ -53,7 +54,8 @@ class AIService {
           state: state,
           resume_data: resumeData || null,
           job_description: jobDescription || null,
-          conversation_history: conversationHistory || []
+          conversation_history: conversationHistory || [],
+          session_id: sessionId || null
         },
         {
           headers: {
@@ -70,6 +72,108 @@ class AIService {
     }
   }
 
+  /**
+   * Start generating the likely next questions while a submitted answer is
+   * evaluated. Fire-and-forget: failures are logged, never thrown.
+   * @param {Object} params - Prefetch parameters
+   * @param {string} params.sessionId - Interview session
+   * @param {string} params.currentState - State of the question just answered
+   * @param {Object} params.resumeData - Parsed resume data (optional)
+   * @param {string} params.jobDescription - Job description (optional)
+   * @param {Array} params.conversationHistory - Q&A pairs including the submitted answer (optional)
+   */
+  async prefetchQuestions({ sessionId, currentState, resumeData, jobDescription, conversationHistory }) {
+    try {
+      await axios.post(
+        `${AI_SERVICE_URL}/api/prefetch-questions`,
+        {
+          session_id: sessionId,
+          current_state: currentState,
+          resume_data: resumeData || null,
+          job_description: jobDescription || null,
+          conversation_history: conversationHistory || []
+        },
+        {
+          headers: {
+            'Content-Type': 'application/json'
+          },
+          timeout: 5000,
+          family: 4  // Force IPv4
+        }
+      );
+    } catch (error) {
+      console.error(`Question prefetch failed: ${error.response?.data?.detail || error.message}`);
+    }
+  }
+
+  /**
+   * Generate interview question, receiving the question text early
+   * @param {Object} params - Same parameters as generateQuestion
+   * @param {Function} onQuestion - Called with the question text as soon as
+   *   it is generated, before difficulty/category are ready (optional)
+   * @returns {Promise<Object>} Generated question, same shape as generateQuestion
+   */
+  async generateQuestionStream({ state, resumeData, jobDescription, conversationHistory, sessionId }, onQuestion) {
+    try {
+      const response = await axios.post(
+        `${AI_SERVICE_URL}/api/generate-question?stream=true`,
+        {
+          state: state,
+          resume_data: resumeData || null,
+          job_description: jobDescription || null,
+          conversation_history: conversationHistory || [],
+          session_id: sessionId || null
+        },
+        {
+          headers: {
+            'Content-Type': 'application/json',
+            'Accept': 'text/event-stream'
+          },
+          responseType: 'stream',
+          timeout: 30000, // 30 second timeout
+          family: 4  // Force IPv4
+        }
+      );
+
+      return await new Promise((resolve, reject) => {
+        let buffer = '';
+        let settled = false;
+
+        const handleEvent = (raw) => {
+          const event = raw.match(/^event: (.*)$/m)?.[1];
+          const data = raw.match(/^data: (.*)$/m)?.[1];
+          if (!event || data === undefined) return;
+          const payload = JSON.parse(data);
+
+          if (event === 'question' && onQuestion) {
+            onQuestion(payload.question);
+          } else if (event === 'done') {
+            settled = true;
+            resolve({ success: true, data: payload, message: 'Question generated successfully' });
+          } else if (event === 'error') {
+            settled = true;
+            reject(new Error(payload.detail));
+          }
+        };
+
+        response.data.on('data', (chunk) => {
+          buffer += chunk.toString();
+          let boundary;
+          while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            handleEvent(buffer.slice(0, boundary));
+            buffer = buffer.slice(boundary + 2);
+          }
+        });
+        response.data.on('end', () => {
+          if (!settled) reject(new Error('Stream ended before the question was complete'));
+        });
+        response.data.on('error', reject);
+      });
+    } catch (error) {
+      throw new Error(`Question generation failed: ${error.response?.data?.detail || error.message}`);
+    }
+  }
+
   /**
    * Health check for AI service
    * @returns {Promise<boolean>} Service status
@@ -133,6 +237,43 @@ class AIService {
     }
   }
 
+  /**
+   * Evaluate several interview answers in one request
+   * @param {Array<Object>} items - { question, answer, state, resumeData } entries
+   * @param {Object} options - Batch options
+   * @param {number} options.maxConcurrency - Max LLM calls in flight (optional)
+   * @param {number} options.packSize - Q/A pairs scored per LLM call (optional)
+   * @returns {Promise<Object>} { evaluations, overall_score }
+   */
+  async evaluateAnswersBatch(items, { maxConcurrency, packSize } = {}) {
+    try {
+      const response = await axios.post(
+        `${AI_SERVICE_URL}/api/evaluate-answers:batch`,
+        {
+          items: items.map(({ question, answer, state, resumeData }) => ({
+            question,
+            answer,
+            state,
+            resume_data: resumeData || null
+          })),
+          max_concurrency: maxConcurrency || 4,
+          pack_size: packSize || 1
+        },
+        {
+          headers: {
+            'Content-Type': 'application/json'
+          },
+          timeout: 60000, // 60 second timeout for the whole batch
+          family: 4  // Force IPv4
+        }
+      );
+
+      return response.data;
+    } catch (error) {
+      throw new Error(`Batch evaluation failed: ${error.response?.data?.detail || error.message}`);
+    }
+  }
+
   /**
    * Transcribe video/audio to text using Whisper AI
    * @param {string} filePath - Path to video/audio file